@@ -0,0 +1,317 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import zlib
+from itertools import chain
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+from . import db
+from .db import VEHICLE_DATA_COLUMNS
+
+BACKUP_COLUMNS = ("site_code", *VEHICLE_DATA_COLUMNS, "updated_at")
+BACKUP_CODEC = "zlib-column-chunks-v2"
+BACKUP_COLUMNS_CODEC = "zlib-columns-v1"
+BACKUP_FALLBACK_CODEC = "zlib-json-v1"
+BACKUP_COMPRESSION_LEVEL = 6
+BACKUP_CHUNK_ROWS = 1000
+BACKUP_READ_BYTES = 64 * 1024
+PENDING_BACKUP_BATCH = 50
+BLOB_GC_GRACE = "-1 hours"
+STAGE_COLUMN_TYPES = {"plate": "TEXT PRIMARY KEY", "manual_override": "INTEGER"}
+
+ProgressCallback = Callable[[str, int, int], None]
+
+
+def backup_store_path() -> Path:
+    configured = os.getenv("PARKING_BACKUP_DB_PATH", "").strip()
+    if configured:
+        return Path(configured)
+    return db.DB_PATH.with_name(f"{db.DB_PATH.stem}-backups{db.DB_PATH.suffix or '.db'}")
+
+
+def connect_backup_store() -> sqlite3.Connection:
+    if db.storage_backend() == "postgres":
+        con = db.connect()
+    else:
+        path = backup_store_path()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        con = sqlite3.connect(path, factory=db.ClosingConnection)
+        con.row_factory = sqlite3.Row
+        con.execute("PRAGMA busy_timeout = 5000")
+        con.execute("PRAGMA synchronous = NORMAL")
+    con.execute(
+        """
+        CREATE TABLE IF NOT EXISTS backup_blobs (
+          content_hash TEXT PRIMARY KEY,
+          codec TEXT NOT NULL,
+          rows_count INTEGER NOT NULL,
+          raw_bytes INTEGER NOT NULL,
+          stored_bytes INTEGER NOT NULL,
+          payload BLOB NOT NULL,
+          touched_at TEXT NOT NULL DEFAULT (datetime('now'))
+        )
+        """
+    )
+    return con
+
+
+def canonical_backup_json(rows: list[dict[str, Any]]) -> str:
+    return json.dumps(rows, ensure_ascii=False, default=str)
+
+
+def compact_json(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+def encode_backup_rows(rows: list[dict[str, Any]], raw: bytes) -> tuple[str, bytes]:
+    columns = list(rows[0]) if rows else list(BACKUP_COLUMNS)
+    if any(list(row) != columns for row in rows):
+        return BACKUP_FALLBACK_CODEC, zlib.compress(raw, BACKUP_COMPRESSION_LEVEL)
+    lines = [compact_json(columns)]
+    for start in range(0, len(rows), BACKUP_CHUNK_ROWS):
+        chunk = rows[start : start + BACKUP_CHUNK_ROWS]
+        lines.append(compact_json([[row[column] for row in chunk] for column in columns]))
+    return BACKUP_CODEC, zlib.compress("\n".join(lines).encode("utf-8"), BACKUP_COMPRESSION_LEVEL)
+
+
+def iter_payload_lines(chunks: Iterator[bytes]) -> Iterator[bytes]:
+    decompressor = zlib.decompressobj()
+    pending = b""
+    for chunk in chain(chunks, [None]):
+        pending += decompressor.decompress(chunk) if chunk is not None else decompressor.flush()
+        *lines, pending = pending.split(b"\n")
+        yield from lines
+    if pending:
+        yield pending
+
+
+def iter_chunked_rows(chunks: Iterator[bytes]) -> Iterator[list[dict[str, Any]]]:
+    lines = iter_payload_lines(chunks)
+    columns = json.loads(next(lines))
+    for line in lines:
+        yield [dict(zip(columns, values)) for values in zip(*json.loads(line))]
+
+
+def iter_decoded_rows(codec: str, chunks: Iterator[bytes]) -> Iterator[list[dict[str, Any]]]:
+    if codec == BACKUP_CODEC:
+        yield from iter_chunked_rows(chunks)
+        return
+    payload = zlib.decompress(b"".join(chunks))
+    if codec == BACKUP_FALLBACK_CODEC:
+        rows = json.loads(payload.decode("utf-8"))
+    elif codec == BACKUP_COLUMNS_CODEC:
+        document = json.loads(payload.decode("utf-8"))
+        rows = [dict(zip(document["columns"], values)) for values in zip(*document["data"])]
+    else:
+        raise ValueError(f"지원하지 않는 백업 형식입니다: {codec}")
+    for start in range(0, len(rows), BACKUP_CHUNK_ROWS):
+        yield rows[start : start + BACKUP_CHUNK_ROWS]
+
+
+def verify_rows(batches: Iterator[list[dict[str, Any]]], content_hash: str) -> Iterator[list[dict[str, Any]]]:
+    digest = hashlib.sha256(b"[")
+    first = True
+    for batch in batches:
+        for row in batch:
+            digest.update((("" if first else ", ") + json.dumps(row, ensure_ascii=False, default=str)).encode("utf-8"))
+            first = False
+        yield batch
+    digest.update(b"]")
+    if digest.hexdigest() != content_hash:
+        raise ValueError("백업 데이터가 손상되었습니다.")
+
+
+def read_blob_chunks(store: sqlite3.Connection, content_hash: str) -> Iterator[bytes]:
+    if not hasattr(store, "blobopen"):
+        row = store.execute("SELECT payload FROM backup_blobs WHERE content_hash = ?", (content_hash,)).fetchone()
+        payload = memoryview(row["payload"])
+        for start in range(0, len(payload), BACKUP_READ_BYTES):
+            yield bytes(payload[start : start + BACKUP_READ_BYTES])
+        return
+    rowid = store.execute("SELECT rowid FROM backup_blobs WHERE content_hash = ?", (content_hash,)).fetchone()[0]
+    with store.blobopen("backup_blobs", "payload", rowid, readonly=True) as blob:
+        while chunk := blob.read(BACKUP_READ_BYTES):
+            yield chunk
+
+
+def store_backup_rows(rows: list[dict[str, Any]]) -> str:
+    raw = canonical_backup_json(rows).encode("utf-8")
+    content_hash = hashlib.sha256(raw).hexdigest()
+    with connect_backup_store() as store:
+        touched = store.execute(
+            "UPDATE backup_blobs SET touched_at = datetime('now') WHERE content_hash = ?",
+            (content_hash,),
+        ).rowcount
+        if not touched:
+            codec, payload = encode_backup_rows(rows, raw)
+            store.execute(
+                """
+                INSERT OR IGNORE INTO backup_blobs(content_hash, codec, rows_count, raw_bytes, stored_bytes, payload)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                (content_hash, codec, len(rows), len(raw), len(payload), payload),
+            )
+        store.commit()
+    return content_hash
+
+
+def iter_backup_rows(con: sqlite3.Connection, backup_row: sqlite3.Row | dict[str, Any]) -> Iterator[list[dict[str, Any]]]:
+    content_hash = backup_row["blob_hash"]
+    if content_hash:
+        with connect_backup_store() as store:
+            blob = store.execute("SELECT codec FROM backup_blobs WHERE content_hash = ?", (content_hash,)).fetchone()
+            if not blob:
+                raise ValueError("백업 데이터를 찾을 수 없습니다.")
+            yield from verify_rows(iter_decoded_rows(blob["codec"], read_blob_chunks(store, content_hash)), content_hash)
+        return
+    if backup_row["vehicles_json"]:
+        rows = json.loads(backup_row["vehicles_json"])
+        for start in range(0, len(rows), BACKUP_CHUNK_ROWS):
+            yield rows[start : start + BACKUP_CHUNK_ROWS]
+        return
+    cursor = con.execute(
+        f"SELECT {', '.join(BACKUP_COLUMNS)} FROM vehicle_backup_snapshots WHERE backup_id = ? ORDER BY plate",
+        (backup_row["id"],),
+    )
+    while batch := cursor.fetchmany(BACKUP_CHUNK_ROWS):
+        yield [dict(row) for row in batch]
+
+
+def load_backup_rows(con: sqlite3.Connection, backup_row: sqlite3.Row | dict[str, Any]) -> list[dict[str, Any]]:
+    return [row for batch in iter_backup_rows(con, backup_row) for row in batch]
+
+
+def snapshot_vehicle_backup(con: sqlite3.Connection, site_code: str, username: str | None, backup_name: str) -> dict[str, Any]:
+    backup_id = con.execute(
+        """
+        INSERT INTO vehicle_backups(site_code, backup_name, vehicles_json, vehicles_count, created_by)
+        VALUES (?, ?, '', 0, ?)
+        """,
+        (site_code, backup_name, username),
+    ).lastrowid
+    copied = con.execute(
+        f"""
+        INSERT INTO vehicle_backup_snapshots(backup_id, {', '.join(BACKUP_COLUMNS)})
+        SELECT ?, {', '.join(BACKUP_COLUMNS)}
+        FROM vehicles
+        WHERE site_code = ?
+        """,
+        (backup_id, site_code),
+    ).rowcount
+    con.execute("UPDATE vehicle_backups SET vehicles_count = ? WHERE id = ?", (copied, backup_id))
+    return {"id": backup_id, "backup_name": backup_name, "vehicles_count": copied}
+
+
+def stage_vehicle_backup(
+    con: sqlite3.Connection,
+    backup_row: sqlite3.Row | dict[str, Any],
+    progress: ProgressCallback | None = None,
+) -> int:
+    total = int(backup_row["vehicles_count"] or 0)
+    report = progress or (lambda phase, done, total: None)
+    stage_columns = (*VEHICLE_DATA_COLUMNS, "updated_at")
+    con.execute(
+        f"""
+        CREATE TEMP TABLE IF NOT EXISTS restore_stage (
+          {', '.join(f"{column} {STAGE_COLUMN_TYPES.get(column, 'TEXT')}" for column in stage_columns)}
+        )
+        """
+    )
+    con.execute("DELETE FROM temp.restore_stage")
+    staged = 0
+    for batch in iter_backup_rows(con, backup_row):
+        con.executemany(
+            f"""
+            INSERT INTO temp.restore_stage({', '.join(stage_columns)}) VALUES ({', '.join('?' for _ in stage_columns)})
+            ON CONFLICT(plate) DO UPDATE SET {', '.join(f"{column} = excluded.{column}" for column in stage_columns[1:])}
+            """,
+            [
+                (
+                    *(row.get(column) for column in VEHICLE_DATA_COLUMNS[:-2]),
+                    1 if row.get("manual_override") else 0,
+                    row.get("deleted_at"),
+                    row.get("updated_at"),
+                )
+                for row in batch
+            ],
+        )
+        staged += len(batch)
+        report("decode", staged, total)
+    con.execute("UPDATE temp.restore_stage SET status = 'active' WHERE status IS NULL OR status = ''")
+    return staged
+
+
+def apply_staged_backup(
+    con: sqlite3.Connection,
+    site_code: str,
+    staged: int,
+    *,
+    username: str | None,
+    before_name: str,
+    progress: ProgressCallback | None = None,
+) -> dict[str, Any]:
+    report = progress or (lambda phase, done, total: None)
+    before = snapshot_vehicle_backup(con, site_code, username, before_name)
+    report("snapshot", staged, staged)
+    removed = con.execute(
+        "DELETE FROM vehicles WHERE site_code = ? AND plate NOT IN (SELECT plate FROM temp.restore_stage)",
+        (site_code,),
+    ).rowcount
+    unchanged = " AND ".join(f"v.{column} IS s.{column}" for column in VEHICLE_DATA_COLUMNS)
+    assignments = ", ".join(f"{column} = excluded.{column}" for column in VEHICLE_DATA_COLUMNS[1:])
+    changed = con.execute(
+        f"""
+        INSERT INTO vehicles(site_code, {', '.join(VEHICLE_DATA_COLUMNS)}, updated_at)
+        SELECT ?, {', '.join(f's.{column}' for column in VEHICLE_DATA_COLUMNS)}, COALESCE(s.updated_at, datetime('now'))
+        FROM temp.restore_stage s
+        WHERE NOT EXISTS (
+          SELECT 1 FROM vehicles v
+          WHERE v.site_code = ? AND {unchanged} AND (s.updated_at IS NULL OR v.updated_at IS s.updated_at)
+        )
+        ON CONFLICT(site_code, plate) DO UPDATE SET {assignments}, updated_at = excluded.updated_at
+        """,
+        (site_code, site_code),
+    ).rowcount
+    con.execute("DELETE FROM temp.restore_stage")
+    report("applied", staged, staged)
+    return {"vehicles_count": staged, "changed": changed, "removed": removed, "backup_before_restore": before}
+
+
+def compact_pending_backups(con: sqlite3.Connection, limit: int = PENDING_BACKUP_BATCH) -> int:
+    rows = con.execute(
+        "SELECT id, vehicles_json, blob_hash FROM vehicle_backups WHERE blob_hash IS NULL ORDER BY id LIMIT ?",
+        (limit,),
+    ).fetchall()
+    for row in rows:
+        content_hash = store_backup_rows(load_backup_rows(con, row))
+        con.execute("UPDATE vehicle_backups SET blob_hash = ?, vehicles_json = '' WHERE id = ?", (content_hash, row["id"]))
+        con.execute("DELETE FROM vehicle_backup_snapshots WHERE backup_id = ?", (row["id"],))
+    return len(rows)
+
+
+def referenced_backup_hashes(con: sqlite3.Connection) -> set[str]:
+    return {row["blob_hash"] for row in con.execute("SELECT DISTINCT blob_hash FROM vehicle_backups WHERE blob_hash IS NOT NULL")}
+
+
+def collect_backup_blobs(referenced: set[str]) -> int:
+    with connect_backup_store() as store:
+        stored = [
+            row["content_hash"]
+            for row in store.execute("SELECT content_hash FROM backup_blobs WHERE touched_at < datetime('now', ?)", (BLOB_GC_GRACE,))
+        ]
+        orphaned = [content_hash for content_hash in stored if content_hash not in referenced]
+        store.executemany("DELETE FROM backup_blobs WHERE content_hash = ?", [(content_hash,) for content_hash in orphaned])
+        store.commit()
+    return len(orphaned)
+
+
+def backup_store_stats() -> dict[str, int]:
+    with connect_backup_store() as store:
+        row = store.execute(
+            "SELECT COUNT(*) AS blobs, COALESCE(SUM(raw_bytes), 0) AS raw_bytes, COALESCE(SUM(stored_bytes), 0) AS stored_bytes FROM backup_blobs"
+        ).fetchone()
+    return dict(row)
@@ -1,12 +1,24 @@
 import os
+import random
+import re
 import sqlite3
+import threading
+import time
+from contextlib import contextmanager
 from pathlib import Path
+from typing import Any, Callable, Iterator
+
+from .storage import is_postgres_url, postgres_storage, split_statements
 
 BASE_DIR = Path(__file__).resolve().parent
 DB_PATH = Path(os.getenv("PARKING_DB_PATH", str(BASE_DIR / "data" / "parking.db")))
+DATABASE_URL = os.getenv("PARKING_DATABASE_URL", "").strip()
+SHARD_DIR = Path(os.environ["PARKING_SHARD_DIR"]) if os.getenv("PARKING_SHARD_DIR", "").strip() else None
 DEFAULT_SITE_CODE = (os.getenv("PARKING_DEFAULT_SITE_CODE", "APT1100").strip().upper() or "APT1100")
 DEFAULT_SITE_NAME = os.getenv("PARKING_DEFAULT_SITE_NAME", "기본 아파트").strip() or "기본 아파트"
 SEED_DEMO = os.getenv("PARKING_SEED_DEMO", "1").strip().lower() in {"1", "true", "yes", "on"}
+WRITE_RETRY_ATTEMPTS = max(int(os.getenv("PARKING_WRITE_RETRY_ATTEMPTS", "6")), 1)
+WRITE_RETRY_BASE_SECONDS = 0.05
 BILLING_PROVIDER = os.getenv("PARKING_BILLING_PROVIDER", "manual").strip().lower() or "manual"
 VALID_USER_ROLES = {
     "admin",
@@ -18,6 +30,41 @@ VALID_USER_ROLES = {
     "guard",
     "cleaner",
 }
+CENTRAL_TABLES = (
+    "sites",
+    "users",
+    "site_billing",
+    "billing_inquiries",
+    "google_play_purchases",
+    "scheduler_locks",
+    "scheduler_job_runs",
+)
+SHARD_SOURCE_TABLES = (
+    "vehicles",
+    "import_runs",
+    "enforcement_events",
+    "cctv_search_requests",
+    "ocr_feedback",
+    "vehicle_backups",
+    "vehicle_backup_snapshots",
+    "vehicle_change_logs",
+    "contacts",
+    "site_settings",
+)
+SHARD_SEED_TABLES = ("registry_generations", "site_generations")
+SHARD_DERIVED_TABLES = (
+    "site_usage_counters",
+    "enforcement_rollups",
+    "plate_offense_summary",
+    "registry_changes",
+    "registry_generations",
+    "site_generations",
+)
+SHARD_WRITE_LOCK_SQL = "DELETE FROM main.site_generations WHERE 0"
+SHARD_CODE_PATTERN = re.compile(r"[A-Z0-9][A-Z0-9_-]*")
+
+_prepared_shards: set[Path] = set()
+_shard_lock = threading.Lock()
 
 
 class ClosingConnection(sqlite3.Connection):
@@ -35,14 +82,37 @@ class ClosingConnection(sqlite3.Connection):
         return False
 
 
+class ShardConnection(ClosingConnection):
+    site_code = ""
+
+
 def normalize_site_code(value: str | None) -> str:
     text = str(value or "").strip().upper()
     return text or DEFAULT_SITE_CODE
 
 
-def connect() -> sqlite3.Connection:
-    DB_PATH.parent.mkdir(parents=True, exist_ok=True)
-    con = sqlite3.connect(DB_PATH, factory=ClosingConnection)
+def storage_backend() -> str:
+    return "postgres" if is_postgres_url(DATABASE_URL) else "sqlite"
+
+
+def sharding_enabled() -> bool:
+    return SHARD_DIR is not None and storage_backend() == "sqlite"
+
+
+def shard_path(site_code: str | None) -> Path:
+    normalized = normalize_site_code(site_code)
+    if not SHARD_CODE_PATTERN.fullmatch(normalized):
+        raise ValueError(f"invalid site code for shard: {normalized}")
+    return SHARD_DIR / f"{normalized}.db"
+
+
+def connection_key(site_code: str | None = None) -> tuple[Path, Path | None]:
+    return DB_PATH, shard_path(site_code) if site_code and sharding_enabled() else None
+
+
+def open_sqlite(path: Path, factory: type[ClosingConnection] = ClosingConnection) -> sqlite3.Connection:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    con = sqlite3.connect(path, factory=factory)
     con.row_factory = sqlite3.Row
     con.execute("PRAGMA busy_timeout = 5000")
     con.execute("PRAGMA foreign_keys = ON")
@@ -51,6 +121,122 @@ def connect() -> sqlite3.Connection:
     return con
 
 
+def connect(site_code: str | None = None) -> sqlite3.Connection:
+    if is_postgres_url(DATABASE_URL):
+        return postgres_storage(DATABASE_URL).connect(normalize_site_code(site_code) if site_code else None)
+    if site_code and sharding_enabled():
+        return connect_shard(site_code)
+    return open_sqlite(DB_PATH)
+
+
+def connect_shard(site_code: str) -> sqlite3.Connection:
+    path = shard_path(site_code)
+    if path not in _prepared_shards:
+        prepare_shard(path, site_code)
+    con = open_sqlite(path, ShardConnection)
+    con.site_code = normalize_site_code(site_code)
+    con.execute("ATTACH DATABASE ? AS central", (str(DB_PATH),))
+    return con
+
+
+def prepare_shard(path: Path, site_code: str) -> None:
+    with _shard_lock:
+        if path in _prepared_shards:
+            return
+        with open_sqlite(path) as con:
+            migrate_schema(con, lambda con: strip_central_tables(con, site_code))
+        _prepared_shards.add(path)
+
+
+def strip_central_tables(con: sqlite3.Connection, site_code: str) -> None:
+    for table in CENTRAL_TABLES:
+        con.execute(f"DROP TABLE IF EXISTS {table}")
+    for table in SHARD_DERIVED_TABLES:
+        con.execute(f"DELETE FROM {table} WHERE site_code <> ?", (normalize_site_code(site_code),))
+
+
+def central_table(con: sqlite3.Connection, table: str) -> str:
+    return f"central.{table}" if isinstance(con, ShardConnection) else table
+
+
+def central_derived_keys_sql(table: str) -> tuple[str, str]:
+    column, keys = CENTRAL_DERIVED_KEYS[table]
+    return column, ", ".join(f"'{key}'" for key in sorted(keys))
+
+
+def central_derived_exclusion(table: str) -> str:
+    if table not in CENTRAL_DERIVED_KEYS:
+        return ""
+    column, listed = central_derived_keys_sql(table)
+    return f" AND {column} NOT IN ({listed})"
+
+
+def derived_table_sql(con: sqlite3.Connection, table: str) -> str:
+    if not isinstance(con, ShardConnection) or table not in CENTRAL_DERIVED_KEYS:
+        return table
+    column, listed = central_derived_keys_sql(table)
+    return (
+        f"(SELECT * FROM main.{table} WHERE {column} NOT IN ({listed}) "
+        f"UNION ALL SELECT * FROM central.{table} WHERE {column} IN ({listed}))"
+    )
+
+
+def site_codes() -> list[str]:
+    with connect() as con:
+        return [row["site_code"] for row in con.execute("SELECT site_code FROM sites ORDER BY site_code").fetchall()]
+
+
+def site_connections() -> Iterator[sqlite3.Connection]:
+    if not sharding_enabled():
+        with connect() as con:
+            yield con
+        return
+    for site_code in site_codes():
+        with connect(site_code) as con:
+            yield con
+
+
+def is_busy_error(exc: BaseException) -> bool:
+    if not isinstance(exc, sqlite3.OperationalError):
+        return False
+    message = str(exc).lower()
+    return "database is locked" in message or "database is busy" in message or "database table is locked" in message
+
+
+def retry_delay(attempt: int) -> float:
+    return WRITE_RETRY_BASE_SECONDS * (2**attempt) * (0.5 + random.random())
+
+
+def begin_immediate(con: sqlite3.Connection, attempts: int = WRITE_RETRY_ATTEMPTS) -> None:
+    for attempt in range(attempts):
+        try:
+            if isinstance(con, ShardConnection):
+                begin_shard_write(con)
+            else:
+                con.execute("BEGIN IMMEDIATE")
+            return
+        except sqlite3.OperationalError as exc:
+            if not is_busy_error(exc) or attempt == attempts - 1:
+                raise
+            time.sleep(retry_delay(attempt))
+
+
+def begin_shard_write(con: sqlite3.Connection) -> None:
+    con.execute("BEGIN")
+    try:
+        con.execute(SHARD_WRITE_LOCK_SQL)
+    except sqlite3.Error:
+        con.rollback()
+        raise
+
+
+@contextmanager
+def write_transaction(site_code: str | None = None) -> Iterator[sqlite3.Connection]:
+    with connect(site_code) as con:
+        begin_immediate(con)
+        yield con
+
+
 def table_columns(con: sqlite3.Connection, table_name: str) -> set[str]:
     rows = con.execute(f"PRAGMA table_info({table_name})").fetchall()
     return {row["name"] for row in rows}
@@ -406,6 +592,18 @@ def ensure_vehicle_schema(con: sqlite3.Connection) -> None:
         con.execute("ALTER TABLE vehicles ADD COLUMN deleted_at TEXT")
 
 
+def ensure_enforcement_event_schema(con: sqlite3.Connection) -> None:
+    if "client_event_id" not in table_columns(con, "enforcement_events"):
+        con.execute("ALTER TABLE enforcement_events ADD COLUMN client_event_id TEXT")
+    con.execute(
+        """
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_enforcement_site_client_event
+        ON enforcement_events(site_code, client_event_id)
+        WHERE client_event_id IS NOT NULL
+        """
+    )
+
+
 def ensure_vehicle_management_schema(con: sqlite3.Connection) -> None:
     if "can_manage_vehicles" not in table_columns(con, "users"):
         con.execute("ALTER TABLE users ADD COLUMN can_manage_vehicles INTEGER NOT NULL DEFAULT 0")
@@ -448,6 +646,32 @@ def ensure_vehicle_management_schema(con: sqlite3.Connection) -> None:
         ON vehicle_change_logs(site_code, created_at)
         """
     )
+    if "blob_hash" not in table_columns(con, "vehicle_backups"):
+        con.execute("ALTER TABLE vehicle_backups ADD COLUMN blob_hash TEXT")
+    con.execute(
+        """
+        CREATE TABLE IF NOT EXISTS vehicle_backup_snapshots (
+          backup_id INTEGER NOT NULL,
+          site_code TEXT NOT NULL,
+          plate TEXT NOT NULL,
+          unit TEXT,
+          building TEXT,
+          unit_number TEXT,
+          owner_name TEXT,
+          phone TEXT,
+          status TEXT,
+          valid_from TEXT,
+          valid_to TEXT,
+          note TEXT,
+          source_file TEXT,
+          source_sheet TEXT,
+          manual_override INTEGER,
+          deleted_at TEXT,
+          updated_at TEXT,
+          PRIMARY KEY (backup_id, plate)
+        ) WITHOUT ROWID
+        """
+    )
     create_core_query_indexes(con)
 
 
@@ -494,21 +718,732 @@ def ensure_contact_schema(con: sqlite3.Connection) -> None:
     )
 
 
-def init_db() -> None:
+USAGE_COUNTER_SOURCES = {
+    "users": ("users", None),
+    "vehicles": ("vehicles", None),
+    "monthly_records": ("enforcement_events", "created_at"),
+    "monthly_cctv": ("cctv_search_requests", "created_at"),
+}
+USAGE_TOTAL_PERIOD = "total"
+VEHICLE_ACTIVE_SQL = "({row}.deleted_at IS NULL)"
+VEHICLE_MANUAL_SQL = "({row}.deleted_at IS NULL AND COALESCE({row}.manual_override, 0) = 1)"
+CCTV_OPEN_SQL = "({row}.status NOT IN ('done', 'cancelled'))"
+SITE_STAT_COUNTERS = {
+    "active_vehicles": ("vehicles", VEHICLE_ACTIVE_SQL, "site_code, deleted_at"),
+    "manual_vehicles": ("vehicles", VEHICLE_MANUAL_SQL, "site_code, deleted_at, manual_override"),
+    "open_cctv": ("cctv_search_requests", CCTV_OPEN_SQL, "site_code, status"),
+}
+
+
+def usage_period_expr(column: str | None, row_alias: str) -> str:
+    if column is None:
+        return f"'{USAGE_TOTAL_PERIOD}'"
+    return f"strftime('%Y-%m', {row_alias}.{column})"
+
+
+def flag_sql(condition: str) -> str:
+    return f"(CASE WHEN {condition} THEN 1 ELSE 0 END)"
+
+
+def site_stat_delta_sql(metric: str, row: str, sign: str = "") -> str:
+    condition = SITE_STAT_COUNTERS[metric][1].format(row=row)
+    return f"""
+      INSERT INTO site_usage_counters(site_code, period, metric, value)
+      VALUES ({row}.site_code, '{USAGE_TOTAL_PERIOD}', '{metric}', {sign}{flag_sql(condition)})
+      ON CONFLICT(site_code, period, metric) DO UPDATE SET value = MAX(value + excluded.value, 0);
+    """
+
+
+def rebuild_usage_counters(con: sqlite3.Connection, site_code: str | None = None) -> None:
+    site_filter = " WHERE site_code = ?" if site_code else ""
+    params: tuple[Any, ...] = (normalize_site_code(site_code),) if site_code else ()
+    con.execute(f"DELETE FROM site_usage_counters{site_filter}", params)
+    for metric, (table_name, column) in USAGE_COUNTER_SOURCES.items():
+        period = usage_period_expr(column, table_name)
+        con.execute(
+            f"""
+            INSERT INTO site_usage_counters(site_code, period, metric, value)
+            SELECT site_code, {period}, '{metric}', COUNT(*)
+            FROM {table_name}
+            {site_filter}
+            GROUP BY site_code{f", {period}" if column else ""}
+            """,
+            params,
+        )
+    for metric, (table_name, condition, _) in SITE_STAT_COUNTERS.items():
+        con.execute(
+            f"""
+            INSERT INTO site_usage_counters(site_code, period, metric, value)
+            SELECT site_code, '{USAGE_TOTAL_PERIOD}', '{metric}', SUM({flag_sql(condition.format(row=table_name))})
+            FROM {table_name}
+            {site_filter}
+            GROUP BY site_code
+            """,
+            params,
+        )
+
+
+def ensure_usage_counter_schema(con: sqlite3.Connection) -> None:
+    created = not table_columns(con, "site_usage_counters")
+    con.execute(
+        """
+        CREATE TABLE IF NOT EXISTS site_usage_counters (
+          site_code TEXT NOT NULL,
+          period TEXT NOT NULL,
+          metric TEXT NOT NULL,
+          value INTEGER NOT NULL DEFAULT 0,
+          PRIMARY KEY (site_code, period, metric)
+        ) WITHOUT ROWID
+        """
+    )
+    for metric, (table_name, column) in USAGE_COUNTER_SOURCES.items():
+        con.execute(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS trg_usage_{table_name}_insert
+            AFTER INSERT ON {table_name}
+            BEGIN
+              INSERT INTO site_usage_counters(site_code, period, metric, value)
+              VALUES (NEW.site_code, {usage_period_expr(column, 'NEW')}, '{metric}', 1)
+              ON CONFLICT(site_code, period, metric) DO UPDATE SET value = value + 1;
+            END
+            """
+        )
+        con.execute(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS trg_usage_{table_name}_delete
+            AFTER DELETE ON {table_name}
+            BEGIN
+              UPDATE site_usage_counters
+              SET value = MAX(value - 1, 0)
+              WHERE site_code = OLD.site_code AND period = {usage_period_expr(column, 'OLD')} AND metric = '{metric}';
+            END
+            """
+        )
+    for metric, (table_name, _, columns) in SITE_STAT_COUNTERS.items():
+        triggers = {
+            "insert": (f"AFTER INSERT ON {table_name}", site_stat_delta_sql(metric, "NEW")),
+            "delete": (f"AFTER DELETE ON {table_name}", site_stat_delta_sql(metric, "OLD", "-")),
+            "update": (
+                f"AFTER UPDATE OF {columns} ON {table_name}",
+                site_stat_delta_sql(metric, "OLD", "-") + site_stat_delta_sql(metric, "NEW"),
+            ),
+        }
+        for event, (timing, body) in triggers.items():
+            con.execute(f"CREATE TRIGGER IF NOT EXISTS trg_usage_{metric}_{event} {timing} BEGIN {body} END")
+    if created:
+        rebuild_usage_counters(con)
+
+
+ENFORCEMENT_ROLLUP_KEYS = {
+    "site_code": "{row}.site_code",
+    "day": "date({row}.created_at)",
+    "hour": "CAST(strftime('%H', {row}.created_at) AS INTEGER)",
+    "verdict": "{row}.verdict",
+    "location": "COALESCE(TRIM({row}.location), '')",
+}
+
+
+def enforcement_rollup_delta_sql(row: str, delta: int) -> str:
+    columns = ", ".join(ENFORCEMENT_ROLLUP_KEYS)
+    values = ", ".join(expr.format(row=row) for expr in ENFORCEMENT_ROLLUP_KEYS.values())
+    return f"""
+      INSERT INTO enforcement_rollups({columns}, events_count)
+      VALUES ({values}, {delta})
+      ON CONFLICT({columns}) DO UPDATE SET events_count = MAX(events_count + excluded.events_count, 0);
+    """
+
+
+def rebuild_enforcement_rollups(con: sqlite3.Connection, site_code: str | None = None) -> None:
+    site_filter = " WHERE site_code = ?" if site_code else ""
+    params: tuple[Any, ...] = (normalize_site_code(site_code),) if site_code else ()
+    columns = ", ".join(ENFORCEMENT_ROLLUP_KEYS)
+    values = ", ".join(expr.format(row="e") for expr in ENFORCEMENT_ROLLUP_KEYS.values())
+    con.execute(f"DELETE FROM enforcement_rollups{site_filter}", params)
+    con.execute(
+        f"""
+        INSERT INTO enforcement_rollups({columns}, events_count)
+        SELECT {values}, COUNT(*)
+        FROM enforcement_events e
+        {site_filter}
+        GROUP BY {values}
+        """,
+        params,
+    )
+
+
+def ensure_enforcement_rollup_schema(con: sqlite3.Connection) -> None:
+    created = not table_columns(con, "enforcement_rollups")
+    con.execute(
+        """
+        CREATE TABLE IF NOT EXISTS enforcement_rollups (
+          site_code TEXT NOT NULL,
+          day TEXT NOT NULL,
+          hour INTEGER NOT NULL,
+          verdict TEXT NOT NULL,
+          location TEXT NOT NULL DEFAULT '',
+          events_count INTEGER NOT NULL DEFAULT 0,
+          PRIMARY KEY (site_code, day, hour, verdict, location)
+        ) WITHOUT ROWID
+        """
+    )
+    con.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_enforcement_rollups_insert
+        AFTER INSERT ON enforcement_events
+        BEGIN {enforcement_rollup_delta_sql('NEW', 1)} END
+        """
+    )
+    con.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_enforcement_rollups_delete
+        AFTER DELETE ON enforcement_events
+        BEGIN {enforcement_rollup_delta_sql('OLD', -1)} END
+        """
+    )
+    con.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_enforcement_rollups_update
+        AFTER UPDATE OF site_code, created_at, verdict, location ON enforcement_events
+        BEGIN {enforcement_rollup_delta_sql('OLD', -1)} {enforcement_rollup_delta_sql('NEW', 1)} END
+        """
+    )
+    if created:
+        rebuild_enforcement_rollups(con)
+
+
+PLATE_OFFENSE_RECENT_LIMIT = 5
+PLATE_OFFENSE_VIOLATION_VERDICTS = ("EXPIRED", "BLOCKED", "UNREGISTERED")
+
+
+def plate_offense_select_sql(where: str) -> str:
+    return f"""
+      SELECT
+        e.site_code,
+        e.plate,
+        COUNT(*),
+        SUM(CASE WHEN e.verdict IN ({", ".join(f"'{verdict}'" for verdict in PLATE_OFFENSE_VIOLATION_VERDICTS)}) THEN 1 ELSE 0 END),
+        (
+          SELECT json_group_object(v.verdict, v.cnt)
+          FROM (
+            SELECT verdict, COUNT(*) AS cnt FROM enforcement_events
+            WHERE site_code = e.site_code AND plate = e.plate GROUP BY verdict
+          ) v
+        ),
+        (
+          SELECT json_group_array(r.id)
+          FROM (
+            SELECT id FROM enforcement_events
+            WHERE site_code = e.site_code AND plate = e.plate
+            ORDER BY created_at DESC, id DESC LIMIT {PLATE_OFFENSE_RECENT_LIMIT}
+          ) r
+        ),
+        MAX(e.id),
+        MAX(e.created_at),
+        datetime('now')
+      FROM enforcement_events e
+      WHERE {where}
+      GROUP BY e.site_code, e.plate
+    """
+
+
+PLATE_OFFENSE_COLUMNS = "site_code, plate, total_count, violations_count, verdict_counts, recent_event_ids, last_event_id, last_seen_at, updated_at"
+
+
+def plate_offense_refresh_sql(row: str) -> str:
+    return f"""
+      DELETE FROM plate_offense_summary
+      WHERE site_code = {row}.site_code AND plate = {row}.plate
+        AND NOT EXISTS (SELECT 1 FROM enforcement_events WHERE site_code = {row}.site_code AND plate = {row}.plate);
+      INSERT INTO plate_offense_summary({PLATE_OFFENSE_COLUMNS})
+      {plate_offense_select_sql(f"e.site_code = {row}.site_code AND e.plate = {row}.plate")}
+      ON CONFLICT(site_code, plate) DO UPDATE SET
+        total_count = excluded.total_count,
+        violations_count = excluded.violations_count,
+        verdict_counts = excluded.verdict_counts,
+        recent_event_ids = excluded.recent_event_ids,
+        last_event_id = excluded.last_event_id,
+        last_seen_at = excluded.last_seen_at,
+        updated_at = excluded.updated_at;
+    """
+
+
+def rebuild_plate_offense_summary(con: sqlite3.Connection, site_code: str | None = None) -> None:
+    params: tuple[Any, ...] = (normalize_site_code(site_code),) if site_code else ()
+    con.execute(f"DELETE FROM plate_offense_summary{' WHERE site_code = ?' if site_code else ''}", params)
+    con.execute(
+        f"INSERT INTO plate_offense_summary({PLATE_OFFENSE_COLUMNS}) {plate_offense_select_sql('e.site_code = ?' if site_code else '1 = 1')}",
+        params,
+    )
+
+
+def ensure_plate_offense_schema(con: sqlite3.Connection) -> None:
+    created = not table_columns(con, "plate_offense_summary")
+    con.execute(
+        """
+        CREATE TABLE IF NOT EXISTS plate_offense_summary (
+          site_code TEXT NOT NULL,
+          plate TEXT NOT NULL,
+          total_count INTEGER NOT NULL DEFAULT 0,
+          violations_count INTEGER NOT NULL DEFAULT 0,
+          verdict_counts TEXT NOT NULL DEFAULT '{}',
+          recent_event_ids TEXT NOT NULL DEFAULT '[]',
+          last_event_id INTEGER,
+          last_seen_at TEXT,
+          updated_at TEXT NOT NULL DEFAULT (datetime('now')),
+          PRIMARY KEY (site_code, plate)
+        ) WITHOUT ROWID
+        """
+    )
+    triggers = {
+        "trg_plate_offense_insert": ("AFTER INSERT ON enforcement_events", plate_offense_refresh_sql("NEW")),
+        "trg_plate_offense_delete": ("AFTER DELETE ON enforcement_events", plate_offense_refresh_sql("OLD")),
+        "trg_plate_offense_update": (
+            "AFTER UPDATE OF site_code, plate, verdict, created_at ON enforcement_events",
+            plate_offense_refresh_sql("OLD") + plate_offense_refresh_sql("NEW"),
+        ),
+    }
+    for name, (event, body) in triggers.items():
+        con.execute(f"CREATE TRIGGER IF NOT EXISTS {name} {event} BEGIN {body} END")
+    if created:
+        rebuild_plate_offense_summary(con)
+
+
+VEHICLE_DATA_COLUMNS = (
+    "plate",
+    "unit",
+    "building",
+    "unit_number",
+    "owner_name",
+    "phone",
+    "status",
+    "valid_from",
+    "valid_to",
+    "note",
+    "source_file",
+    "source_sheet",
+    "manual_override",
+    "deleted_at",
+)
+
+
+def replace_site_vehicles(con: sqlite3.Connection, site_code: str, rows: list[dict[str, Any]]) -> dict[str, int]:
+    compare_columns = VEHICLE_DATA_COLUMNS + ("updated_at",)
+    existing = {
+        row["plate"]: tuple(row[column] for column in compare_columns)
+        for row in con.execute(
+            f"SELECT {', '.join(compare_columns)} FROM vehicles WHERE site_code = ?",
+            (site_code,),
+        ).fetchall()
+    }
+    desired: dict[str, dict[str, Any]] = {}
+    for row in rows:
+        desired[str(row["plate"])] = row
+
+    changed: list[tuple[Any, ...]] = []
+    for plate, row in desired.items():
+        values = tuple(row.get(column) for column in VEHICLE_DATA_COLUMNS)
+        current = existing.get(plate)
+        if current is not None and current[: len(VEHICLE_DATA_COLUMNS)] == values and row.get("updated_at") in (None, current[-1]):
+            continue
+        changed.append((site_code, *values, row.get("updated_at")))
+    removed = [(site_code, plate) for plate in existing if plate not in desired]
+
+    con.executemany("DELETE FROM vehicles WHERE site_code = ? AND plate = ?", removed)
+    assignments = ", ".join(f"{column} = excluded.{column}" for column in VEHICLE_DATA_COLUMNS[1:])
+    con.executemany(
+        f"""
+        INSERT INTO vehicles(site_code, {', '.join(VEHICLE_DATA_COLUMNS)}, updated_at)
+        VALUES (?, {', '.join('?' for _ in VEHICLE_DATA_COLUMNS)}, COALESCE(?, datetime('now')))
+        ON CONFLICT(site_code, plate) DO UPDATE SET {assignments}, updated_at = excluded.updated_at
+        """,
+        changed,
+    )
+    return {"changed": len(changed), "removed": len(removed), "unchanged": len(desired) - len(changed)}
+
+
+REGISTRY_TOMBSTONE_RETENTION_DAYS = 30
+
+
+def registry_change_sql(row: str, deleted: str) -> str:
+    return f"""
+      INSERT INTO registry_generations(site_code, generation, updated_at)
+      VALUES ({row}.site_code, 1, datetime('now'))
+      ON CONFLICT(site_code) DO UPDATE SET generation = generation + 1, updated_at = excluded.updated_at;
+      INSERT INTO registry_changes(site_code, plate, seq, deleted, changed_at)
+      SELECT {row}.site_code, {row}.plate, generation, {deleted}, datetime('now')
+      FROM registry_generations WHERE site_code = {row}.site_code
+      ON CONFLICT(site_code, plate) DO UPDATE SET
+        seq = excluded.seq,
+        deleted = excluded.deleted,
+        changed_at = excluded.changed_at;
+    """
+
+
+def rebuild_registry_changes(con: sqlite3.Connection, site_code: str | None = None) -> None:
+    site_filter = " WHERE site_code = ?" if site_code else ""
+    params: tuple[Any, ...] = (normalize_site_code(site_code),) if site_code else ()
+    con.execute(f"DELETE FROM registry_changes{site_filter}", params)
+    con.execute(
+        f"""
+        INSERT INTO registry_changes(site_code, plate, seq, deleted, changed_at)
+        SELECT
+          site_code,
+          plate,
+          ROW_NUMBER() OVER (PARTITION BY site_code ORDER BY plate),
+          {flag_sql("deleted_at IS NOT NULL")},
+          datetime('now')
+        FROM vehicles
+        {site_filter}
+        """,
+        params,
+    )
+    con.execute(
+        f"""
+        INSERT INTO registry_generations(site_code, generation, compacted_seq, updated_at)
+        SELECT site_code, MAX(seq), MAX(seq), datetime('now')
+        FROM registry_changes
+        {site_filter}
+        GROUP BY site_code
+        ON CONFLICT(site_code) DO UPDATE SET
+          generation = MAX(generation + 1, excluded.generation),
+          compacted_seq = MAX(generation + 1, excluded.generation),
+          updated_at = excluded.updated_at
+        """,
+        params,
+    )
+
+
+def compact_registry_changes(
+    con: sqlite3.Connection,
+    site_code: str | None = None,
+    retention_days: int = REGISTRY_TOMBSTONE_RETENTION_DAYS,
+) -> int:
+    site_filter = " AND site_code = ?" if site_code else ""
+    params: tuple[Any, ...] = (f"-{int(retention_days)} days",) + ((normalize_site_code(site_code),) if site_code else ())
+    expired = con.execute(
+        f"""
+        SELECT site_code, MAX(seq) AS max_seq, COUNT(*) AS cnt
+        FROM registry_changes
+        WHERE deleted = 1 AND changed_at < datetime('now', ?){site_filter}
+        GROUP BY site_code
+        """,
+        params,
+    ).fetchall()
+    for row in expired:
+        con.execute(
+            "UPDATE registry_generations SET compacted_seq = MAX(compacted_seq, ?) WHERE site_code = ?",
+            (row["max_seq"], row["site_code"]),
+        )
+        con.execute(
+            "DELETE FROM registry_changes WHERE site_code = ? AND deleted = 1 AND seq <= ?",
+            (row["site_code"], row["max_seq"]),
+        )
+    return sum(int(row["cnt"]) for row in expired)
+
+
+def ensure_registry_change_schema(con: sqlite3.Connection) -> None:
+    con.execute(
+        """
+        CREATE TABLE IF NOT EXISTS registry_generations (
+          site_code TEXT PRIMARY KEY,
+          generation INTEGER NOT NULL DEFAULT 0,
+          updated_at TEXT NOT NULL DEFAULT (datetime('now'))
+        )
+        """
+    )
+    if "compacted_seq" not in table_columns(con, "registry_generations"):
+        con.execute("ALTER TABLE registry_generations ADD COLUMN compacted_seq INTEGER NOT NULL DEFAULT 0")
+    created = not table_columns(con, "registry_changes")
+    con.execute(
+        """
+        CREATE TABLE IF NOT EXISTS registry_changes (
+          site_code TEXT NOT NULL,
+          plate TEXT NOT NULL,
+          seq INTEGER NOT NULL,
+          deleted INTEGER NOT NULL DEFAULT 0,
+          changed_at TEXT NOT NULL DEFAULT (datetime('now')),
+          PRIMARY KEY (site_code, plate)
+        ) WITHOUT ROWID
+        """
+    )
+    con.execute("CREATE INDEX IF NOT EXISTS idx_registry_changes_site_seq ON registry_changes(site_code, seq)")
+    for legacy in ("trg_registry_generation_insert", "trg_registry_generation_delete", "trg_registry_generation_update"):
+        con.execute(f"DROP TRIGGER IF EXISTS {legacy}")
+    triggers = {
+        "trg_registry_changes_insert": ("AFTER INSERT ON vehicles", registry_change_sql("NEW", flag_sql("NEW.deleted_at IS NOT NULL"))),
+        "trg_registry_changes_delete": ("AFTER DELETE ON vehicles", registry_change_sql("OLD", "1")),
+        "trg_registry_changes_rekey": (
+            "AFTER UPDATE OF site_code, plate ON vehicles WHEN OLD.site_code <> NEW.site_code OR OLD.plate <> NEW.plate",
+            registry_change_sql("OLD", "1"),
+        ),
+        "trg_registry_changes_update": ("AFTER UPDATE ON vehicles", registry_change_sql("NEW", flag_sql("NEW.deleted_at IS NOT NULL"))),
+    }
+    for name, (event, body) in triggers.items():
+        con.execute(f"CREATE TRIGGER IF NOT EXISTS {name} {event} BEGIN {body} END")
+    if created:
+        rebuild_registry_changes(con)
+
+
+SITE_GENERATION_SOURCES = {
+    "vehicles": "registry",
+    "import_runs": "registry",
+    "vehicle_backups": "registry",
+    "ocr_feedback": "ocr",
+    "enforcement_events": "enforcement",
+    "cctv_search_requests": "cctv",
+    "users": "users",
+    "contacts": "contacts",
+    "site_settings": "settings",
+    "sites": "sites",
+    "site_billing": "billing",
+    "google_play_purchases": "billing",
+    "billing_inquiries": "billing",
+}
+CENTRAL_DERIVED_KEYS = {
+    "site_usage_counters": (
+        "metric",
+        {metric for metric, (table, *_) in {**USAGE_COUNTER_SOURCES, **SITE_STAT_COUNTERS}.items() if table in CENTRAL_TABLES},
+    ),
+    "site_generations": ("scope", {scope for table, scope in SITE_GENERATION_SOURCES.items() if table in CENTRAL_TABLES}),
+}
+
+
+def site_generation_bump_sql(site_expr: str, scope: str) -> str:
+    return f"""
+      INSERT INTO site_generations(site_code, scope, generation)
+      VALUES ({site_expr}, '{scope}', 1)
+      ON CONFLICT(site_code, scope) DO UPDATE SET generation = generation + 1;
+    """
+
+
+def ensure_site_generation_schema(con: sqlite3.Connection) -> None:
+    con.execute(
+        """
+        CREATE TABLE IF NOT EXISTS site_generations (
+          site_code TEXT NOT NULL,
+          scope TEXT NOT NULL,
+          generation INTEGER NOT NULL DEFAULT 0,
+          PRIMARY KEY (site_code, scope)
+        ) WITHOUT ROWID
+        """
+    )
+    for table, scope in SITE_GENERATION_SOURCES.items():
+        if "site_code" not in table_columns(con, table):
+            continue
+        triggers = {
+            "insert": site_generation_bump_sql("NEW.site_code", scope),
+            "delete": site_generation_bump_sql("OLD.site_code", scope),
+            "update": site_generation_bump_sql("OLD.site_code", scope) + site_generation_bump_sql("NEW.site_code", scope),
+        }
+        for event, body in triggers.items():
+            con.execute(
+                f"CREATE TRIGGER IF NOT EXISTS trg_site_generation_{table}_{event} "
+                f"AFTER {event.upper()} ON {table} BEGIN {body} END"
+            )
+
+
+def site_generations(con: sqlite3.Connection, site_code: str, scopes: tuple[str, ...]) -> dict[str, int]:
+    placeholders = ", ".join("?" for _ in scopes)
+    rows = con.execute(
+        f"SELECT scope, generation FROM {derived_table_sql(con, 'site_generations')} WHERE site_code = ? AND scope IN ({placeholders})",
+        (site_code, *scopes),
+    ).fetchall()
+    found = {row["scope"]: int(row["generation"]) for row in rows}
+    return {scope: found.get(scope, 0) for scope in scopes}
+
+
+BACKUP_MIN_KEEP = 5
+BACKUP_MAX_KEEP = 30
+BACKUP_RETENTION_DAYS = 90
+SCHEDULER_HISTORY_KEEP = 200
+
+
+def prune_vehicle_backups(
+    con: sqlite3.Connection,
+    site_code: str | None = None,
+    *,
+    min_keep: int = BACKUP_MIN_KEEP,
+    max_keep: int = BACKUP_MAX_KEEP,
+    retention_days: int = BACKUP_RETENTION_DAYS,
+) -> int:
+    site_filter = "WHERE site_code = ?" if site_code else ""
+    params: list[Any] = [site_code] if site_code else []
+    cur = con.execute(
+        f"""
+        DELETE FROM vehicle_backups
+        WHERE id IN (
+          SELECT id
+          FROM (
+            SELECT
+              id,
+              created_at,
+              ROW_NUMBER() OVER (PARTITION BY site_code ORDER BY created_at DESC, id DESC) AS position
+            FROM vehicle_backups
+            {site_filter}
+          )
+          WHERE position > ?
+            AND (position > ? OR created_at < datetime('now', ?))
+        )
+        """,
+        (*params, max(min_keep, 1), max(max_keep, min_keep, 1), f"-{max(retention_days, 0)} days"),
+    )
+    con.execute("DELETE FROM vehicle_backup_snapshots WHERE backup_id NOT IN (SELECT id FROM vehicle_backups)")
+    return cur.rowcount
+
+
+def ensure_scheduler_schema(con: sqlite3.Connection) -> None:
+    con.execute(
+        """
+        CREATE TABLE IF NOT EXISTS scheduler_locks (
+          job_name TEXT PRIMARY KEY,
+          owner TEXT NOT NULL,
+          locked_until TEXT NOT NULL
+        ) WITHOUT ROWID
+        """
+    )
+    con.execute(
+        """
+        CREATE TABLE IF NOT EXISTS scheduler_job_runs (
+          id INTEGER PRIMARY KEY AUTOINCREMENT,
+          job_name TEXT NOT NULL,
+          scheduled_for TEXT NOT NULL,
+          trigger TEXT NOT NULL DEFAULT 'schedule',
+          owner TEXT,
+          status TEXT NOT NULL DEFAULT 'running',
+          detail TEXT,
+          started_at TEXT NOT NULL DEFAULT (datetime('now')),
+          finished_at TEXT
+        )
+        """
+    )
+    con.execute(
+        """
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_scheduler_job_runs_slot
+        ON scheduler_job_runs(job_name, scheduled_for)
+        """
+    )
+
+
+MATERIALIZED_VIEW_REBUILDERS = {
+    "usage_counters": rebuild_usage_counters,
+    "enforcement_rollups": rebuild_enforcement_rollups,
+    "plate_offense_summary": rebuild_plate_offense_summary,
+    "registry_changes": rebuild_registry_changes,
+}
+
+
+def rebuild_materialized_views(site_code: str | None = None, names: list[str] | None = None) -> list[str]:
+    selected = names or list(MATERIALIZED_VIEW_REBUILDERS)
+    unknown = [name for name in selected if name not in MATERIALIZED_VIEW_REBUILDERS]
+    if unknown:
+        raise ValueError(f"unknown materialized views: {', '.join(unknown)}")
+    with connect() as con:
+        for name in selected:
+            MATERIALIZED_VIEW_REBUILDERS[name](con, site_code)
+        con.commit()
+    if sharding_enabled():
+        for target in [normalize_site_code(site_code)] if site_code else site_codes():
+            with connect(target) as con:
+                for name in selected:
+                    MATERIALIZED_VIEW_REBUILDERS[name](con, target)
+                con.commit()
+    return selected
+
+
+def init_schema(con: sqlite3.Connection) -> None:
     schema_path = BASE_DIR / "schema.sql"
-    schema_sql = schema_path.read_text(encoding="utf-8")
+    for statement in split_statements(schema_path.read_text(encoding="utf-8")):
+        con.execute(statement)
+    ensure_vehicle_schema(con)
+    ensure_vehicle_management_schema(con)
+    ensure_enforcement_event_schema(con)
+    ensure_site_schema(con)
+    ensure_billing_schema(con)
+    ensure_cctv_request_schema(con)
+    ensure_user_role_schema(con)
+    ensure_contact_schema(con)
+    create_core_query_indexes(con)
+    ensure_usage_counter_schema(con)
+    ensure_enforcement_rollup_schema(con)
+    ensure_plate_offense_schema(con)
+    ensure_registry_change_schema(con)
+    ensure_site_generation_schema(con)
+    ensure_scheduler_schema(con)
+
+
+SCHEMA_MIGRATIONS: tuple[Callable[[sqlite3.Connection], None], ...] = (init_schema,)
+SCHEMA_VERSION = len(SCHEMA_MIGRATIONS)
+
+
+def schema_version(con: sqlite3.Connection) -> int:
+    return int(con.execute("PRAGMA user_version").fetchone()[0])
+
+
+def migrate_schema(con: sqlite3.Connection, finalize: Callable[[sqlite3.Connection], None] | None = None) -> int:
+    if schema_version(con) >= SCHEMA_VERSION:
+        return 0
+    con.execute("PRAGMA journal_mode = WAL")
+    begin_immediate(con)
+    current = schema_version(con)
+    if current >= SCHEMA_VERSION:
+        con.rollback()
+        return 0
+    if storage_backend() == "postgres":
+        postgres_storage(DATABASE_URL).install_compat(con)
+    for migration in SCHEMA_MIGRATIONS[current:]:
+        migration(con)
+    if finalize:
+        finalize(con)
+    con.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    con.commit()
+    return SCHEMA_VERSION - current
+
+
+def init_db() -> int:
     with connect() as con:
-        con.executescript(schema_sql)
-        ensure_vehicle_schema(con)
-        ensure_vehicle_management_schema(con)
-        ensure_site_schema(con)
-        ensure_billing_schema(con)
-        ensure_cctv_request_schema(con)
-        ensure_user_role_schema(con)
-        ensure_contact_schema(con)
-        create_core_query_indexes(con)
-        ensure_billing_schema(con)
+        return migrate_schema(con)
+
+
+def shard_source_filter(table: str, schema: str) -> str:
+    if table == "vehicle_backup_snapshots":
+        return f"backup_id IN (SELECT id FROM {schema}.vehicle_backups WHERE site_code = ?)"
+    return "site_code = ?"
+
+
+def split_site_into_shard(site_code: str) -> dict[str, int]:
+    normalized = normalize_site_code(site_code)
+    copied: dict[str, int] = {}
+    with connect(normalized) as con:
+        begin_immediate(con)
+        con.execute("DELETE FROM central.site_generations WHERE 0")
+        for table in SHARD_SEED_TABLES:
+            columns = ", ".join(sorted(table_columns(con, table)))
+            con.execute(
+                f"INSERT OR REPLACE INTO main.{table}({columns}) SELECT {columns} FROM central.{table} WHERE site_code = ?",
+                (normalized,),
+            )
+        for table in SHARD_SOURCE_TABLES:
+            columns = ", ".join(sorted(table_columns(con, table)))
+            copied[table] = con.execute(
+                f"INSERT OR IGNORE INTO main.{table}({columns}) SELECT {columns} FROM central.{table} WHERE {shard_source_filter(table, 'central')}",
+                (normalized,),
+            ).rowcount
+        for table in reversed(SHARD_SOURCE_TABLES):
+            con.execute(f"DELETE FROM central.{table} WHERE {shard_source_filter(table, 'central')}", (normalized,))
+        for table in SHARD_DERIVED_TABLES:
+            if table not in SHARD_SEED_TABLES:
+                con.execute(f"DELETE FROM central.{table} WHERE site_code = ?{central_derived_exclusion(table)}", (normalized,))
+        for rebuild in MATERIALIZED_VIEW_REBUILDERS.values():
+            rebuild(con, normalized)
         con.commit()
+    return copied
+
+
+def split_into_shards(site_code: str | None = None) -> dict[str, dict[str, int]]:
+    if not sharding_enabled():
+        raise RuntimeError("PARKING_SHARD_DIR must be set to split the database into site shards")
+    targets = [normalize_site_code(site_code)] if site_code else site_codes()
+    return {target: split_site_into_shard(target) for target in targets}
 
 
 def seed_users() -> None:
@@ -542,7 +1477,7 @@ def maybe_seed_demo() -> None:
         (site_code, "34나5678", "102-803", "102", "803", "김영희", "010-2222-3333", "blocked", None, None, "관리소 차단 차량", "demo.xlsx", "vehicles"),
         (site_code, "123다4567", "103-1502", "103", "1502", "이철수", "010-3333-4444", "temp", "2026-04-01", "2026-04-30", "임시 등록", "demo.xlsx", "vehicles"),
     ]
-    with connect() as con:
+    with connect(site_code) as con:
         exists = con.execute("SELECT COUNT(*) AS cnt FROM vehicles WHERE site_code = ?", (site_code,)).fetchone()
         if int(exists["cnt"]) > 0:
             return
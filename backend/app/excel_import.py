@@ -7,9 +7,7 @@ from datetime import date, datetime
 from pathlib import Path
 from typing import Any
 
-from openpyxl import load_workbook
-
-from .db import connect, normalize_site_code
+from .db import begin_immediate, compact_registry_changes, connect, normalize_site_code, replace_site_vehicles
 from .plates import normalize_plate, normalize_status
 
 EXCEL_SUFFIXES = {".xlsx", ".xlsm"}
@@ -237,7 +235,7 @@ def describe_excel_files(source_dir: str | os.PathLike[str], limit: int = 20) ->
 
 
 def record_import_run(site_code: str, source_dir: Path, files_count: int, rows_count: int, status: str, message: str) -> None:
-    with connect() as con:
+    with connect(site_code) as con:
         con.execute(
             """
             INSERT INTO import_runs(site_code, source_dir, files_count, rows_count, status, message)
@@ -259,6 +257,8 @@ def sync_registry_from_dir(source_dir: str | os.PathLike[str], site_code: str |
         record_import_run(resolved_site_code, source_path, 0, 0, "skipped", message)
         raise FileNotFoundError(message)
 
+    from openpyxl import load_workbook
+
     merged: dict[str, RegistryRecord] = {}
     rows_seen = 0
 
@@ -282,7 +282,8 @@ def sync_registry_from_dir(source_dir: str | os.PathLike[str], site_code: str |
         record_import_run(resolved_site_code, source_path, len(files), 0, "failed", message)
         raise ValueError(message)
 
-    with connect() as con:
+    with connect(resolved_site_code) as con:
+        begin_immediate(con)
         manual_rows = []
         if preserve_manual:
             manual_rows = [
@@ -296,59 +297,42 @@ def sync_registry_from_dir(source_dir: str | os.PathLike[str], site_code: str |
                     (resolved_site_code,),
                 ).fetchall()
             ]
-        con.execute("DELETE FROM vehicles WHERE site_code = ?", (resolved_site_code,))
-        con.executemany(
-            """
-            INSERT INTO vehicles
-            (site_code, plate, unit, building, unit_number, owner_name, phone, status, valid_from, valid_to, note, source_file, source_sheet, manual_override, deleted_at, updated_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 0, NULL, datetime('now'))
-            """,
-            [
-                (
-                    resolved_site_code,
-                    record.plate,
-                    record.unit,
-                    record.building,
-                    record.unit_number,
-                    record.owner_name,
-                    record.phone,
-                    record.status,
-                    record.valid_from,
-                    record.valid_to,
-                    record.note,
-                    record.source_file,
-                    record.source_sheet,
-                )
-                for record in merged.values()
-            ],
-        )
+        rows = [
+            {
+                "plate": record.plate,
+                "unit": record.unit,
+                "building": record.building,
+                "unit_number": record.unit_number,
+                "owner_name": record.owner_name,
+                "phone": record.phone,
+                "status": record.status,
+                "valid_from": record.valid_from,
+                "valid_to": record.valid_to,
+                "note": record.note,
+                "source_file": record.source_file,
+                "source_sheet": record.source_sheet,
+                "manual_override": 0,
+                "deleted_at": None,
+            }
+            for record in merged.values()
+        ]
         preserved_count = 0
         for row in manual_rows:
             if row["plate"] in merged:
                 continue
-            con.execute(
-                """
-                INSERT INTO vehicles
-                (site_code, plate, unit, building, unit_number, owner_name, phone, status, valid_from, valid_to, note, source_file, source_sheet, manual_override, deleted_at, updated_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 1, NULL, datetime('now'))
-                """,
-                (
-                    row["site_code"],
-                    row["plate"],
-                    row.get("unit"),
-                    row.get("building"),
-                    row.get("unit_number"),
-                    row.get("owner_name"),
-                    row.get("phone"),
-                    row.get("status") or "active",
-                    row.get("valid_from"),
-                    row.get("valid_to"),
-                    row.get("note"),
-                    row.get("source_file") or "manual",
-                    row.get("source_sheet") or "manual",
-                ),
+            rows.append(
+                {
+                    **row,
+                    "status": row.get("status") or "active",
+                    "source_file": row.get("source_file") or "manual",
+                    "source_sheet": row.get("source_sheet") or "manual",
+                    "manual_override": 1,
+                    "deleted_at": None,
+                }
             )
             preserved_count += 1
+        replace_site_vehicles(con, resolved_site_code, rows)
+        compact_registry_changes(con, resolved_site_code)
         con.execute(
             """
             INSERT INTO import_runs(site_code, source_dir, files_count, rows_count, status, message)
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any
+
+LIVE_REPLAY_LIMIT = 200
+LIVE_QUEUE_LIMIT = 500
+
+
+@dataclass(slots=True)
+class LiveEvent:
+    id: int
+    site_code: str
+    type: str
+    data: dict[str, Any]
+
+    def encode(self) -> str:
+        payload = json.dumps(self.data, ensure_ascii=False, default=str)
+        return f"id: {self.id}\nevent: {self.type}\ndata: {payload}\n\n"
+
+
+@dataclass(eq=False)
+class LiveSubscriber:
+    site_code: str
+    loop: asyncio.AbstractEventLoop
+    queue: asyncio.Queue = field(default_factory=lambda: asyncio.Queue(LIVE_QUEUE_LIMIT))
+
+    def deliver(self, event: LiveEvent) -> None:
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            pass
+
+
+class LiveEventBus:
+    def __init__(self, replay_limit: int = LIVE_REPLAY_LIMIT) -> None:
+        self._lock = threading.Lock()
+        self._next_id = 0
+        self._history: dict[str, deque[LiveEvent]] = {}
+        self._subscribers: dict[str, set[LiveSubscriber]] = {}
+        self._replay_limit = replay_limit
+
+    def publish(self, site_code: str, event_type: str, data: dict[str, Any]) -> LiveEvent:
+        with self._lock:
+            self._next_id += 1
+            event = LiveEvent(id=self._next_id, site_code=site_code, type=event_type, data=data)
+            self._history.setdefault(site_code, deque(maxlen=self._replay_limit)).append(event)
+            subscribers = list(self._subscribers.get(site_code, ()))
+        for subscriber in subscribers:
+            try:
+                subscriber.loop.call_soon_threadsafe(subscriber.deliver, event)
+            except RuntimeError:
+                self.unsubscribe(subscriber)
+        return event
+
+    def subscribe(self, site_code: str, last_event_id: int | None = None) -> tuple[LiveSubscriber, list[LiveEvent]]:
+        subscriber = LiveSubscriber(site_code=site_code, loop=asyncio.get_running_loop())
+        with self._lock:
+            self._subscribers.setdefault(site_code, set()).add(subscriber)
+            backlog = self._replay(site_code, last_event_id)
+        return subscriber, backlog
+
+    def unsubscribe(self, subscriber: LiveSubscriber) -> None:
+        with self._lock:
+            subscribers = self._subscribers.get(subscriber.site_code)
+            if subscribers is not None:
+                subscribers.discard(subscriber)
+                if not subscribers:
+                    self._subscribers.pop(subscriber.site_code, None)
+
+    def replay(self, site_code: str, last_event_id: int | None = None) -> list[LiveEvent]:
+        with self._lock:
+            return self._replay(site_code, last_event_id)
+
+    def _replay(self, site_code: str, last_event_id: int | None) -> list[LiveEvent]:
+        if last_event_id is None:
+            return []
+        return [event for event in self._history.get(site_code, ()) if event.id > last_event_id]
+
+    def subscriber_count(self, site_code: str) -> int:
+        with self._lock:
+            return len(self._subscribers.get(site_code, ()))
+
+
+live_events = LiveEventBus()
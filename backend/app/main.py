@@ -1,39 +1,93 @@
 from __future__ import annotations
 
+import asyncio
 import base64
+import hashlib
+import importlib
 from io import BytesIO
 import json
 import os
 import re
 import threading
 import time
+import traceback
 import uuid
-from datetime import datetime, timezone
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
 from urllib.parse import quote
 
+IMPORT_STARTED_AT = time.perf_counter()
+
 from fastapi import FastAPI, File, Form, HTTPException, Request, UploadFile
-from fastapi.responses import HTMLResponse, RedirectResponse, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
-from openpyxl import Workbook
-from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
-from openpyxl.utils import get_column_letter
 from pydantic import BaseModel, Field
 
 from .auth import COOKIE_NAME, SESSION_MAX_AGE, make_session, pbkdf2_hash, pbkdf2_verify, read_session, require_role
-from .db import DEFAULT_SITE_CODE, DEFAULT_SITE_NAME, connect, init_db, maybe_seed_demo, normalize_site_code, seed_users
-from .excel_import import describe_excel_files, store_registry_upload, sync_registry_from_dir
-from .ocr_learning import get_learning_candidates, get_learning_status, parse_candidates_json, record_ocr_feedback
-from .ocr import scan_plate_image
-from .plates import PlateVerdict, evaluate_vehicle_row, extract_plate_candidates, normalize_plate
+from .backups import (
+    BACKUP_COLUMNS,
+    collect_backup_blobs,
+    compact_pending_backups,
+    apply_staged_backup,
+    referenced_backup_hashes,
+    stage_vehicle_backup,
+    store_backup_rows,
+)
+from .db import (
+    DEFAULT_SITE_CODE,
+    DEFAULT_SITE_NAME,
+    SCHEMA_VERSION,
+    USAGE_COUNTER_SOURCES,
+    USAGE_TOTAL_PERIOD,
+    VEHICLE_DATA_COLUMNS,
+    begin_immediate,
+    compact_registry_changes,
+    connect,
+    derived_table_sql,
+    init_db,
+    maybe_seed_demo,
+    normalize_site_code,
+    prune_vehicle_backups,
+    replace_site_vehicles,
+    seed_users,
+    sharding_enabled,
+    site_codes,
+    site_connections,
+    site_generations,
+    write_transaction,
+)
+from .excel_import import describe_excel_files, list_excel_files, store_registry_upload, sync_registry_from_dir
+from .live import live_events
+from .ocr_learning import (
+    CorrectionModel,
+    get_confusion_repairs,
+    get_learning_candidates,
+    get_learning_status,
+    insert_ocr_feedback,
+    parse_candidates_json,
+    refresh_correction_model,
+    update_ocr_confusions,
+)
+from .ocr import OCRScanResult, ocr_warmup, scan_plate_image, warm_up_ocr
+from .photos import PHOTO_DIR_NAME, photo_thumbnail_url, process_photo, store_photo, thumbnail_name
+from .plate_index import PlateIndex, site_plate_index
+from .plates import PlateVerdict, evaluate_vehicle_row, extract_plate_candidates, normalize_plate, normalize_status
+from .scheduler import Scheduler
+from .watcher import ImportDirectoryWatcher
+from .writer import write_coordinator
 
 BASE_DIR = Path(__file__).resolve().parent
 STATIC_DIR = BASE_DIR / "static"
 UPLOAD_DIR = Path(os.getenv("PARKING_UPLOAD_DIR", str(BASE_DIR / "uploads")))
 IMPORT_DIR = Path(os.getenv("PARKING_IMPORT_DIR", str(BASE_DIR.parent / "imports")))
 APP_TITLE = os.getenv("PARKING_APP_TITLE", "아파트 주차단속 시스템")
+APP_VERSION = "2.0.0"
 ROOT_PATH = os.getenv("PARKING_ROOT_PATH", "").strip()
 LOCAL_LOGIN_ENABLED = os.getenv("PARKING_LOCAL_LOGIN_ENABLED", "1").strip().lower() in {"1", "true", "yes", "on"}
 SESSION_COOKIE_SECURE = os.getenv("PARKING_SESSION_COOKIE_SECURE", "auto").strip().lower()
@@ -60,19 +114,80 @@ if ROOT_PATH and not ROOT_PATH.startswith("/"):
     ROOT_PATH = f"/{ROOT_PATH}"
 ROOT_PATH = ROOT_PATH.rstrip("/")
 
-UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
-IMPORT_DIR.mkdir(parents=True, exist_ok=True)
 ALLOWED_IMAGE_SUFFIXES = {".jpg", ".jpeg", ".png", ".webp", ".gif"}
 MAX_PHOTO_UPLOAD_BYTES = int(os.getenv("PARKING_MAX_PHOTO_UPLOAD_BYTES", str(10 * 1024 * 1024)))
 MAX_SETTING_IMAGE_BYTES = int(os.getenv("PARKING_MAX_SETTING_IMAGE_BYTES", str(5 * 1024 * 1024)))
-
-app = FastAPI(title=APP_TITLE, version="2.0.0", root_path=ROOT_PATH)
+REGISTRY_SNAPSHOT_FIELDS = ("plate", "status", "valid_from", "valid_to", "unit", "building", "unit_number")
+CONDITIONAL_CACHE_CONTROL = "private, no-cache"
+LIVE_HEARTBEAT_SECONDS = 20
+LIVE_RETRY_MS = 5000
+ETAG_SALT = os.getenv("PARKING_ETAG_SALT", "").strip() or f"{APP_VERSION}-{SCHEMA_VERSION}"
+CLIENT_EVENT_ID_PATTERN = re.compile(r"[A-Za-z0-9_-]{8,64}")
+ENFORCEMENT_BATCH_MAX_EVENTS = 50
+ENFORCEMENT_BATCH_MAX_AGE_DAYS = 7
+ENFORCEMENT_BATCH_TEXT_FIELDS = {
+    "plate": "차량번호",
+    "inspector": "단속자",
+    "location": "위치",
+    "memo": "메모",
+    "raw_ocr_text": "OCR 원문",
+    "ocr_best_plate": "OCR 추천 번호",
+}
+BILLING_LIMIT_EXCEEDED_DETAIL = "현재 요금제 한도를 초과했습니다. 업그레이드가 필요합니다."
+REGISTRY_CHANGES_DEFAULT_LIMIT = 1000
+REGISTRY_CHANGES_MAX_LIMIT = 5000
+STATS_DEFAULT_DAYS = 30
+STATS_MAX_DAYS = 366
+STATS_UTC_OFFSET = timedelta(
+    hours=int(os.getenv("PARKING_STATS_UTC_OFFSET_HOURS", str(round(datetime.now().astimezone().utcoffset().total_seconds() / 3600))))
+)
+SCHEDULER_ENABLED = os.getenv("PARKING_SCHEDULER_ENABLED", "1").strip().lower() in {"1", "true", "yes", "on"}
+JOB_SCHEDULES = {
+    name: os.getenv(f"PARKING_JOB_{name.upper()}", default).strip()
+    for name, default in {
+        "registry_sync": "*/10 * * * *",
+        "backup_retention": "30 2 * * *",
+        "google_play_reverify": "0 3 * * *",
+        "photo_cleanup": "30 3 * * *",
+        "ocr_confusion": "45 * * * *",
+    }.items()
+}
+VEHICLE_BACKUP_MAX_KEEP = int(os.getenv("PARKING_BACKUP_MAX_KEEP", "30"))
+VEHICLE_BACKUP_RETENTION_DAYS = int(os.getenv("PARKING_BACKUP_RETENTION_DAYS", "90"))
+PHOTO_RETENTION_DAYS = int(os.getenv("PARKING_PHOTO_RETENTION_DAYS", "0"))
+PHOTO_ORPHAN_GRACE_HOURS = 24
+GOOGLE_PLAY_REVERIFY_HOURS = 20
+GOOGLE_PLAY_REVERIFY_BATCH = 200
+PHOTO_REFERENCE_TABLES = ("enforcement_events", "cctv_search_requests", "ocr_feedback")
+IMPORT_WATCH_MODE = os.getenv("PARKING_IMPORT_WATCH", "auto").strip().lower() or "auto"
+IMPORT_WATCH_DEBOUNCE_SECONDS = float(os.getenv("PARKING_IMPORT_WATCH_DEBOUNCE_SECONDS", "2"))
+STARTUP_WARMUP = os.getenv("PARKING_STARTUP_WARMUP", "1").strip().lower() in {"1", "true", "yes", "on"}
+STARTUP_WARMUP_MODULES = ("openpyxl",)
+STARTUP_JOIN_SECONDS = float(os.getenv("PARKING_STARTUP_JOIN_SECONDS", "10"))
+STARTUP_READY_RETRY_SECONDS = float(os.getenv("PARKING_STARTUP_READY_RETRY_SECONDS", "5"))
+STARTUP_READY_RETRY_MAX_SECONDS = 60.0
+OCR_WARMUP = os.getenv("PARKING_OCR_WARMUP", "1").strip().lower() in {"1", "true", "yes", "on"}
+FUZZY_SOURCE_LIMIT = 3
+FUZZY_SUGGESTION_LIMIT = 3
+FUZZY_DISTANCE_PENALTY = 120.0
+OCR_WORKERS = max(1, int(os.getenv("PARKING_OCR_WORKERS", str(os.cpu_count() or 2))))
+OCR_BATCH_MAX_IMAGES = int(os.getenv("PARKING_OCR_BATCH_MAX_IMAGES", "200"))
+OCR_BATCH_MAX_BYTES = int(os.getenv("PARKING_OCR_BATCH_MAX_BYTES", str(300 * 1024 * 1024)))
+
+app = FastAPI(title=APP_TITLE, version=APP_VERSION, root_path=ROOT_PATH)
 app.mount("/static", StaticFiles(directory=str(STATIC_DIR)), name="static")
-app.mount("/uploads", StaticFiles(directory=str(UPLOAD_DIR)), name="uploads")
+app.mount("/uploads", StaticFiles(directory=str(UPLOAD_DIR), check_dir=False), name="uploads")
 
 templates = Jinja2Templates(directory=str(BASE_DIR / "templates"))
 _ready_lock = threading.Lock()
 _app_ready = False
+_startup_thread: threading.Thread | None = None
+startup_profile: dict[str, float] = {}
+startup_errors: dict[str, str] = {}
+_ocr_executor: ThreadPoolExecutor | None = None
+_ocr_executor_lock = threading.Lock()
+_startup_complete = threading.Event()
+_startup_stop = threading.Event()
 _login_attempt_lock = threading.Lock()
 _login_attempts: dict[str, list[float]] = {}
 LOGIN_INVALID_MESSAGE = "로그인에 실패했습니다. 아이디와 비밀번호를 다시 확인해 주세요."
@@ -93,6 +208,11 @@ class CheckMatch(BaseModel):
     status: str | None = None
     valid_from: str | None = None
     valid_to: str | None = None
+    prior_events_count: int = 0
+    prior_violations: int = 0
+    prior_verdict_counts: dict[str, int] = Field(default_factory=dict)
+    recent_event_ids: list[int] = Field(default_factory=list)
+    last_seen_at: str | None = None
 
 
 class CheckResponse(CheckMatch):
@@ -405,6 +525,39 @@ def site_upload_url(site_code: str, filename: str) -> str:
     return app_url(f"/uploads/{site_storage_key(site_code)}/{filename}")
 
 
+SITE_SUMMARY_SELECT = """
+    SELECT
+      s.site_code,
+      s.name,
+      s.created_at,
+      COALESCE(SUM(CASE WHEN c.metric = 'users' THEN c.value END), 0) AS users_count,
+      COALESCE(SUM(CASE WHEN c.metric = 'active_vehicles' THEN c.value END), 0) AS vehicles_count,
+      COALESCE(SUM(CASE WHEN c.metric = 'manual_vehicles' THEN c.value END), 0) AS manual_vehicles_count,
+      COALESCE(SUM(CASE WHEN c.metric = 'open_cctv' THEN c.value END), 0) AS open_cctv_count,
+      COALESCE(SUM(CASE WHEN c.metric = 'monthly_records' THEN c.value END), 0) AS monthly_events_count
+    FROM sites s
+    LEFT JOIN {counters} c
+      ON c.site_code = s.site_code AND c.period IN ('{total}', strftime('%Y-%m', 'now'))
+    {where}
+    GROUP BY s.site_code, s.name, s.created_at
+"""
+
+
+def site_summary_select(con, where: str = "") -> str:
+    return SITE_SUMMARY_SELECT.format(counters=derived_table_sql(con, "site_usage_counters"), total=USAGE_TOTAL_PERIOD, where=where)
+
+
+def with_shard_site_stats(rows: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    if not sharding_enabled():
+        return rows
+    for row in rows:
+        with connect(row["site_code"]) as con:
+            stats = con.execute(site_summary_select(con, "WHERE s.site_code = ?"), (row["site_code"],)).fetchone()
+        if stats:
+            row.update(dict(stats))
+    return rows
+
+
 def site_public_dict(row: dict[str, Any] | None) -> dict[str, Any] | None:
     if not row:
         return None
@@ -414,9 +567,17 @@ def site_public_dict(row: dict[str, Any] | None) -> dict[str, Any] | None:
         "created_at": row["created_at"],
         "users_count": row.get("users_count", 0),
         "vehicles_count": row.get("vehicles_count", 0),
+        "manual_vehicles_count": row.get("manual_vehicles_count", 0),
+        "open_cctv_count": row.get("open_cctv_count", 0),
+        "monthly_events_count": row.get("monthly_events_count", 0),
     }
 
 
+def fetch_site_summary(con, site_code: str) -> dict[str, Any]:
+    row = con.execute(site_summary_select(con, "WHERE s.site_code = ?"), (normalize_site_code(site_code),)).fetchone()
+    return with_shard_site_stats([dict(row)])[0] if row else {}
+
+
 def site_name_for_code(site_code: str) -> str:
     with connect() as con:
         row = con.execute("SELECT name FROM sites WHERE site_code = ?", (normalize_site_code(site_code),)).fetchone()
@@ -489,30 +650,27 @@ def ensure_site_billing_row(con, site_code: str) -> dict[str, Any]:
     return dict(row)
 
 
+def site_usage_counts(con, site_code: str) -> dict[str, int]:
+    rows = con.execute(
+        f"""
+        SELECT metric, value
+        FROM {derived_table_sql(con, "site_usage_counters")}
+        WHERE site_code = ? AND period IN (?, strftime('%Y-%m', 'now'))
+        """,
+        (normalize_site_code(site_code), USAGE_TOTAL_PERIOD),
+    ).fetchall()
+    usage = {metric: 0 for metric in USAGE_COUNTER_SOURCES}
+    for row in rows:
+        if row["metric"] in usage:
+            usage[row["metric"]] = int(row["value"] or 0)
+    return usage
+
+
 def billing_status_for_site(site_code: str) -> dict[str, Any]:
     normalized_site = normalize_site_code(site_code)
-    with connect() as con:
+    with connect(site_code) as con:
         billing = ensure_site_billing_row(con, normalized_site)
-        usage = {
-            "users": con.execute("SELECT COUNT(*) AS cnt FROM users WHERE site_code = ?", (normalized_site,)).fetchone()["cnt"],
-            "vehicles": con.execute("SELECT COUNT(*) AS cnt FROM vehicles WHERE site_code = ?", (normalized_site,)).fetchone()["cnt"],
-            "monthly_records": con.execute(
-                """
-                SELECT COUNT(*) AS cnt
-                FROM enforcement_events
-                WHERE site_code = ? AND created_at >= datetime('now', 'start of month')
-                """,
-                (normalized_site,),
-            ).fetchone()["cnt"],
-            "monthly_cctv": con.execute(
-                """
-                SELECT COUNT(*) AS cnt
-                FROM cctv_search_requests
-                WHERE site_code = ? AND created_at >= datetime('now', 'start of month')
-                """,
-                (normalized_site,),
-            ).fetchone()["cnt"],
-        }
+        usage = site_usage_counts(con, normalized_site)
         latest_inquiries = [
             dict(row)
             for row in con.execute(
@@ -586,17 +744,36 @@ def billing_status_for_site(site_code: str) -> dict[str, Any]:
     }
 
 
-def require_billing_capacity(site_code: str, metric: str, next_count: int) -> None:
+def billing_capacity_remaining(site_code: str, metric: str) -> int | None:
     if not BILLING_ENFORCEMENT_ENABLED:
-        return
-    status = billing_status_for_site(site_code)
-    billing = status["billing"]
-    plan = status["current_plan"]
+        return None
+    normalized_site = normalize_site_code(site_code)
+    period = USAGE_TOTAL_PERIOD if USAGE_COUNTER_SOURCES[metric][1] is None else datetime.now(timezone.utc).strftime("%Y-%m")
+    with connect(site_code) as con:
+        billing = con.execute("SELECT plan, status FROM site_billing WHERE site_code = ?", (normalized_site,)).fetchone()
+        if billing is None:
+            billing = ensure_site_billing_row(con, normalized_site)
+            con.commit()
+        counter = con.execute(
+            f"""
+            SELECT value
+            FROM {derived_table_sql(con, "site_usage_counters")}
+            WHERE site_code = ? AND period = ? AND metric = ?
+            """,
+            (normalized_site, period, metric),
+        ).fetchone()
     if billing["status"] not in {"trialing", "active"}:
         raise HTTPException(status_code=402, detail="요금제 결제가 필요합니다.")
+    plan = BILLING_PLAN_CATALOG.get(billing["plan"]) or BILLING_PLAN_CATALOG["trial"]
     limit = int(plan.get(f"{metric}_limit") or 0)
-    if limit > 0 and next_count > limit:
-        raise HTTPException(status_code=402, detail="현재 요금제 한도를 초과했습니다. 업그레이드가 필요합니다.")
+    used = int(counter["value"] or 0) if counter else 0
+    return max(limit - used, 0) if limit > 0 else None
+
+
+def require_billing_capacity(site_code: str, metric: str, additional: int = 1) -> None:
+    remaining = billing_capacity_remaining(site_code, metric)
+    if remaining is not None and additional > remaining:
+        raise HTTPException(status_code=402, detail=BILLING_LIMIT_EXCEEDED_DETAIL)
 
 
 def parse_google_time(value: str | None) -> datetime | None:
@@ -819,6 +996,8 @@ def ensure_ready() -> None:
     with _ready_lock:
         if _app_ready:
             return
+        UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
+        IMPORT_DIR.mkdir(parents=True, exist_ok=True)
         init_db()
         seed_users()
         maybe_seed_demo()
@@ -826,26 +1005,53 @@ def ensure_ready() -> None:
         _app_ready = True
 
 
+PLATE_OFFENSE_SELECT = """
+    o.total_count AS offense_total_count,
+    o.violations_count AS offense_violations_count,
+    o.verdict_counts AS offense_verdict_counts,
+    o.recent_event_ids AS offense_recent_event_ids,
+    o.last_seen_at AS offense_last_seen_at
+"""
+
+
+def split_plate_offense(row: dict[str, Any]) -> tuple[dict[str, Any], dict[str, Any]]:
+    vehicle = {key: value for key, value in row.items() if not key.startswith("offense_")}
+    offense = {key[len("offense_"):]: value for key, value in row.items() if key.startswith("offense_")}
+    return vehicle, offense
+
+
 def lookup_vehicle(site_code: str, plate: str) -> dict[str, Any] | None:
+    vehicle, _ = lookup_vehicle_with_offenses(site_code, plate)
+    return vehicle
+
+
+def lookup_vehicle_with_offenses(site_code: str, plate: str) -> tuple[dict[str, Any] | None, dict[str, Any]]:
     ensure_ready()
     normalized = normalize_plate(plate)
-    with connect() as con:
+    with connect(site_code) as con:
         row = con.execute(
-            "SELECT * FROM vehicles WHERE site_code = ? AND plate = ?",
+            f"""
+            SELECT v.*, v.plate IS NOT NULL AS vehicle_found, {PLATE_OFFENSE_SELECT}
+            FROM (SELECT ? AS site_code, ? AS plate) q
+            LEFT JOIN vehicles v ON v.site_code = q.site_code AND v.plate = q.plate AND v.deleted_at IS NULL
+            LEFT JOIN plate_offense_summary o ON o.site_code = q.site_code AND o.plate = q.plate
+            """,
             (site_code, normalized),
         ).fetchone()
-    return dict(row) if row else None
+    vehicle, offense = split_plate_offense(dict(row))
+    return (vehicle if vehicle.pop("vehicle_found") else None), offense
 
 
 def lookup_vehicles_by_suffix(site_code: str, suffix: str) -> list[dict[str, Any]]:
     ensure_ready()
-    with connect() as con:
+    with connect(site_code) as con:
         rows = con.execute(
-            """
-            SELECT *
-            FROM vehicles
-            WHERE site_code = ? AND plate LIKE ?
-            ORDER BY plate
+            f"""
+            SELECT v.*, {PLATE_OFFENSE_SELECT}
+            FROM vehicles v
+            LEFT JOIN plate_offense_summary o ON o.site_code = v.site_code AND o.plate = v.plate
+            WHERE v.site_code = ? AND v.plate LIKE ? AND v.deleted_at IS NULL
+            ORDER BY v.plate
             """,
             (site_code, f"%{suffix}"),
         ).fetchall()
@@ -857,8 +1063,31 @@ def is_suffix_plate_query(value: str) -> bool:
     return len(raw) == 4 and raw.isdigit()
 
 
-def build_check_match(plate: str, vehicle: dict[str, Any] | None) -> CheckMatch:
-    verdict: PlateVerdict = evaluate_vehicle_row(vehicle)
+def plate_offense_fields(offense: dict[str, Any] | None) -> dict[str, Any]:
+    offense = offense or {}
+    try:
+        verdict_counts = json.loads(offense.get("verdict_counts") or "{}")
+        recent_event_ids = json.loads(offense.get("recent_event_ids") or "[]")
+    except ValueError:
+        verdict_counts, recent_event_ids = {}, []
+    return {
+        "prior_events_count": int(offense.get("total_count") or 0),
+        "prior_violations": int(offense.get("violations_count") or 0),
+        "prior_verdict_counts": {str(key): int(value) for key, value in verdict_counts.items()},
+        "recent_event_ids": [int(value) for value in recent_event_ids],
+        "last_seen_at": offense.get("last_seen_at"),
+    }
+
+
+def build_check_match(
+    plate: str,
+    vehicle: dict[str, Any] | None,
+    offense: dict[str, Any] | None = None,
+    today: date | None = None,
+) -> CheckMatch:
+    if offense is None and vehicle:
+        vehicle, offense = split_plate_offense(vehicle)
+    verdict: PlateVerdict = evaluate_vehicle_row(vehicle, today)
     normalized = normalize_plate(plate)
     return CheckMatch(
         plate=normalized,
@@ -872,12 +1101,21 @@ def build_check_match(plate: str, vehicle: dict[str, Any] | None) -> CheckMatch:
         status=verdict.status,
         valid_from=verdict.valid_from,
         valid_to=verdict.valid_to,
+        **plate_offense_fields(offense),
     )
 
 
-def choose_best_scan_candidate(site_code: str, raw_ocr_text: str | None, manual_plate: str | None, candidates: list[str]) -> tuple[str | None, list[str]]:
+def choose_best_scan_candidate(
+    site_code: str,
+    raw_ocr_text: str | None,
+    manual_plate: str | None,
+    candidates: list[str],
+    lookup: Callable[[str], dict[str, Any] | None] | None = None,
+    learning_model: CorrectionModel | None = None,
+    plate_index: PlateIndex | None = None,
+) -> tuple[str | None, list[str]]:
     manual_normalized = normalize_plate(manual_plate)
-    learned_candidates, learning_scores = get_learning_candidates(site_code, raw_ocr_text, candidates)
+    learned_candidates, learning_scores = get_learning_candidates(site_code, raw_ocr_text, candidates, learning_model)
     source_candidates: list[str] = []
     if manual_normalized:
         source_candidates.append(manual_normalized)
@@ -893,30 +1131,54 @@ def choose_best_scan_candidate(site_code: str, raw_ocr_text: str | None, manual_
             continue
         seen.add(normalized)
         normalized_candidates.append(normalized)
+    repairs = get_confusion_repairs(site_code, raw_ocr_text, candidates)
 
-    if not normalized_candidates:
+    if not normalized_candidates and not repairs:
         return None, []
 
+    def registry_score(candidate: str) -> float:
+        verdict = evaluate_vehicle_row(lookup(candidate) if lookup else lookup_vehicle(site_code, candidate))
+        if verdict.verdict == "UNREGISTERED":
+            return 0.0
+        return 260.0 if verdict.verdict == "OK" else 220.0
+
     ranked: list[tuple[str, float]] = []
+    unmatched: list[tuple[int, str]] = []
     for index, candidate in enumerate(normalized_candidates):
-        vehicle = lookup_vehicle(site_code, candidate)
-        verdict = evaluate_vehicle_row(vehicle)
-        score = learning_scores.get(candidate, 0.0)
+        registered = registry_score(candidate)
+        score = learning_scores.get(candidate, 0.0) + registered
         if candidate == manual_normalized:
             score += 1000.0
-        if verdict.verdict != "UNREGISTERED":
-            score += 220.0
-            if verdict.verdict == "OK":
-                score += 40.0
+        if not registered:
+            unmatched.append((index, candidate))
         score += max(0.0, 30.0 - (index * 2.0))
         ranked.append((candidate, score))
 
+    suggestions: list[tuple[str, float]] = []
+    for repaired, weight in repairs:
+        if repaired in seen:
+            continue
+        seen.add(repaired)
+        suggestions.append((repaired, registry_score(repaired) + weight))
+    if unmatched:
+        plate_index = plate_index or site_plate_index(site_code)
+        for index, candidate in unmatched[:FUZZY_SOURCE_LIMIT]:
+            for nearest, distance in plate_index.nearest(candidate):
+                if nearest in seen:
+                    continue
+                seen.add(nearest)
+                score = registry_score(nearest) + max(0.0, 30.0 - (index * 2.0)) - distance * FUZZY_DISTANCE_PENALTY
+                suggestions.append((nearest, score))
+
     ranked.sort(key=lambda item: item[1], reverse=True)
-    ordered = [candidate for candidate, _ in ranked[:8]]
+    suggestions.sort(key=lambda item: item[1], reverse=True)
+    suggestions = suggestions[:FUZZY_SUGGESTION_LIMIT]
+    ordered = [candidate for candidate, _ in ranked[: 8 - len(suggestions)]]
+    ordered.extend(candidate for candidate, _ in suggestions)
     return ordered[0], ordered
 
 
-def build_check_response(site_code: str, plate: str) -> CheckResponse:
+def build_check_response(site_code: str, plate: str, today: date | None = None) -> CheckResponse:
     requested = str(plate or "").strip()
     normalized = normalize_plate(requested)
     if not normalized and not is_suffix_plate_query(requested):
@@ -924,7 +1186,7 @@ def build_check_response(site_code: str, plate: str) -> CheckResponse:
 
     if is_suffix_plate_query(requested):
         suffix_matches = [
-            build_check_match(row["plate"], row)
+            build_check_match(row["plate"], row, today=today)
             for row in lookup_vehicles_by_suffix(site_code, requested)
         ]
         suffix_matches.sort(
@@ -956,7 +1218,8 @@ def build_check_response(site_code: str, plate: str) -> CheckResponse:
             **primary.model_dump(),
         )
 
-    match = build_check_match(normalized, lookup_vehicle(site_code, normalized))
+    vehicle, offense = lookup_vehicle_with_offenses(site_code, normalized)
+    match = build_check_match(normalized, vehicle, offense, today)
     return CheckResponse(
         site_code=site_code,
         requested_plate=requested or normalized,
@@ -1032,6 +1295,16 @@ def normalize_history_datetime(value: str | None, *, end_of_range: bool = False)
     return text
 
 
+def normalize_stats_day(value: str | None, label: str) -> date | None:
+    text = str(value or "").strip()
+    if not text:
+        return None
+    try:
+        return date.fromisoformat(text[:10])
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=f"{label}을 YYYY-MM-DD 형식으로 입력해 주세요.") from exc
+
+
 def build_enforcement_history_query(
     site_code: str,
     *,
@@ -1098,7 +1371,7 @@ def fetch_enforcement_history_rows(
         date_to=date_to,
     )
     params.extend([limit, offset])
-    with connect() as con:
+    with connect(site_code) as con:
         rows = con.execute(
             f"""
             SELECT
@@ -1127,11 +1400,11 @@ def fetch_enforcement_history_rows(
             """,
             params,
         ).fetchall()
-    return [dict(row) for row in rows]
+    return [with_photo_thumb(dict(row)) for row in rows]
 
 
 def fetch_enforcement_event(site_code: str, event_id: int) -> dict[str, Any] | None:
-    with connect() as con:
+    with connect(site_code) as con:
         row = con.execute(
             """
             SELECT
@@ -1158,7 +1431,7 @@ def fetch_enforcement_event(site_code: str, event_id: int) -> dict[str, Any] | N
             """,
             (site_code, event_id),
         ).fetchone()
-    return dict(row) if row else None
+    return with_photo_thumb(dict(row)) if row else None
 
 
 def require_enforcement_event(site_code: str, event_id: int) -> dict[str, Any]:
@@ -1285,8 +1558,8 @@ def create_vehicle_backup(con, site_code: str, username: str | None, backup_name
     rows = [
         dict(row)
         for row in con.execute(
-            """
-            SELECT site_code, plate, unit, building, unit_number, owner_name, phone, status, valid_from, valid_to, note, source_file, source_sheet, manual_override, deleted_at, updated_at
+            f"""
+            SELECT {", ".join(BACKUP_COLUMNS)}
             FROM vehicles
             WHERE site_code = ?
             ORDER BY plate
@@ -1297,10 +1570,10 @@ def create_vehicle_backup(con, site_code: str, username: str | None, backup_name
     name = backup_name or f"{site_code}-{datetime.now().strftime('%Y%m%d-%H%M%S')}"
     cur = con.execute(
         """
-        INSERT INTO vehicle_backups(site_code, backup_name, vehicles_json, vehicles_count, created_by)
-        VALUES (?, ?, ?, ?, ?)
+        INSERT INTO vehicle_backups(site_code, backup_name, vehicles_json, vehicles_count, created_by, blob_hash)
+        VALUES (?, ?, '', ?, ?, ?)
         """,
-        (site_code, name, json.dumps(rows, ensure_ascii=False, default=str), len(rows), username),
+        (site_code, name, len(rows), username, store_backup_rows(rows)),
     )
     return {"id": cur.lastrowid, "backup_name": name, "vehicles_count": len(rows)}
 
@@ -1322,11 +1595,11 @@ def ensure_not_last_admin(con, site_code: str, username: str, *, next_role: str
         raise HTTPException(status_code=400, detail="마지막 관리자 계정은 삭제하거나 다른 권한으로 변경할 수 없습니다.")
 
 
-def save_photo(photo: UploadFile, site_code: str) -> str | None:
+async def save_photo(photo: UploadFile, site_code: str) -> str | None:
     if not photo.filename:
         return None
-    payload = photo.file.read()
-    return save_photo_bytes(photo.filename, payload, site_code)
+    payload = await photo.read()
+    return await run_in_threadpool(save_photo_bytes, photo.filename, payload, site_code)
 
 
 def save_photo_bytes(filename: str | None, payload: bytes, site_code: str) -> str:
@@ -1336,14 +1609,17 @@ def save_photo_bytes(filename: str | None, payload: bytes, site_code: str) -> st
         raise HTTPException(status_code=400, detail="사진 파일이 비어 있습니다.")
     if len(payload) > MAX_PHOTO_UPLOAD_BYTES:
         raise HTTPException(status_code=413, detail="사진 파일은 10MB 이하만 업로드할 수 있습니다.")
-    target_dir = site_upload_dir(site_code)
-    target_dir.mkdir(parents=True, exist_ok=True)
     suffix = Path(filename).suffix.lower() or ".jpg"
     if suffix not in ALLOWED_IMAGE_SUFFIXES:
         raise HTTPException(status_code=400, detail="사진은 jpg, png, webp, gif 형식만 사용할 수 있습니다.")
-    name = f"{uuid.uuid4().hex}{suffix}"
-    (target_dir / name).write_bytes(payload)
-    return site_upload_url(site_code, name)
+    photo_name, _ = store_photo(site_upload_dir(site_code), process_photo(payload, suffix))
+    return site_upload_url(site_code, photo_name)
+
+
+def with_photo_thumb(data: dict[str, Any]) -> dict[str, Any]:
+    if "photo_path" in data:
+        data["photo_thumb_url"] = photo_thumbnail_url(data.get("photo_path"))
+    return data
 
 
 def save_site_setting_image(filename: str | None, payload: bytes, site_code: str) -> str:
@@ -1365,7 +1641,7 @@ def save_site_setting_image(filename: str | None, payload: bytes, site_code: str
 
 def site_settings_dict(site_code: str) -> dict[str, Any]:
     normalized_site = normalize_site_code(site_code)
-    with connect() as con:
+    with connect(site_code) as con:
         row = con.execute("SELECT * FROM site_settings WHERE site_code = ?", (normalized_site,)).fetchone()
     return {
         "site_code": normalized_site,
@@ -1374,6 +1650,22 @@ def site_settings_dict(site_code: str) -> dict[str, Any]:
     }
 
 
+def publish_cctv_change(site_code: str, event_type: str, row: dict[str, Any]) -> None:
+    live_events.publish(
+        site_code,
+        event_type,
+        {key: row.get(key) for key in ("id", "status", "requester_username", "assigned_to", "updated_at")},
+    )
+
+
+def publish_enforcement_change(site_code: str, event_type: str, row: dict[str, Any]) -> None:
+    live_events.publish(
+        site_code,
+        event_type,
+        {key: row.get(key) for key in ("id", "plate", "verdict", "created_at")},
+    )
+
+
 def cctv_request_dict(row: dict[str, Any] | Any) -> dict[str, Any]:
     data = dict(row)
     start_time = data.get("search_start_time") or data.get("search_time")
@@ -1381,7 +1673,7 @@ def cctv_request_dict(row: dict[str, Any] | Any) -> dict[str, Any]:
     data["search_start_time"] = start_time
     data["search_end_time"] = end_time
     data["status_label"] = CCTV_STATUS_LABELS.get(data.get("status"), data.get("status") or "-")
-    return data
+    return with_photo_thumb(data)
 
 
 def require_cctv_request(con, site_code: str, request_id: int) -> dict[str, Any]:
@@ -1439,10 +1731,7 @@ def normalize_cctv_assignee(con, site_code: str, username: str | None) -> str |
 
 
 def auto_sync_registry() -> None:
-    with connect() as con:
-        site_codes = [row["site_code"] for row in con.execute("SELECT site_code FROM sites ORDER BY site_code").fetchall()]
-
-    for site_code in site_codes:
+    for site_code in site_codes():
         source_dir = site_import_dir(site_code)
         excel_files = [
             path
@@ -1457,9 +1746,262 @@ def auto_sync_registry() -> None:
             print(f"[startup] registry sync failed for {site_code}: {exc}")
 
 
+_registry_sync_lock = threading.Lock()
+
+
+def site_import_dirs() -> dict[str, Path]:
+    return {site_code: site_import_dir(site_code) for site_code in site_codes()}
+
+
+def sync_site_import(site_code: str) -> dict[str, Any]:
+    with _registry_sync_lock:
+        result = sync_registry_from_dir(site_import_dir(site_code), site_code)
+    live_events.publish(site_code, "registry.synced", {"vehicles_loaded": result["vehicles_loaded"]})
+    return result
+
+
+def registry_sync_due(con, site_code: str, source_dir: Path) -> bool:
+    if not source_dir.exists():
+        return False
+    files = list_excel_files(source_dir)
+    if not files:
+        return False
+    newest = max(path.stat().st_mtime for path in files)
+    row = con.execute(
+        "SELECT MAX(imported_at) AS imported_at FROM import_runs WHERE site_code = ? AND status = 'success'",
+        (site_code,),
+    ).fetchone()
+    if not row or not row["imported_at"]:
+        return True
+    imported_at = datetime.fromisoformat(row["imported_at"]).replace(tzinfo=timezone.utc)
+    return newest > imported_at.timestamp()
+
+
+def run_registry_sync_job() -> dict[str, Any]:
+    checked = site_codes()
+    due: list[str] = []
+    for site_code in checked:
+        with connect(site_code) as con:
+            if registry_sync_due(con, site_code, site_import_dir(site_code)):
+                due.append(site_code)
+    synced: list[str] = []
+    failed: dict[str, str] = {}
+    for site_code in due:
+        try:
+            sync_site_import(site_code)
+            synced.append(site_code)
+        except Exception as exc:
+            failed[site_code] = str(exc)
+    return {"checked": len(checked), "synced": synced, "failed": failed}
+
+
+def run_backup_retention_job() -> dict[str, Any]:
+    pruned = migrated = compacted = 0
+    referenced: set[str] = set()
+    for con in site_connections():
+        pruned += prune_vehicle_backups(
+            con,
+            max_keep=VEHICLE_BACKUP_MAX_KEEP,
+            retention_days=VEHICLE_BACKUP_RETENTION_DAYS,
+        )
+        migrated += compact_pending_backups(con)
+        compacted += compact_registry_changes(con)
+        con.commit()
+        referenced |= referenced_backup_hashes(con)
+        con.execute("PRAGMA optimize")
+    blobs_removed = collect_backup_blobs(referenced)
+    return {
+        "backups_pruned": pruned,
+        "pending_backups_compacted": migrated,
+        "backup_blobs_removed": blobs_removed,
+        "registry_changes_compacted": compacted,
+    }
+
+
+def run_google_play_reverify_job() -> dict[str, Any]:
+    if not google_play_configured():
+        return {"skipped": "not_configured"}
+    with connect() as con:
+        rows = con.execute(
+            """
+            SELECT site_code, username, package_name, product_id, purchase_token
+            FROM google_play_purchases
+            WHERE COALESCE(subscription_state, '') <> 'SUBSCRIPTION_STATE_EXPIRED'
+              AND verified_at < datetime('now', ?)
+            ORDER BY verified_at
+            LIMIT ?
+            """,
+            (f"-{GOOGLE_PLAY_REVERIFY_HOURS} hours", GOOGLE_PLAY_REVERIFY_BATCH),
+        ).fetchall()
+    verified = 0
+    failed: dict[str, str] = {}
+    for row in rows:
+        try:
+            apply_google_play_subscription_verification(
+                site_code=row["site_code"],
+                username=row["username"],
+                package_name=row["package_name"] or GOOGLE_PLAY_PACKAGE_NAME,
+                product_id=row["product_id"],
+                purchase_token=row["purchase_token"],
+            )
+            verified += 1
+        except Exception as exc:
+            detail = exc.detail if isinstance(exc, HTTPException) else str(exc)
+            failed[f"{row['site_code']}:{row['purchase_token'][-8:]}"] = str(detail)
+    return {"candidates": len(rows), "verified": verified, "failed": failed}
+
+
+def referenced_photo_files(con) -> set[tuple[str, str]]:
+    referenced: set[tuple[str, str]] = set()
+    for table in PHOTO_REFERENCE_TABLES:
+        rows = con.execute(
+            f"SELECT DISTINCT photo_path FROM {table} WHERE photo_path LIKE ?",
+            (f"%/{PHOTO_DIR_NAME}/%",),
+        ).fetchall()
+        for row in rows:
+            parts = str(row["photo_path"]).split("/")
+            if len(parts) < 3 or parts[-2] != PHOTO_DIR_NAME:
+                continue
+            referenced.add((parts[-3], parts[-1]))
+            referenced.add((parts[-3], thumbnail_name(parts[-1])))
+    return referenced
+
+
+def run_photo_cleanup_job() -> dict[str, Any]:
+    expired = 0
+    referenced: set[tuple[str, str]] = set()
+    for con in site_connections():
+        if PHOTO_RETENTION_DAYS > 0:
+            expired += con.execute(
+                """
+                UPDATE enforcement_events
+                SET photo_path = NULL
+                WHERE photo_path IS NOT NULL AND created_at < datetime('now', ?)
+                """,
+                (f"-{PHOTO_RETENTION_DAYS} days",),
+            ).rowcount
+            con.commit()
+        referenced |= referenced_photo_files(con)
+    cutoff = time.time() - PHOTO_ORPHAN_GRACE_HOURS * 3600
+    removed = 0
+    freed = 0
+    for path in UPLOAD_DIR.glob(f"*/{PHOTO_DIR_NAME}/*"):
+        if (path.parent.parent.name, path.name) in referenced or not path.is_file():
+            continue
+        try:
+            stat = path.stat()
+            if stat.st_mtime > cutoff:
+                continue
+            path.unlink()
+        except OSError:
+            continue
+        removed += 1
+        freed += stat.st_size
+    return {"photos_expired": expired, "files_removed": removed, "bytes_freed": freed}
+
+
+def run_ocr_confusion_job() -> dict[str, Any]:
+    mined: dict[str, int] = {}
+    for site_code in site_codes():
+        with connect(site_code) as con:
+            mined[site_code] = update_ocr_confusions(site_code, con)
+    return {"sites": len(mined), "confusions": sum(mined.values())}
+
+
+scheduler = Scheduler()
+scheduler.register("registry_sync", JOB_SCHEDULES["registry_sync"], run_registry_sync_job)
+scheduler.register("backup_retention", JOB_SCHEDULES["backup_retention"], run_backup_retention_job)
+scheduler.register("google_play_reverify", JOB_SCHEDULES["google_play_reverify"], run_google_play_reverify_job)
+scheduler.register("photo_cleanup", JOB_SCHEDULES["photo_cleanup"], run_photo_cleanup_job)
+scheduler.register("ocr_confusion", JOB_SCHEDULES["ocr_confusion"], run_ocr_confusion_job)
+import_watcher = ImportDirectoryWatcher(
+    site_import_dirs,
+    sync_site_import,
+    mode=IMPORT_WATCH_MODE,
+    debounce_seconds=IMPORT_WATCH_DEBOUNCE_SECONDS,
+)
+
+
+def startup_phase(name: str, action: Callable[[], Any]) -> bool:
+    started = time.perf_counter()
+    try:
+        action()
+        return True
+    except Exception as exc:
+        startup_errors[name] = str(exc)
+        print(f"[startup] {name} failed: {exc}")
+        traceback.print_exc()
+        return False
+    finally:
+        startup_profile[name] = round((time.perf_counter() - started) * 1000, 1)
+
+
+def warm_module(name: str) -> None:
+    try:
+        importlib.import_module(name)
+    except ImportError:
+        pass
+
+
+def startup_warmup_modules() -> list[str]:
+    modules = list(STARTUP_WARMUP_MODULES)
+    if google_play_configured():
+        modules.extend(("google.auth.transport.requests", "google.oauth2.service_account"))
+    return modules
+
+
+def start_import_watcher() -> None:
+    import_watcher.start()
+    print(f"[startup] watching registry import folders ({import_watcher.backend_name})")
+
+
+def run_startup() -> None:
+    delay = STARTUP_READY_RETRY_SECONDS
+    while not startup_phase("ready", ensure_ready):
+        print(f"[startup] database is not ready, retrying in {delay:g}s")
+        if _startup_stop.wait(delay):
+            print("[startup] aborted: shutting down before the database was ready")
+            return
+        delay = min(delay * 2, STARTUP_READY_RETRY_MAX_SECONDS)
+    startup_errors.pop("ready", None)
+    if OCR_WARMUP:
+        startup_phase("ocr", warm_up_ocr)
+    if SCHEDULER_ENABLED:
+        startup_phase("scheduler", scheduler.start)
+    if IMPORT_WATCH_MODE != "off":
+        startup_phase("watcher", start_import_watcher)
+    if STARTUP_WARMUP:
+        for module in startup_warmup_modules():
+            startup_phase(f"import:{module}", lambda module=module: warm_module(module))
+    startup_profile["total"] = round((time.perf_counter() - IMPORT_STARTED_AT) * 1000, 1)
+    print("[startup] profile " + " ".join(f"{name}={elapsed}ms" for name, elapsed in startup_profile.items()))
+    _startup_complete.set()
+
+
 @app.on_event("startup")
 def on_startup() -> None:
-    ensure_ready()
+    global _startup_thread
+    _startup_complete.clear()
+    _startup_stop.clear()
+    startup_errors.clear()
+    _startup_thread = threading.Thread(target=run_startup, name="parking-startup", daemon=True)
+    _startup_thread.start()
+
+
+@app.on_event("shutdown")
+def on_shutdown() -> None:
+    global _ocr_executor
+    _startup_stop.set()
+    if _startup_thread is not None:
+        _startup_thread.join(timeout=STARTUP_JOIN_SECONDS)
+        if _startup_thread.is_alive():
+            print(f"[startup] still running after {STARTUP_JOIN_SECONDS:g}s, shutting down anyway")
+    import_watcher.stop()
+    scheduler.stop()
+    write_coordinator.stop()
+    if _ocr_executor is not None:
+        _ocr_executor.shutdown(wait=False, cancel_futures=True)
+        _ocr_executor = None
 
 
 @app.get("/health")
@@ -1467,6 +2009,20 @@ def health() -> dict[str, bool]:
     return {"ok": True}
 
 
+@app.get("/ready")
+def readiness() -> JSONResponse:
+    ready = _app_ready and _startup_complete.is_set()
+    return JSONResponse(
+        {"ready": ready, "database": _app_ready, "ocr": dict(ocr_warmup)},
+        status_code=200 if ready else 503,
+    )
+
+
+@app.get("/health/startup")
+def health_startup() -> dict[str, Any]:
+    return {"ready": _app_ready, "phases": dict(startup_profile), "errors": dict(startup_errors)}
+
+
 @app.get("/")
 def root(request: Request):
     if read_session(request):
@@ -1623,7 +2179,14 @@ def api_me(request: Request):
 def api_billing_status(request: Request):
     ensure_ready()
     require_role(request, {"admin"})
-    return billing_status_for_site(current_site_code(request))
+    site_code = current_site_code(request)
+    return conditional_json(
+        request,
+        site_code,
+        ("billing", "users", "registry", "enforcement", "cctv", "sites"),
+        lambda: billing_status_for_site(site_code),
+        date.today().isoformat(),
+    )
 
 
 @app.post("/api/billing/inquiries")
@@ -1775,9 +2338,7 @@ def api_users_create(request: Request, payload: UserCreateRequest):
     role = normalize_user_role(payload.role)
     password = normalize_new_password(payload.password, required=True)
 
-    if BILLING_ENFORCEMENT_ENABLED:
-        current_usage = billing_status_for_site(site_code)["usage"]["users"]
-        require_billing_capacity(site_code, "users", int(current_usage) + 1)
+    require_billing_capacity(site_code, "users")
 
     with connect() as con:
         exists = con.execute(
@@ -1874,23 +2435,13 @@ def api_sites_list(request: Request, q: str = "", limit: int = 50, offset: int =
     with connect() as con:
         rows = con.execute(
             f"""
-            SELECT
-              s.site_code,
-              s.name,
-              s.created_at,
-              COUNT(DISTINCT u.id) AS users_count,
-              COUNT(DISTINCT v.plate) AS vehicles_count
-            FROM sites s
-            LEFT JOIN users u ON u.site_code = s.site_code
-            LEFT JOIN vehicles v ON v.site_code = s.site_code
-            {where}
-            GROUP BY s.site_code, s.name, s.created_at
+            {site_summary_select(con, where)}
             ORDER BY s.site_code
             LIMIT ? OFFSET ?
             """,
             params,
         ).fetchall()
-    return [site_public_dict(dict(row)) for row in rows]
+    return [site_public_dict(row) for row in with_shard_site_stats([dict(row) for row in rows])]
 
 
 @app.post("/api/sites")
@@ -1920,24 +2471,9 @@ def api_sites_create(request: Request, payload: SiteCreateRequest):
             """,
             (site_code, BILLING_PROVIDER),
         )
-        row = con.execute(
-            """
-            SELECT
-              s.site_code,
-              s.name,
-              s.created_at,
-              COUNT(DISTINCT u.id) AS users_count,
-              COUNT(DISTINCT v.plate) AS vehicles_count
-            FROM sites s
-            LEFT JOIN users u ON u.site_code = s.site_code
-            LEFT JOIN vehicles v ON v.site_code = s.site_code
-            WHERE s.site_code = ?
-            GROUP BY s.site_code, s.name, s.created_at
-            """,
-            (site_code,),
-        ).fetchone()
+        row = fetch_site_summary(con, site_code)
         con.commit()
-    return site_public_dict(dict(row))
+    return site_public_dict(row)
 
 
 @app.get("/api/cctv/assignees")
@@ -1945,17 +2481,21 @@ def api_cctv_assignees(request: Request):
     ensure_ready()
     require_role(request, CCTV_ASSIGNMENT_ROLES)
     site_code = current_site_code(request)
-    with connect() as con:
-        rows = con.execute(
-            f"""
-            SELECT site_code, username, role, created_at
-            FROM users
-            WHERE site_code = ?
-            ORDER BY {role_order_case()}, username
-            """,
-            (site_code,),
-        ).fetchall()
-    return [user_public_dict(dict(row)) for row in rows]
+
+    def build() -> list[dict[str, Any]]:
+        with connect() as con:
+            rows = con.execute(
+                f"""
+                SELECT site_code, username, role, created_at
+                FROM users
+                WHERE site_code = ?
+                ORDER BY {role_order_case()}, username
+                """,
+                (site_code,),
+            ).fetchall()
+        return [user_public_dict(dict(row)) for row in rows]
+
+    return conditional_json(request, site_code, ("users",), build)
 
 
 @app.get("/api/cctv/requests")
@@ -1992,7 +2532,7 @@ def api_cctv_requests(request: Request, limit: int = 50, offset: int = 0):
         LIMIT ? OFFSET ?
     """
     params.extend([limit, offset])
-    with connect() as con:
+    with connect(site_code) as con:
         rows = con.execute(base_query, params).fetchall()
     return [cctv_request_dict(row) for row in rows]
 
@@ -2015,13 +2555,11 @@ async def api_cctv_request_create(
     normalized_search_end_time = require_form_text(search_end_time or search_time, "검색 끝 시간")
     validate_cctv_time_range(normalized_search_start_time, normalized_search_end_time)
     normalized_content = require_form_text(content, "요청 내용")
-    if BILLING_ENFORCEMENT_ENABLED:
-        current_usage = billing_status_for_site(site_code)["usage"]["monthly_cctv"]
-        require_billing_capacity(site_code, "monthly_cctv", int(current_usage) + 1)
+    require_billing_capacity(site_code, "monthly_cctv")
     payload = await photo.read()
-    photo_path = save_photo_bytes(photo.filename, payload, site_code)
+    photo_path = await run_in_threadpool(save_photo_bytes, photo.filename, payload, site_code)
 
-    with connect() as con:
+    with connect(site_code) as con:
         cur = con.execute(
             """
             INSERT INTO cctv_search_requests
@@ -2040,6 +2578,7 @@ async def api_cctv_request_create(
         )
         row = con.execute("SELECT * FROM cctv_search_requests WHERE id = ?", (cur.lastrowid,)).fetchone()
         con.commit()
+    publish_cctv_change(site_code, "cctv.created", dict(row))
     return cctv_request_dict(row)
 
 
@@ -2048,7 +2587,7 @@ def api_cctv_request_update(request: Request, request_id: int, payload: CctvAssi
     ensure_ready()
     session = require_role(request, VIEW_ROLES)
     site_code = current_site_code(request)
-    with connect() as con:
+    with connect(site_code) as con:
         current = require_cctv_request(con, site_code, request_id)
         if not can_edit_cctv_request(session, current):
             raise HTTPException(status_code=403, detail="이 CCTV 요청을 수정할 권한이 없습니다.")
@@ -2118,6 +2657,7 @@ def api_cctv_request_update(request: Request, request_id: int, payload: CctvAssi
         )
         row = con.execute("SELECT * FROM cctv_search_requests WHERE site_code = ? AND id = ?", (site_code, request_id)).fetchone()
         con.commit()
+    publish_cctv_change(site_code, "cctv.updated", dict(row))
     return cctv_request_dict(row)
 
 
@@ -2126,15 +2666,50 @@ def api_cctv_request_delete(request: Request, request_id: int):
     ensure_ready()
     session = require_role(request, VIEW_ROLES)
     site_code = current_site_code(request)
-    with connect() as con:
+    with connect(site_code) as con:
         current = require_cctv_request(con, site_code, request_id)
         if not can_delete_cctv_request(session, current):
             raise HTTPException(status_code=403, detail="이 CCTV 요청을 삭제할 권한이 없습니다.")
         con.execute("DELETE FROM cctv_search_requests WHERE site_code = ? AND id = ?", (site_code, request_id))
         con.commit()
+    publish_cctv_change(site_code, "cctv.deleted", current)
     return {"deleted": True, "id": request_id}
 
 
+@app.get("/api/events/stream")
+async def api_events_stream(request: Request, last_event_id: int | None = None):
+    ensure_ready()
+    require_role(request, VIEW_ROLES)
+    site_code = current_site_code(request)
+    header_id = request.headers.get("last-event-id")
+    if header_id and header_id.isdigit():
+        last_event_id = int(header_id)
+    subscriber, backlog = live_events.subscribe(site_code, last_event_id)
+
+    async def stream():
+        try:
+            yield f"retry: {LIVE_RETRY_MS}\n\n"
+            for event in backlog:
+                yield event.encode()
+            while True:
+                try:
+                    event = await asyncio.wait_for(subscriber.queue.get(), timeout=LIVE_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        break
+                    yield ": ping\n\n"
+                    continue
+                yield event.encode()
+        finally:
+            live_events.unsubscribe(subscriber)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @app.get("/api/contacts")
 def api_contacts(request: Request, category: str = "", q: str = "", limit: int = 100, offset: int = 0):
     ensure_ready()
@@ -2162,18 +2737,22 @@ def api_contacts(request: Request, category: str = "", q: str = "", limit: int =
         )
         params.extend([like, like, like, like])
     params.extend([limit, offset])
-    with connect() as con:
-        rows = con.execute(
-            f"""
-            SELECT *
-            FROM contacts
-            WHERE {' AND '.join(where)}
-            ORDER BY is_favorite DESC, category, sort_order, name, id DESC
-            LIMIT ? OFFSET ?
-            """,
-            params,
-        ).fetchall()
-    return [contact_row_dict(row) for row in rows]
+
+    def build() -> list[dict[str, Any]]:
+        with connect(site_code) as con:
+            rows = con.execute(
+                f"""
+                SELECT *
+                FROM contacts
+                WHERE {' AND '.join(where)}
+                ORDER BY is_favorite DESC, category, sort_order, name, id DESC
+                LIMIT ? OFFSET ?
+                """,
+                params,
+            ).fetchall()
+        return [contact_row_dict(row) for row in rows]
+
+    return conditional_json(request, site_code, ("contacts",), build)
 
 
 @app.post("/api/contacts")
@@ -2186,7 +2765,7 @@ def api_contact_create(request: Request, payload: ContactUpsertRequest):
     phone = normalize_contact_text(payload.phone, "연락처", 40, required=True)
     duty = normalize_contact_text(payload.duty, "담당업무", 120)
     memo = normalize_contact_text(payload.memo, "메모", 300)
-    with connect() as con:
+    with connect(site_code) as con:
         cur = con.execute(
             """
             INSERT INTO contacts(site_code, category, name, phone, duty, memo, is_favorite, sort_order, created_by)
@@ -2209,7 +2788,7 @@ def api_contact_update(request: Request, contact_id: int, payload: ContactUpsert
     phone = normalize_contact_text(payload.phone, "연락처", 40, required=True)
     duty = normalize_contact_text(payload.duty, "담당업무", 120)
     memo = normalize_contact_text(payload.memo, "메모", 300)
-    with connect() as con:
+    with connect(site_code) as con:
         require_contact(con, site_code, contact_id)
         con.execute(
             """
@@ -2229,7 +2808,7 @@ def api_contact_delete(request: Request, contact_id: int):
     ensure_ready()
     require_role(request, {"admin"})
     site_code = current_site_code(request)
-    with connect() as con:
+    with connect(site_code) as con:
         require_contact(con, site_code, contact_id)
         con.execute("DELETE FROM contacts WHERE site_code = ? AND id = ?", (site_code, contact_id))
         con.commit()
@@ -2242,6 +2821,161 @@ def api_registry_check(request: Request, plate: str):
     return build_check_response(current_site_code(request), plate)
 
 
+def registry_generation(con, site_code: str) -> int:
+    return registry_sequence_bounds(con, site_code)[0]
+
+
+def registry_sequence_bounds(con, site_code: str) -> tuple[int, int]:
+    row = con.execute(
+        "SELECT generation, compacted_seq FROM registry_generations WHERE site_code = ?",
+        (site_code,),
+    ).fetchone()
+    return (int(row["generation"]), int(row["compacted_seq"])) if row else (0, 0)
+
+
+def registry_etag(site_code: str, generation: int) -> str:
+    return f'"registry-{site_storage_key(site_code)}-{generation}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match") or ""
+    return any(tag.strip().removeprefix("W/") == etag for tag in header.split(",")) or header.strip() == "*"
+
+
+def conditional_json(
+    request: Request,
+    site_code: str,
+    scopes: tuple[str, ...],
+    build: Callable[[], Any],
+    *extra: Any,
+) -> Response:
+    with connect(site_code) as con:
+        generations = site_generations(con, site_code, scopes)
+    fingerprint = json.dumps([ETAG_SALT, site_code, str(request.url.query), generations, *extra], default=str)
+    etag = f'"{hashlib.sha1(fingerprint.encode("utf-8")).hexdigest()[:20]}"'
+    headers = {"ETag": etag, "Cache-Control": CONDITIONAL_CACHE_CONTROL}
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    return JSONResponse(jsonable_encoder(build()), headers=headers)
+
+
+def import_files_signature(source_dir: Path) -> list[tuple[str, int, int]]:
+    try:
+        entries = sorted(source_dir.iterdir())
+    except OSError:
+        return []
+    signature = []
+    for entry in entries:
+        try:
+            stat = entry.stat()
+        except OSError:
+            continue
+        signature.append((entry.name, stat.st_size, stat.st_mtime_ns))
+    return signature
+
+
+def build_registry_snapshot(site_code: str) -> dict[str, Any]:
+    with connect(site_code) as con:
+        con.execute("BEGIN")
+        generation = registry_generation(con, site_code)
+        rows = con.execute(
+            f"""
+            SELECT {", ".join(REGISTRY_SNAPSHOT_FIELDS)}
+            FROM vehicles
+            WHERE site_code = ? AND deleted_at IS NULL
+            ORDER BY plate
+            """,
+            (site_code,),
+        ).fetchall()
+        con.commit()
+    items: list[list[Any]] = []
+    suffixes: dict[str, list[int]] = {}
+    for index, row in enumerate(rows):
+        item = [row[field] for field in REGISTRY_SNAPSHOT_FIELDS]
+        item[REGISTRY_SNAPSHOT_FIELDS.index("status")] = normalize_status(row["status"])
+        items.append(item)
+        suffix = str(row["plate"])[-4:]
+        if suffix.isdigit():
+            suffixes.setdefault(suffix, []).append(index)
+    return {
+        "site_code": site_code,
+        "generation": generation,
+        "etag": registry_etag(site_code, generation),
+        "generated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "fields": list(REGISTRY_SNAPSHOT_FIELDS),
+        "rows": items,
+        "suffixes": suffixes,
+    }
+
+
+@app.get("/api/registry/snapshot")
+def api_registry_snapshot(request: Request):
+    ensure_ready()
+    require_role(request, VIEW_ROLES)
+    site_code = current_site_code(request)
+    with connect(site_code) as con:
+        etag = registry_etag(site_code, registry_generation(con, site_code))
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    snapshot = build_registry_snapshot(site_code)
+    headers["ETag"] = snapshot["etag"]
+    return Response(
+        content=json.dumps(snapshot, ensure_ascii=False, separators=(",", ":")),
+        media_type="application/json",
+        headers=headers,
+    )
+
+
+@app.get("/api/registry/changes")
+def api_registry_changes(request: Request, since: int = 0, limit: int = REGISTRY_CHANGES_DEFAULT_LIMIT):
+    ensure_ready()
+    require_role(request, VIEW_ROLES)
+    site_code = current_site_code(request)
+    limit = min(max(limit, 1), REGISTRY_CHANGES_MAX_LIMIT)
+    with connect(site_code) as con:
+        con.execute("BEGIN")
+        generation, compacted_seq = registry_sequence_bounds(con, site_code)
+        if since <= 0 or since < compacted_seq or since > generation:
+            con.commit()
+            return {"mode": "snapshot", "since": since, **build_registry_snapshot(site_code)}
+        rows = con.execute(
+            f"""
+            SELECT c.seq, c.plate, c.deleted, {", ".join(f"v.{field} AS v_{field}" for field in REGISTRY_SNAPSHOT_FIELDS)}
+            FROM registry_changes c
+            LEFT JOIN vehicles v ON v.site_code = c.site_code AND v.plate = c.plate
+            WHERE c.site_code = ? AND c.seq > ?
+            ORDER BY c.seq
+            LIMIT ?
+            """,
+            (site_code, since, limit + 1),
+        ).fetchall()
+        con.commit()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    upserts: list[list[Any]] = []
+    deletes: list[str] = []
+    for row in rows:
+        if row["deleted"] or row["v_plate"] is None:
+            deletes.append(row["plate"])
+            continue
+        item = [row[f"v_{field}"] for field in REGISTRY_SNAPSHOT_FIELDS]
+        item[REGISTRY_SNAPSHOT_FIELDS.index("status")] = normalize_status(row["v_status"])
+        upserts.append(item)
+    next_since = int(rows[-1]["seq"]) if has_more else generation
+    return {
+        "mode": "delta",
+        "site_code": site_code,
+        "since": since,
+        "generation": next_since,
+        "etag": registry_etag(site_code, next_since),
+        "has_more": has_more,
+        "fields": list(REGISTRY_SNAPSHOT_FIELDS),
+        "upserts": upserts,
+        "deletes": deletes,
+    }
+
+
 @app.get("/api/registry/search")
 def api_registry_search(request: Request, q: str = "", limit: int = 20):
     ensure_ready()
@@ -2250,7 +2984,7 @@ def api_registry_search(request: Request, q: str = "", limit: int = 20):
     limit = min(max(limit, 1), 50)
     query = normalize_plate(q) or q.strip()
     like = f"%{query}%"
-    with connect() as con:
+    with connect(site_code) as con:
         rows = con.execute(
             """
             SELECT plate, unit, building, unit_number, owner_name, phone, status, valid_from, valid_to, note, source_file, source_sheet
@@ -2278,9 +3012,19 @@ def api_registry_status(request: Request):
     require_role(request, VIEW_ROLES)
     site_code = current_site_code(request)
     source_dir = site_import_dir(site_code)
-    with connect() as con:
-        vehicle_count = con.execute("SELECT COUNT(*) AS cnt FROM vehicles WHERE site_code = ? AND deleted_at IS NULL", (site_code,)).fetchone()["cnt"]
-        manual_count = con.execute("SELECT COUNT(*) AS cnt FROM vehicles WHERE site_code = ? AND deleted_at IS NULL AND COALESCE(manual_override, 0) = 1", (site_code,)).fetchone()["cnt"]
+    return conditional_json(
+        request,
+        site_code,
+        ("registry", "cctv", "enforcement", "ocr", "sites"),
+        lambda: registry_status_payload(site_code, source_dir),
+        datetime.now().strftime("%Y-%m"),
+        import_files_signature(source_dir),
+    )
+
+
+def registry_status_payload(site_code: str, source_dir: Path) -> dict[str, Any]:
+    with connect(site_code) as con:
+        summary = fetch_site_summary(con, site_code)
         backups = [
             dict(row)
             for row in con.execute(
@@ -2306,9 +3050,11 @@ def api_registry_status(request: Request):
         ).fetchone()
     return {
         "site_code": site_code,
-        "site_name": site_name_for_code(site_code),
-        "vehicle_count": vehicle_count,
-        "manual_vehicle_count": manual_count,
+        "site_name": summary.get("name") or site_code,
+        "vehicle_count": summary.get("vehicles_count", 0),
+        "manual_vehicle_count": summary.get("manual_vehicles_count", 0),
+        "open_cctv_count": summary.get("open_cctv_count", 0),
+        "monthly_events_count": summary.get("monthly_events_count", 0),
         "import_dir": str(source_dir),
         "import_files": describe_excel_files(source_dir),
         "backups": backups,
@@ -2325,7 +3071,7 @@ def api_registry_sync(request: Request, payload: RegistrySyncRequest | None = No
     site_code = current_site_code(request)
     preserve_manual = True if payload is None else payload.preserve_manual
     try:
-        with connect() as con:
+        with connect(site_code) as con:
             backup = create_vehicle_backup(con, site_code, read_session(request).get("u"), f"{site_code}-before-sync-{datetime.now().strftime('%Y%m%d-%H%M%S')}")
             con.commit()
         result = sync_registry_from_dir(site_import_dir(site_code), site_code, preserve_manual=preserve_manual)
@@ -2364,7 +3110,7 @@ async def api_registry_upload(request: Request, files: list[UploadFile] = File(.
                 raise ValueError(f"{display_name}: {exc}") from exc
             uploaded_paths.append(uploaded)
             saved_names.add(uploaded.name)
-        with connect() as con:
+        with connect(site_code) as con:
             backup = create_vehicle_backup(con, site_code, read_session(request).get("u"), f"{site_code}-before-upload-sync-{datetime.now().strftime('%Y%m%d-%H%M%S')}")
             con.commit()
         sync_result = sync_registry_from_dir(source_dir, site_code, preserve_manual=preserve_manual)
@@ -2397,7 +3143,8 @@ async def api_registry_upload(request: Request, files: list[UploadFile] = File(.
 def api_site_settings(request: Request):
     ensure_ready()
     require_role(request, VIEW_ROLES)
-    return site_settings_dict(current_site_code(request))
+    site_code = current_site_code(request)
+    return conditional_json(request, site_code, ("settings",), lambda: site_settings_dict(site_code))
 
 
 @app.post("/api/site/settings/capture-placeholder")
@@ -2407,7 +3154,7 @@ async def api_site_settings_capture_placeholder(request: Request, image: UploadF
     site_code = current_site_code(request)
     payload = await image.read()
     image_url = save_site_setting_image(image.filename, payload, site_code)
-    with connect() as con:
+    with connect(site_code) as con:
         con.execute(
             """
             INSERT INTO site_settings(site_code, capture_placeholder_image_url, updated_at)
@@ -2427,7 +3174,7 @@ def api_site_settings_capture_placeholder_delete(request: Request):
     ensure_ready()
     require_role(request, {"admin"})
     site_code = current_site_code(request)
-    with connect() as con:
+    with connect(site_code) as con:
         con.execute(
             """
             INSERT INTO site_settings(site_code, capture_placeholder_image_url, updated_at)
@@ -2491,6 +3238,303 @@ async def api_ocr_scan(
     }
 
 
+def ocr_executor() -> ThreadPoolExecutor:
+    global _ocr_executor
+    with _ocr_executor_lock:
+        if _ocr_executor is None:
+            _ocr_executor = ThreadPoolExecutor(max_workers=OCR_WORKERS, thread_name_prefix="parking-ocr")
+        return _ocr_executor
+
+
+def load_site_registry(site_code: str) -> dict[str, dict[str, Any]]:
+    with connect(site_code) as con:
+        rows = con.execute(
+            f"""
+            SELECT v.*, {PLATE_OFFENSE_SELECT}
+            FROM vehicles v
+            LEFT JOIN plate_offense_summary o ON o.site_code = v.site_code AND o.plate = v.plate
+            WHERE v.site_code = ? AND v.deleted_at IS NULL
+            """,
+            (site_code,),
+        ).fetchall()
+    return {row["plate"]: dict(row) for row in rows}
+
+
+async def read_ocr_batch_images(photos: list[UploadFile], archive: UploadFile | None) -> tuple[list[tuple[str, bytes]], list[dict[str, Any]]]:
+    images: list[tuple[str, bytes]] = []
+    skipped: list[dict[str, Any]] = []
+    total_bytes = 0
+
+    def accept(name: str, size: int) -> bool:
+        nonlocal total_bytes
+        if Path(name).suffix.lower() not in ALLOWED_IMAGE_SUFFIXES:
+            skipped.append({"filename": name, "error": "사진은 jpg, png, webp, gif 형식만 사용할 수 있습니다."})
+            return False
+        if not size:
+            skipped.append({"filename": name, "error": "사진 파일이 비어 있습니다."})
+            return False
+        if size > MAX_PHOTO_UPLOAD_BYTES:
+            skipped.append({"filename": name, "error": "사진 파일은 10MB 이하만 업로드할 수 있습니다."})
+            return False
+        if len(images) >= OCR_BATCH_MAX_IMAGES:
+            raise HTTPException(status_code=413, detail=f"한 번에 최대 {OCR_BATCH_MAX_IMAGES}장까지 처리할 수 있습니다.")
+        total_bytes += size
+        if total_bytes > OCR_BATCH_MAX_BYTES:
+            raise HTTPException(status_code=413, detail="일괄 OCR 사진 용량이 너무 큽니다.")
+        return True
+
+    def extract(bundle_file) -> None:
+        try:
+            with zipfile.ZipFile(bundle_file) as bundle:
+                for info in bundle.infolist():
+                    name = Path(info.filename).name
+                    if info.is_dir() or not name or name.startswith(".") or "__MACOSX" in info.filename:
+                        continue
+                    if accept(info.filename, info.file_size):
+                        images.append((info.filename, bundle.read(info)))
+        except zipfile.BadZipFile as exc:
+            raise HTTPException(status_code=400, detail="zip 파일을 읽을 수 없습니다.") from exc
+
+    for photo in photos:
+        name = photo.filename or f"photo-{len(images) + 1}.jpg"
+        if photo.size is not None:
+            if accept(name, photo.size):
+                images.append((name, await photo.read()))
+            continue
+        payload = await photo.read()
+        if accept(name, len(payload)):
+            images.append((name, payload))
+
+    if archive is not None and archive.filename:
+        if archive.size is not None and archive.size > OCR_BATCH_MAX_BYTES:
+            raise HTTPException(status_code=413, detail="일괄 OCR 사진 용량이 너무 큽니다.")
+        await archive.seek(0)
+        await run_in_threadpool(extract, archive.file)
+
+    if not images:
+        raise HTTPException(status_code=400, detail="처리할 사진이 없습니다.")
+    return images, skipped
+
+
+def load_ocr_batch_context(site_code: str) -> tuple[CorrectionModel, PlateIndex]:
+    with connect(site_code) as con:
+        return refresh_correction_model(site_code, con), site_plate_index(site_code, con)
+
+
+def ocr_batch_result(
+    site_code: str,
+    registry: dict[str, dict[str, Any]],
+    context: tuple[CorrectionModel, PlateIndex],
+    index: int,
+    filename: str,
+    scan: OCRScanResult,
+) -> dict[str, Any]:
+    learning_model, plate_index = context
+    best_plate, ordered_candidates = choose_best_scan_candidate(
+        site_code, scan.raw_text, None, scan.candidates, registry.get, learning_model, plate_index
+    )
+    match = None
+    if best_plate:
+        vehicle = registry.get(best_plate)
+        if vehicle is not None:
+            match = build_check_match(best_plate, dict(vehicle))
+        else:
+            match = build_check_match(best_plate, *lookup_vehicle_with_offenses(site_code, best_plate))
+    return {
+        "type": "result",
+        "index": index,
+        "filename": filename,
+        "provider": scan.provider,
+        "raw_text": scan.raw_text,
+        "candidates": ordered_candidates,
+        "best_plate": best_plate,
+        "match": match.model_dump() if match else None,
+        "error": scan.error,
+    }
+
+
+def ndjson_line(payload: dict[str, Any]) -> str:
+    return json.dumps(jsonable_encoder(payload), ensure_ascii=False) + "\n"
+
+
+@app.post("/api/ocr/batch")
+async def api_ocr_batch(
+    request: Request,
+    photos: list[UploadFile] | None = File(None),
+    archive: UploadFile | None = File(None),
+):
+    ensure_ready()
+    require_role(request, VIEW_ROLES)
+    site_code = current_site_code(request)
+    images, skipped = await read_ocr_batch_images(photos or [], archive)
+    registry = await run_in_threadpool(load_site_registry, site_code)
+    context = await run_in_threadpool(load_ocr_batch_context, site_code)
+    started = time.perf_counter()
+
+    def scan_one(index: int, filename: str, payload: bytes) -> dict[str, Any]:
+        return ocr_batch_result(site_code, registry, context, index, filename, scan_plate_image(payload))
+
+    async def scan(index: int, filename: str, payload: bytes) -> dict[str, Any]:
+        try:
+            return await asyncio.get_running_loop().run_in_executor(ocr_executor(), scan_one, index, filename, payload)
+        except Exception as exc:
+            print(f"[ocr-batch] {filename} failed: {exc!r}")
+            return {"type": "result", "index": index, "filename": filename, "best_plate": None, "match": None, "error": f"판독 중 오류가 발생했습니다: {exc}"}
+
+    async def stream():
+        yield ndjson_line({"type": "start", "total": len(images), "workers": OCR_WORKERS, "skipped": skipped})
+        verdicts: dict[str, int] = {}
+        tasks = [asyncio.ensure_future(scan(index, filename, payload)) for index, (filename, payload) in enumerate(images)]
+        try:
+            for next_result in asyncio.as_completed(tasks):
+                result = await next_result
+                verdict = result["match"]["verdict"] if result["match"] else "UNREADABLE"
+                verdicts[verdict] = verdicts.get(verdict, 0) + 1
+                yield ndjson_line(result)
+        finally:
+            for task in tasks:
+                task.cancel()
+        yield ndjson_line(
+            {
+                "type": "done",
+                "total": len(images),
+                "verdicts": verdicts,
+                "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+            }
+        )
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson", headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+
+ENFORCEMENT_EVENT_INSERT_SQL = """
+    INSERT INTO enforcement_events
+    (site_code, plate, raw_ocr_text, verdict, verdict_message, unit, owner_name, vehicle_status, inspector, location, memo, photo_path, lat, lng, client_event_id, created_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, COALESCE(?, datetime('now')))
+"""
+
+
+def normalize_client_event_id(value: Any) -> str | None:
+    text = str(value or "").strip()
+    if not text:
+        return None
+    if not CLIENT_EVENT_ID_PATTERN.fullmatch(text):
+        raise HTTPException(status_code=400, detail="단속 기록 식별값 형식이 올바르지 않습니다.")
+    return text
+
+
+def normalize_captured_at(value: Any) -> datetime | None:
+    text = str(value or "").strip()
+    if not text:
+        return None
+    try:
+        captured = datetime.fromisoformat(text.replace("Z", "+00:00"))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="단속 시각 형식이 올바르지 않습니다.") from None
+    if captured.tzinfo is None:
+        raise HTTPException(status_code=400, detail="단속 시각에 시간대(Z 또는 +09:00)를 포함해 주세요.")
+    now = datetime.now(timezone.utc)
+    if captured > now + timedelta(minutes=5) or captured < now - timedelta(days=ENFORCEMENT_BATCH_MAX_AGE_DAYS):
+        raise HTTPException(status_code=400, detail="단속 시각이 허용 범위를 벗어났습니다.")
+    return captured.astimezone(timezone.utc)
+
+
+def batch_text_fields(item: dict[str, Any]) -> dict[str, str | None]:
+    fields: dict[str, str | None] = {}
+    for name, label in ENFORCEMENT_BATCH_TEXT_FIELDS.items():
+        value = item.get(name)
+        if value is None or value == "":
+            fields[name] = None
+        elif isinstance(value, str):
+            fields[name] = value
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            fields[name] = str(value)
+        else:
+            raise HTTPException(status_code=400, detail=f"{label} 형식이 올바르지 않습니다.")
+    return fields
+
+
+def optional_float(value: Any) -> float | None:
+    if value in (None, ""):
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def find_client_event(con, site_code: str, client_event_id: str | None) -> dict[str, Any] | None:
+    if not client_event_id:
+        return None
+    row = con.execute(
+        "SELECT * FROM enforcement_events WHERE site_code = ? AND client_event_id = ?",
+        (site_code, client_event_id),
+    ).fetchone()
+    return dict(row) if row else None
+
+
+def enforcement_event_params(
+    site_code: str,
+    check: CheckResponse,
+    *,
+    raw_ocr_text: str | None,
+    inspector: str | None,
+    location: str | None,
+    memo: str | None,
+    photo_path: str | None,
+    lat: float | None,
+    lng: float | None,
+    client_event_id: str | None = None,
+    captured_at: datetime | None = None,
+) -> tuple[Any, ...]:
+    return (
+        site_code,
+        check.plate,
+        raw_ocr_text,
+        check.verdict,
+        check.message,
+        check.unit,
+        check.owner_name,
+        check.status,
+        inspector,
+        location,
+        memo,
+        photo_path,
+        lat,
+        lng,
+        client_event_id,
+        captured_at.strftime("%Y-%m-%d %H:%M:%S") if captured_at else None,
+    )
+
+
+def ocr_learning_feedback(raw_ocr_text: str | None, ocr_best_plate: str | None, ocr_candidates: Any, plate: str) -> dict[str, Any]:
+    if ocr_candidates is not None and not isinstance(ocr_candidates, str):
+        ocr_candidates = json.dumps(ocr_candidates, ensure_ascii=False)
+    learned_candidates = parse_candidates_json(ocr_candidates)
+    suggested_plate = normalize_plate(ocr_best_plate)
+    recorded = bool(plate and (str(raw_ocr_text or "").strip() or suggested_plate or learned_candidates))
+    return {
+        "recorded": recorded,
+        "corrected": bool(recorded and suggested_plate and suggested_plate != plate),
+        "suggested_plate": suggested_plate or None,
+        "corrected_plate": plate,
+        "candidates": learned_candidates,
+    }
+
+
+def record_event_ocr_feedback(con, site_code: str, raw_ocr_text: str | None, feedback: dict[str, Any], photo_path: str | None) -> dict[str, Any]:
+    candidates = feedback.pop("candidates")
+    insert_ocr_feedback(
+        con,
+        site_code=site_code,
+        raw_ocr_text=raw_ocr_text,
+        suggested_plate=feedback["suggested_plate"] or "",
+        corrected_plate=feedback["corrected_plate"],
+        candidates=candidates,
+        photo_path=photo_path,
+    )
+    return feedback
+
+
 @app.post("/api/enforcement/submit")
 async def api_enforcement_submit(
     request: Request,
@@ -2503,66 +3547,161 @@ async def api_enforcement_submit(
     ocr_candidates: str | None = Form(None),
     lat: float | None = Form(None),
     lng: float | None = Form(None),
+    client_event_id: str | None = Form(None),
     photo: UploadFile | None = File(None),
 ):
     ensure_ready()
     require_role(request, ENFORCEMENT_WRITE_ROLES)
     site_code = current_site_code(request)
-    if BILLING_ENFORCEMENT_ENABLED:
-        current_usage = billing_status_for_site(site_code)["usage"]["monthly_records"]
-        require_billing_capacity(site_code, "monthly_records", int(current_usage) + 1)
+    client_event_id = normalize_client_event_id(client_event_id)
+    with connect(site_code) as con:
+        existing = find_client_event(con, site_code, client_event_id)
+    if existing:
+        return {**existing, "duplicate": True}
+    require_billing_capacity(site_code, "monthly_records")
     check = build_check_response(site_code, plate)
-    photo_path = save_photo(photo, site_code) if photo else None
-    learned_candidates = parse_candidates_json(ocr_candidates)
-    suggested_plate = normalize_plate(ocr_best_plate)
-    feedback_recorded = bool(check.plate and (str(raw_ocr_text or "").strip() or suggested_plate or learned_candidates))
-    feedback_corrected = bool(feedback_recorded and suggested_plate and suggested_plate != check.plate)
+    photo_path = await save_photo(photo, site_code) if photo else None
+    feedback = ocr_learning_feedback(raw_ocr_text, ocr_best_plate, ocr_candidates, check.plate)
 
-    with connect() as con:
+    def insert_event(con) -> dict[str, Any]:
+        existing = find_client_event(con, site_code, client_event_id)
+        if existing:
+            return {**existing, "duplicate": True}
         cur = con.execute(
-            """
-            INSERT INTO enforcement_events
-            (site_code, plate, raw_ocr_text, verdict, verdict_message, unit, owner_name, vehicle_status, inspector, location, memo, photo_path, lat, lng)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
+            ENFORCEMENT_EVENT_INSERT_SQL,
+            enforcement_event_params(
                 site_code,
-                check.plate,
-                raw_ocr_text,
-                check.verdict,
-                check.message,
-                check.unit,
-                check.owner_name,
-                check.status,
-                inspector,
-                location,
-                memo,
-                photo_path,
-                lat,
-                lng,
+                check,
+                raw_ocr_text=raw_ocr_text,
+                inspector=inspector,
+                location=location,
+                memo=memo,
+                photo_path=photo_path,
+                lat=lat,
+                lng=lng,
+                client_event_id=client_event_id,
             ),
         )
-        event_id = cur.lastrowid
-        row = con.execute("SELECT * FROM enforcement_events WHERE id = ?", (event_id,)).fetchone()
-        con.commit()
+        row = con.execute("SELECT * FROM enforcement_events WHERE id = ?", (cur.lastrowid,)).fetchone()
+        event = dict(row)
+        event["ocr_learning_feedback"] = record_event_ocr_feedback(con, site_code, raw_ocr_text, feedback, photo_path)
+        return event
+
+    result = await write_coordinator.run_async(insert_event, site_code)
+    if not result.get("duplicate"):
+        publish_enforcement_change(site_code, "enforcement.created", result)
+    return result
 
-    record_ocr_feedback(
-        site_code=site_code,
-        raw_ocr_text=raw_ocr_text,
-        suggested_plate=suggested_plate,
-        corrected_plate=check.plate,
-        candidates=learned_candidates,
-        photo_path=photo_path,
-    )
 
-    result = dict(row)
-    result["ocr_learning_feedback"] = {
-        "recorded": feedback_recorded,
-        "corrected": feedback_corrected,
-        "suggested_plate": suggested_plate or None,
-        "corrected_plate": check.plate,
+@app.post("/api/enforcement/batch")
+async def api_enforcement_batch(request: Request):
+    ensure_ready()
+    require_role(request, ENFORCEMENT_WRITE_ROLES)
+    site_code = current_site_code(request)
+    form = await request.form()
+    try:
+        return await submit_enforcement_batch(site_code, form)
+    finally:
+        await form.close()
+
+
+async def submit_enforcement_batch(site_code: str, form) -> dict[str, Any]:
+    try:
+        events = json.loads(str(form.get("events") or "[]"))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="단속 기록 목록 형식이 올바르지 않습니다.") from None
+    if not isinstance(events, list) or not events:
+        raise HTTPException(status_code=400, detail="전송할 단속 기록이 없습니다.")
+    if len(events) > ENFORCEMENT_BATCH_MAX_EVENTS:
+        raise HTTPException(status_code=400, detail=f"단속 기록은 한 번에 {ENFORCEMENT_BATCH_MAX_EVENTS}건까지 전송할 수 있습니다.")
+
+    results: list[dict[str, Any]] = []
+    pending: list[dict[str, Any]] = []
+    seen: set[str] = set()
+    with connect(site_code) as con:
+        for item in events:
+            item = item if isinstance(item, dict) else {}
+            result: dict[str, Any] = {"client_event_id": item.get("client_event_id")}
+            results.append(result)
+            try:
+                client_event_id = normalize_client_event_id(item.get("client_event_id"))
+                if not client_event_id:
+                    raise HTTPException(status_code=400, detail="단속 기록 식별값이 필요합니다.")
+                existing = find_client_event(con, site_code, client_event_id)
+                if existing or client_event_id in seen:
+                    result.update({"id": existing["id"] if existing else None, "plate": (existing or {}).get("plate"), "duplicate": True})
+                    continue
+                seen.add(client_event_id)
+                captured_at = normalize_captured_at(item.get("captured_at"))
+                pending.append({**item, **batch_text_fields(item), "client_event_id": client_event_id, "captured_at": captured_at, "result": result})
+            except HTTPException as exc:
+                result["error"] = exc.detail
+
+    remaining = billing_capacity_remaining(site_code, "monthly_records") if pending else None
+    if remaining is not None and len(pending) > remaining:
+        for item in pending[remaining:]:
+            item["result"]["error"] = BILLING_LIMIT_EXCEEDED_DETAIL
+        pending = pending[:remaining]
+
+    prepared: list[dict[str, Any]] = []
+    for item in pending:
+        result = item["result"]
+        try:
+            captured_at = item["captured_at"]
+            check = build_check_response(site_code, item["plate"] or "", captured_at.astimezone().date() if captured_at else None)
+            photo = form.get(f"photo_{item['client_event_id']}")
+            photo_path = None
+            if photo is not None and getattr(photo, "filename", None):
+                photo_path = await run_in_threadpool(save_photo_bytes, photo.filename, await photo.read(), site_code)
+        except HTTPException as exc:
+            result["error"] = exc.detail
+            continue
+        prepared.append({**item, "check": check, "photo_path": photo_path})
+
+    def insert_events(con) -> None:
+        for item in prepared:
+            existing = find_client_event(con, site_code, item["client_event_id"])
+            if existing:
+                item["result"].update({"id": existing["id"], "plate": existing["plate"], "duplicate": True})
+                continue
+            item["inserted"] = True
+            cur = con.execute(
+                ENFORCEMENT_EVENT_INSERT_SQL,
+                enforcement_event_params(
+                    site_code,
+                    item["check"],
+                    raw_ocr_text=item.get("raw_ocr_text"),
+                    inspector=item.get("inspector"),
+                    location=item.get("location"),
+                    memo=item.get("memo"),
+                    photo_path=item["photo_path"],
+                    lat=optional_float(item.get("lat")),
+                    lng=optional_float(item.get("lng")),
+                    client_event_id=item["client_event_id"],
+                    captured_at=item["captured_at"],
+                ),
+            )
+            item["result"].update({"id": cur.lastrowid, "plate": item["check"].plate, "verdict": item["check"].verdict, "duplicate": False})
+            item["result"]["ocr_learning_feedback"] = record_event_ocr_feedback(
+                con,
+                site_code,
+                item.get("raw_ocr_text"),
+                ocr_learning_feedback(item.get("raw_ocr_text"), item.get("ocr_best_plate"), item.get("ocr_candidates"), item["check"].plate),
+                item["photo_path"],
+            )
+
+    if prepared:
+        await write_coordinator.run_async(insert_events, site_code)
+    inserted = [item for item in prepared if item.get("inserted")]
+    for item in inserted:
+        publish_enforcement_change(site_code, "enforcement.created", item["result"])
+    return {
+        "site_code": site_code,
+        "inserted": len(inserted),
+        "duplicates": sum(1 for result in results if result.get("duplicate")),
+        "errors": sum(1 for result in results if result.get("error")),
+        "results": results,
     }
-    return result
 
 
 @app.get("/api/enforcement/recent")
@@ -2571,18 +3710,110 @@ def api_enforcement_recent(request: Request, limit: int = 20):
     require_role(request, VIEW_ROLES)
     site_code = current_site_code(request)
     limit = min(max(limit, 1), 50)
-    with connect() as con:
-        rows = con.execute(
-            """
-            SELECT id, plate, verdict, verdict_message, unit, owner_name, inspector, location, memo, photo_path, created_at
-            FROM enforcement_events
-            WHERE site_code = ?
-            ORDER BY id DESC
+
+    def build() -> list[dict[str, Any]]:
+        with connect(site_code) as con:
+            rows = con.execute(
+                """
+                SELECT id, plate, verdict, verdict_message, unit, owner_name, inspector, location, memo, photo_path, created_at
+                FROM enforcement_events
+                WHERE site_code = ?
+                ORDER BY id DESC
+                LIMIT ?
+                """,
+                (site_code, limit),
+            ).fetchall()
+        return [with_photo_thumb(dict(row)) for row in rows]
+
+    return conditional_json(request, site_code, ("enforcement",), build)
+
+
+@app.get("/api/enforcement/stats")
+def api_enforcement_stats(request: Request, date_from: str = "", date_to: str = "", verdict: str = "", top: int = 10):
+    ensure_ready()
+    require_role(request, VIEW_ROLES)
+    site_code = current_site_code(request)
+    end_day = normalize_stats_day(date_to, "종료일") or (datetime.now(timezone.utc) + STATS_UTC_OFFSET).date()
+    start_day = normalize_stats_day(date_from, "시작일") or (end_day - timedelta(days=STATS_DEFAULT_DAYS - 1))
+    if start_day > end_day:
+        raise HTTPException(status_code=400, detail="시작일은 종료일 이전으로 입력해 주세요.")
+    if (end_day - start_day).days >= STATS_MAX_DAYS:
+        raise HTTPException(status_code=400, detail=f"통계 기간은 {STATS_MAX_DAYS}일 이내로 선택해 주세요.")
+    top = min(max(top, 1), 50)
+
+    range_start = datetime.combine(start_day, datetime.min.time()) - STATS_UTC_OFFSET
+    range_end = datetime.combine(end_day + timedelta(days=1), datetime.min.time()) - STATS_UTC_OFFSET
+    where = [
+        "site_code = ?",
+        "day >= ?",
+        "day <= ?",
+        "(day > ? OR hour >= ?)",
+        "(day < ? OR hour < ?)",
+        "events_count > 0",
+    ]
+    params: list[Any] = [
+        site_code,
+        range_start.date().isoformat(),
+        range_end.date().isoformat(),
+        range_start.date().isoformat(),
+        range_start.hour,
+        range_end.date().isoformat(),
+        range_end.hour,
+    ]
+    normalized_verdict = str(verdict or "").strip().upper()
+    if normalized_verdict:
+        where.append("verdict = ?")
+        params.append(normalized_verdict)
+    where_sql = " AND ".join(where)
+
+    with connect(site_code) as con:
+        hourly_rows = con.execute(
+            f"""
+            SELECT day, hour, verdict, SUM(events_count) AS cnt
+            FROM enforcement_rollups
+            WHERE {where_sql}
+            GROUP BY day, hour, verdict
+            ORDER BY day, hour
+            """,
+            params,
+        ).fetchall()
+        location_rows = con.execute(
+            f"""
+            SELECT location, SUM(events_count) AS cnt
+            FROM enforcement_rollups
+            WHERE {where_sql}
+            GROUP BY location
+            ORDER BY cnt DESC, location
             LIMIT ?
             """,
-            (site_code, limit),
+            [*params, top],
         ).fetchall()
-    return [dict(row) for row in rows]
+
+    daily: dict[str, dict[str, Any]] = {}
+    by_verdict: dict[str, int] = {}
+    heatmap: dict[tuple[int, int], int] = {}
+    for row in hourly_rows:
+        local = datetime.fromisoformat(row["day"]) + timedelta(hours=int(row["hour"])) + STATS_UTC_OFFSET
+        day = local.date().isoformat()
+        count = int(row["cnt"])
+        entry = daily.setdefault(day, {"day": day, "count": 0, "by_verdict": {}})
+        entry["count"] += count
+        entry["by_verdict"][row["verdict"]] = entry["by_verdict"].get(row["verdict"], 0) + count
+        by_verdict[row["verdict"]] = by_verdict.get(row["verdict"], 0) + count
+        slot = ((local.weekday() + 1) % 7, local.hour)
+        heatmap[slot] = heatmap.get(slot, 0) + count
+
+    return {
+        "site_code": site_code,
+        "date_from": start_day.isoformat(),
+        "date_to": end_day.isoformat(),
+        "verdict": normalized_verdict or None,
+        "total": sum(by_verdict.values()),
+        "by_verdict": by_verdict,
+        "daily": list(daily.values()),
+        "heatmap": [{"weekday": weekday, "hour": hour, "count": count} for (weekday, hour), count in sorted(heatmap.items())],
+        "locations": [{"location": row["location"] or None, "count": int(row["cnt"])} for row in location_rows],
+    }
 
 
 @app.get("/api/registry/vehicles")
@@ -2614,7 +3845,7 @@ def api_registry_vehicles(request: Request, q: str = ""):
     params.extend([plate_like, like, like, like, like, like])
     exact_plate = normalized or query
     params.extend([exact_plate, exact_plate])
-    with connect() as con:
+    with connect(site_code) as con:
         rows = con.execute(
             f"""
             SELECT site_code, plate, unit, building, unit_number, owner_name, phone, status, valid_from, valid_to, note, source_file, source_sheet, manual_override, deleted_at, updated_at
@@ -2642,7 +3873,7 @@ def api_registry_vehicle_create(request: Request, payload: VehicleUpsertRequest)
     session = require_vehicle_manager(request)
     site_code = current_site_code(request)
     values = vehicle_payload_values(payload)
-    with connect() as con:
+    with write_transaction(site_code) as con:
         exists = con.execute("SELECT * FROM vehicles WHERE site_code = ? AND plate = ?", (site_code, values["plate"])).fetchone()
         if exists and not exists["deleted_at"]:
             raise HTTPException(status_code=409, detail="이미 등록된 차량번호입니다.")
@@ -2695,7 +3926,7 @@ def api_registry_vehicle_update(request: Request, plate: str, payload: VehicleUp
     site_code = current_site_code(request)
     current_plate = normalize_plate(plate)
     values = vehicle_payload_values(payload)
-    with connect() as con:
+    with write_transaction(site_code) as con:
         current = con.execute("SELECT * FROM vehicles WHERE site_code = ? AND plate = ? AND deleted_at IS NULL", (site_code, current_plate)).fetchone()
         if not current:
             raise HTTPException(status_code=404, detail="등록차량을 찾을 수 없습니다.")
@@ -2749,7 +3980,7 @@ def api_registry_vehicle_delete(request: Request, plate: str):
     session = require_vehicle_manager(request)
     site_code = current_site_code(request)
     normalized_plate = normalize_plate(plate)
-    with connect() as con:
+    with write_transaction(site_code) as con:
         current = con.execute("SELECT * FROM vehicles WHERE site_code = ? AND plate = ? AND deleted_at IS NULL", (site_code, normalized_plate)).fetchone()
         if not current:
             raise HTTPException(status_code=404, detail="등록차량을 찾을 수 없습니다.")
@@ -2769,7 +4000,7 @@ def api_registry_backups(request: Request, limit: int = 20):
     require_vehicle_manager(request)
     site_code = current_site_code(request)
     limit = min(max(limit, 1), 100)
-    with connect() as con:
+    with connect(site_code) as con:
         rows = con.execute(
             """
             SELECT id, backup_name, vehicles_count, created_by, created_at
@@ -2788,7 +4019,7 @@ def api_registry_backup_create(request: Request):
     ensure_ready()
     session = require_vehicle_manager(request)
     site_code = current_site_code(request)
-    with connect() as con:
+    with write_transaction(site_code) as con:
         backup = create_vehicle_backup(con, site_code, session.get("u"))
         con.commit()
     return backup
@@ -2799,44 +4030,43 @@ def api_registry_backup_restore(request: Request, backup_id: int):
     ensure_ready()
     session = require_vehicle_manager(request)
     site_code = current_site_code(request)
-    with connect() as con:
+
+    def report(phase: str, done: int, total: int) -> None:
+        live_events.publish(site_code, "registry.restore", {"backup_id": backup_id, "phase": phase, "done": done, "total": total})
+
+    with connect(site_code) as con:
         backup_row = con.execute(
             "SELECT * FROM vehicle_backups WHERE site_code = ? AND id = ?",
             (site_code, backup_id),
         ).fetchone()
         if not backup_row:
             raise HTTPException(status_code=404, detail="백업을 찾을 수 없습니다.")
-        before_backup = create_vehicle_backup(con, site_code, session.get("u"), f"{site_code}-before-restore-{datetime.now().strftime('%Y%m%d-%H%M%S')}")
-        rows = json.loads(backup_row["vehicles_json"] or "[]")
-        con.execute("DELETE FROM vehicles WHERE site_code = ?", (site_code,))
-        for row in rows:
-            con.execute(
-                """
-                INSERT INTO vehicles(site_code, plate, unit, building, unit_number, owner_name, phone, status, valid_from, valid_to, note, source_file, source_sheet, manual_override, deleted_at, updated_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, COALESCE(?, datetime('now')))
-                """,
-                (
-                    site_code,
-                    row.get("plate"),
-                    row.get("unit"),
-                    row.get("building"),
-                    row.get("unit_number"),
-                    row.get("owner_name"),
-                    row.get("phone"),
-                    row.get("status") or "active",
-                    row.get("valid_from"),
-                    row.get("valid_to"),
-                    row.get("note"),
-                    row.get("source_file"),
-                    row.get("source_sheet"),
-                    1 if row.get("manual_override") else 0,
-                    row.get("deleted_at"),
-                    row.get("updated_at"),
-                ),
-            )
-        log_vehicle_change(con, site_code, session.get("u"), "restore", None, {"backup_before_restore": before_backup}, {"restored_backup_id": backup_id, "vehicles_count": len(rows)})
+        try:
+            staged = stage_vehicle_backup(con, backup_row, progress=report)
+        except ValueError as exc:
+            raise HTTPException(status_code=409, detail=str(exc)) from exc
         con.commit()
-    return {"restored": True, "backup_id": backup_id, "vehicles_count": len(rows), "backup_before_restore": before_backup}
+        begin_immediate(con)
+        result = apply_staged_backup(
+            con,
+            site_code,
+            staged,
+            username=session.get("u"),
+            before_name=f"{site_code}-before-restore-{datetime.now().strftime('%Y%m%d-%H%M%S')}",
+            progress=report,
+        )
+        before_backup = result["backup_before_restore"]
+        log_vehicle_change(con, site_code, session.get("u"), "restore", None, {"backup_before_restore": before_backup}, {"restored_backup_id": backup_id, "vehicles_count": result["vehicles_count"]})
+        con.commit()
+    live_events.publish(site_code, "registry.synced", {"vehicles_loaded": result["vehicles_count"]})
+    return {
+        "restored": True,
+        "backup_id": backup_id,
+        "vehicles_count": result["vehicles_count"],
+        "changed": result["changed"],
+        "removed": result["removed"],
+        "backup_before_restore": before_backup,
+    }
 
 
 @app.get("/api/enforcement/history")
@@ -2908,7 +4138,7 @@ def api_enforcement_event_update(request: Request, event_id: int, payload: Enfor
     if "memo" in payload.model_fields_set:
         values["memo"] = str(payload.memo or "").strip() or None
 
-    with connect() as con:
+    with connect(site_code) as con:
         con.execute(
             """
             UPDATE enforcement_events
@@ -2938,7 +4168,9 @@ def api_enforcement_event_update(request: Request, event_id: int, payload: Enfor
             ),
         )
         con.commit()
-    return require_enforcement_event(site_code, event_id)
+    updated = require_enforcement_event(site_code, event_id)
+    publish_enforcement_change(site_code, "enforcement.updated", updated)
+    return updated
 
 
 @app.delete("/api/enforcement/events/{event_id}")
@@ -2946,10 +4178,11 @@ def api_enforcement_event_delete(request: Request, event_id: int):
     ensure_ready()
     require_role(request, ENFORCEMENT_WRITE_ROLES)
     site_code = current_site_code(request)
-    require_enforcement_event(site_code, event_id)
-    with connect() as con:
+    current = require_enforcement_event(site_code, event_id)
+    with connect(site_code) as con:
         con.execute("DELETE FROM enforcement_events WHERE site_code = ? AND id = ?", (site_code, event_id))
         con.commit()
+    publish_enforcement_change(site_code, "enforcement.deleted", current)
     return {"deleted": True, "id": event_id}
 
 
@@ -3006,6 +4239,10 @@ def api_enforcement_export_xlsx(
         offset=0,
     )
 
+    from openpyxl import Workbook
+    from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
+    from openpyxl.utils import get_column_letter
+
     workbook = Workbook()
     sheet = workbook.active
     sheet.title = "불법주차단속대장"
@@ -3068,3 +4305,6 @@ def api_enforcement_export_xlsx(
         media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
         headers={"Content-Disposition": f"attachment; filename*=UTF-8''{quote(filename)}"},
     )
+
+
+startup_profile["import"] = round((time.perf_counter() - IMPORT_STARTED_AT) * 1000, 1)
@@ -1,11 +1,66 @@
+import argparse
+import json
 from pathlib import Path
 
-from .db import DEFAULT_SITE_CODE, init_db, maybe_seed_demo, seed_users
+from .db import (
+    DEFAULT_SITE_CODE,
+    MATERIALIZED_VIEW_REBUILDERS,
+    SCHEMA_VERSION,
+    init_db,
+    maybe_seed_demo,
+    rebuild_materialized_views,
+    seed_users,
+    split_into_shards,
+)
 from .excel_import import sync_registry_from_dir
 
 
-def main() -> None:
-    init_db()
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Initialize the parking database and optionally backfill derived tables.")
+    parser.add_argument(
+        "--rebuild",
+        nargs="*",
+        choices=sorted(MATERIALIZED_VIEW_REBUILDERS),
+        help="recompute counters/rollups from source tables (all when no name is given)",
+    )
+    parser.add_argument("--site", help="limit --rebuild/--split-shards to one site code")
+    parser.add_argument(
+        "--split-shards",
+        action="store_true",
+        help="move each site's operational rows from the central DB into PARKING_SHARD_DIR/<site>.db",
+    )
+    parser.add_argument("--run-job", metavar="NAME", help="run one scheduled maintenance job now and record it in the job history")
+    parser.add_argument("--jobs", action="store_true", help="show scheduled jobs and their recent runs")
+    args = parser.parse_args(argv)
+
+    if init_db():
+        print(f"schema migrated to v{SCHEMA_VERSION}")
+    if args.run_job or args.jobs:
+        from .main import scheduler
+
+        if args.run_job:
+            if args.run_job not in scheduler.jobs:
+                parser.error(f"unknown job: {args.run_job} (choose from {', '.join(sorted(scheduler.jobs))})")
+            print(json.dumps(scheduler.run(args.run_job), ensure_ascii=False, default=str))
+        else:
+            for job in scheduler.describe():
+                print(f"{job['name']}: {job['schedule'] or 'disabled'}")
+            for run in scheduler.history(limit=20):
+                print(f"  {run['started_at']} {run['job_name']} [{run['trigger']}] {run['status']} {run['detail'] or ''}")
+        return
+    if args.split_shards:
+        try:
+            moved = split_into_shards(args.site)
+        except RuntimeError as exc:
+            parser.error(str(exc))
+        for site_code, tables in moved.items():
+            print(f"{site_code}: {', '.join(f'{table}={count}' for table, count in tables.items())}")
+        return
+    if args.rebuild is not None:
+        rebuilt = rebuild_materialized_views(args.site, args.rebuild or None)
+        print(f"rebuilt: {', '.join(rebuilt)}")
+        return
+
     seed_users()
     maybe_seed_demo()
     imports_dir = Path(__file__).resolve().parent.parent / "imports"
@@ -19,4 +74,3 @@ def main() -> None:
 
 if __name__ == "__main__":
     main()
-
@@ -1,13 +1,19 @@
 from __future__ import annotations
 
 import io
+import math
 import os
 import shutil
+import time
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Any
 
 from .plates import PLATE_MIDDLE_CHARS, extract_plate_candidates
 
+OCR_MAX_EDGE = 2200
+OCR_MIN_EDGE = 900
+
 
 @dataclass(slots=True)
 class OCRScanResult:
@@ -17,6 +23,9 @@ class OCRScanResult:
     error: str | None = None
 
 
+ocr_warmup: dict[str, Any] = {"state": "cold", "error": None, "elapsed_ms": None}
+
+
 def _normalize_tesseract_conf(value: Any) -> float:
     try:
         number = float(str(value).strip())
@@ -28,7 +37,13 @@ def _normalize_tesseract_conf(value: Any) -> float:
 
 
 def _prepare_base_image(image):
-    from PIL import ImageOps
+    from PIL import Image, ImageOps
+
+    source_width, source_height = image.size
+    source_longest = max(source_width, source_height)
+    if image.format == "JPEG" and source_longest > OCR_MAX_EDGE:
+        draft_scale = OCR_MAX_EDGE / source_longest
+        image.draft("RGB", (math.ceil(source_width * draft_scale), math.ceil(source_height * draft_scale)))
 
     transposed = ImageOps.exif_transpose(image).convert("RGB")
     width, height = transposed.size
@@ -36,16 +51,17 @@ def _prepare_base_image(image):
     shortest = min(width, height)
 
     scale = 1.0
-    if longest > 2200:
-        scale = 2200 / longest
-    elif shortest < 900:
-        scale = 900 / shortest
+    if longest > OCR_MAX_EDGE:
+        scale = OCR_MAX_EDGE / longest
+    elif shortest < OCR_MIN_EDGE:
+        scale = OCR_MIN_EDGE / shortest
 
     if abs(scale - 1.0) > 0.01:
-        transposed = transposed.resize(
-            (max(1, int(width * scale)), max(1, int(height * scale))),
-            resample=getattr(__import__("PIL.Image", fromlist=["Image"]).Image, "Resampling").LANCZOS,
-        )
+        size = (max(1, int(width * scale)), max(1, int(height * scale)))
+        if scale < 1.0:
+            transposed = transposed.resize(size, resample=Image.Resampling.BILINEAR, reducing_gap=2.0)
+        else:
+            transposed = transposed.resize(size, resample=Image.Resampling.BICUBIC)
     return transposed
 
 
@@ -181,6 +197,67 @@ def _collect_ocr_pass(pytesseract, image, lang: str, config: str) -> tuple[str,
     return raw_text, confidence
 
 
+@lru_cache(maxsize=1)
+def resolve_tesseract_cmd() -> str:
+    tesseract_cmd = os.getenv("TESSERACT_CMD", "").strip()
+    if not tesseract_cmd:
+        resolved = shutil.which("tesseract")
+        if resolved:
+            tesseract_cmd = resolved
+        elif os.name == "nt":
+            default_windows_path = r"C:\Program Files\Tesseract-OCR\tesseract.exe"
+            if os.path.exists(default_windows_path):
+                tesseract_cmd = default_windows_path
+    return tesseract_cmd
+
+
+def _configure_tesseract(pytesseract) -> None:
+    tesseract_cmd = resolve_tesseract_cmd()
+    if tesseract_cmd:
+        pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
+
+
+def _ocr_lang() -> str:
+    return os.getenv("PARKING_OCR_LANG", "kor+eng")
+
+
+def _ocr_provider() -> str:
+    return os.getenv("PARKING_OCR_PROVIDER", "tesseract").strip().lower()
+
+
+def warm_up_ocr() -> dict[str, Any]:
+    if _ocr_provider() != "tesseract":
+        ocr_warmup.update(state="disabled", error=None, elapsed_ms=None)
+        return dict(ocr_warmup)
+
+    started = time.perf_counter()
+    ocr_warmup.update(state="warming", error=None, elapsed_ms=None)
+    try:
+        from PIL import Image, ImageDraw, ImageEnhance, ImageFilter, ImageOps
+        import pytesseract
+
+        try:
+            import cv2
+            import numpy
+        except ImportError:
+            pass
+
+        _configure_tesseract(pytesseract)
+        image = Image.new("L", (240, 64), 255)
+        ImageDraw.Draw(image).text((16, 24), "12 3456", fill=0)
+        config = "--oem 1 --psm 7"
+        tessdata_dir = os.getenv("TESSDATA_PREFIX", "").strip()
+        if tessdata_dir:
+            config += f' --tessdata-dir "{tessdata_dir}"'
+        pytesseract.image_to_string(image, lang=_ocr_lang(), config=config)
+    except Exception as exc:
+        ocr_warmup.update(state="unavailable", error=f"OCR 예열 실패: {exc}")
+    else:
+        ocr_warmup.update(state="ready")
+    ocr_warmup["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    return dict(ocr_warmup)
+
+
 def _run_tesseract(image_bytes: bytes) -> OCRScanResult:
     try:
         from PIL import Image
@@ -193,21 +270,11 @@ def _run_tesseract(image_bytes: bytes) -> OCRScanResult:
             error=f"OCR 라이브러리를 불러오지 못했습니다: {exc}",
         )
 
-    tesseract_cmd = os.getenv("TESSERACT_CMD", "").strip()
-    if not tesseract_cmd:
-        resolved = shutil.which("tesseract")
-        if resolved:
-            tesseract_cmd = resolved
-        elif os.name == "nt":
-            default_windows_path = r"C:\Program Files\Tesseract-OCR\tesseract.exe"
-            if os.path.exists(default_windows_path):
-                tesseract_cmd = default_windows_path
-    if tesseract_cmd:
-        pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
+    _configure_tesseract(pytesseract)
 
     try:
         image = Image.open(io.BytesIO(image_bytes))
-        lang = os.getenv("PARKING_OCR_LANG", "kor+eng")
+        lang = _ocr_lang()
         whitelist = f"0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ{PLATE_MIDDLE_CHARS}"
         tessdata_dir = os.getenv("TESSDATA_PREFIX", "").strip()
         candidate_scores: dict[str, dict[str, float]] = {}
@@ -250,7 +317,7 @@ def _run_tesseract(image_bytes: bytes) -> OCRScanResult:
 
 
 def scan_plate_image(image_bytes: bytes) -> OCRScanResult:
-    provider = os.getenv("PARKING_OCR_PROVIDER", "tesseract").strip().lower()
+    provider = _ocr_provider()
     if provider in {"", "none", "manual"}:
         return OCRScanResult(provider="manual", raw_text="", candidates=[], error="수동 입력 모드입니다.")
     if provider == "tesseract":
@@ -1,11 +1,36 @@
 from __future__ import annotations
 
+import difflib
 import json
+import os
 import re
+import sqlite3
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
 from typing import Any
 
-from .db import connect
-from .plates import normalize_plate
+from . import db
+from .db import connect, connection_key, site_generations
+from .plates import normalize_plate, weighted_plate_repairs
+
+OCR_MODEL_SNAPSHOT_VERSION = 1
+RAW_KEY_WEIGHTS = (3.0, 5.0)
+SUGGESTED_WEIGHTS = (2.0, 6.0)
+CONFUSION_BOOST = 30.0
+
+
+@dataclass(slots=True)
+class CorrectionModel:
+    generation: int = 0
+    last_id: int = 0
+    raw: dict[str, dict[str, list[float]]] = field(default_factory=dict)
+    suggested: dict[str, dict[str, list[float]]] = field(default_factory=dict)
+
+
+_models: dict[tuple[Any, str], CorrectionModel] = {}
+_models_lock = threading.Lock()
+_confusions: dict[Path, tuple[int, dict[str, dict[str, float]]]] = {}
 
 
 def normalize_ocr_key(value: Any) -> str:
@@ -42,7 +67,8 @@ def dump_candidates_json(candidates: list[str]) -> str:
     return json.dumps(candidates, ensure_ascii=False)
 
 
-def record_ocr_feedback(
+def insert_ocr_feedback(
+    con: sqlite3.Connection,
     site_code: str,
     raw_ocr_text: str | None,
     suggested_plate: str | None,
@@ -68,28 +94,222 @@ def record_ocr_feedback(
     if not raw_key and not suggested and not normalized_candidates:
         return
 
-    with connect() as con:
-        con.execute(
-            """
-            INSERT INTO ocr_feedback
-            (site_code, raw_key, raw_ocr_text, suggested_plate, corrected_plate, accepted, candidates_json, photo_path)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                site_code,
-                raw_key or None,
-                raw_ocr_text,
-                suggested or None,
-                corrected,
-                1 if suggested and suggested == corrected else 0,
-                dump_candidates_json(normalized_candidates),
-                photo_path,
-            ),
-        )
+    con.execute(
+        """
+        INSERT INTO ocr_feedback
+        (site_code, raw_key, raw_ocr_text, suggested_plate, corrected_plate, accepted, candidates_json, photo_path)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        (
+            site_code,
+            raw_key or None,
+            raw_ocr_text,
+            suggested or None,
+            corrected,
+            1 if suggested and suggested == corrected else 0,
+            dump_candidates_json(normalized_candidates),
+            photo_path,
+        ),
+    )
+
+
+def ocr_model_dir() -> Path:
+    configured = os.getenv("PARKING_OCR_MODEL_DIR", "").strip()
+    if configured:
+        return Path(configured)
+    return db.DB_PATH.with_name(f"{db.DB_PATH.stem}-ocr-models")
+
+
+def ocr_model_path(site_code: str, suffix: str = "") -> Path:
+    key = re.sub(r"[^A-Z0-9_-]+", "-", db.normalize_site_code(site_code)).strip("-_").lower()
+    return ocr_model_dir() / f"{key or 'default'}{suffix}.json"
+
+
+def write_json_snapshot(path: Path, payload: dict[str, Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_suffix(".tmp")
+    temp_path.write_text(json.dumps(payload, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+    temp_path.replace(path)
+
+
+def add_weight(index: dict[str, dict[str, list[float]]], key: str, plate: str, weight: float, row_id: int) -> None:
+    entry = index.setdefault(key, {}).setdefault(plate, [0.0, 0])
+    entry[0] += weight
+    entry[1] = max(entry[1], row_id)
+
+
+def apply_feedback_row(model: CorrectionModel, row: Any) -> None:
+    row_id = int(row["id"])
+    model.last_id = max(model.last_id, row_id)
+    plate = normalize_plate(row["corrected_plate"])
+    if not plate:
+        return
+    accepted = 0 if row["accepted"] == 1 else 1
+    if row["raw_key"]:
+        add_weight(model.raw, row["raw_key"], plate, RAW_KEY_WEIGHTS[accepted], row_id)
+    if row["suggested_plate"]:
+        add_weight(model.suggested, row["suggested_plate"], plate, SUGGESTED_WEIGHTS[accepted], row_id)
+
+
+def load_model_snapshot(site_code: str) -> CorrectionModel | None:
+    try:
+        payload = json.loads(ocr_model_path(site_code).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(payload, dict) or payload.get("version") != OCR_MODEL_SNAPSHOT_VERSION:
+        return None
+    return CorrectionModel(
+        generation=int(payload.get("generation") or 0),
+        last_id=int(payload.get("last_id") or 0),
+        raw=payload.get("raw") or {},
+        suggested=payload.get("suggested") or {},
+    )
+
+
+def save_model_snapshot(site_code: str, model: CorrectionModel) -> None:
+    path = ocr_model_path(site_code)
+    payload = {
+        "version": OCR_MODEL_SNAPSHOT_VERSION,
+        "generation": model.generation,
+        "last_id": model.last_id,
+        "raw": model.raw,
+        "suggested": model.suggested,
+    }
+    try:
+        write_json_snapshot(path, payload)
+    except OSError as exc:
+        print(f"[ocr] correction model snapshot failed for {site_code}: {exc}")
+
+
+def fetch_feedback_rows(con: sqlite3.Connection, site_code: str, after_id: int) -> list[Any]:
+    return con.execute(
+        """
+        SELECT id, raw_key, suggested_plate, corrected_plate, accepted
+        FROM ocr_feedback
+        WHERE site_code = ? AND id > ?
+        ORDER BY id
+        """,
+        (site_code, after_id),
+    ).fetchall()
+
+
+def refresh_correction_model(site_code: str, con: sqlite3.Connection | None = None) -> CorrectionModel:
+    if con is None:
+        with connect(site_code) as con:
+            return refresh_correction_model(site_code, con)
+
+    key = (connection_key(site_code), site_code)
+    generation = site_generations(con, site_code, ("ocr",))["ocr"]
+    with _models_lock:
+        model = _models.get(key)
+        if model is None:
+            model = load_model_snapshot(site_code) or CorrectionModel()
+            _models[key] = model
+        if model.generation == generation:
+            return model
+
+        rows = fetch_feedback_rows(con, site_code, model.last_id)
+        if generation - model.generation != len(rows):
+            model = CorrectionModel()
+            rows = fetch_feedback_rows(con, site_code, 0)
+            _models[key] = model
+        for row in rows:
+            apply_feedback_row(model, row)
+        model.generation = generation
+        save_model_snapshot(site_code, model)
+    return model
+
+
+def ranked_corrections(index: dict[str, dict[str, list[float]]], key: str, limit: int) -> list[tuple[str, float]]:
+    entries = index.get(key)
+    if not entries:
+        return []
+    ranked = sorted(entries.items(), key=lambda item: (item[1][0], item[1][1]), reverse=True)
+    return [(plate, weight) for plate, (weight, _) in ranked[:limit]]
+
+
+def aligned_characters(suggested: str, corrected: str) -> list[tuple[str, str]]:
+    pairs: list[tuple[str, str]] = []
+    matcher = difflib.SequenceMatcher(None, suggested, corrected, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal" or (tag == "replace" and i2 - i1 == j2 - j1):
+            pairs.extend(zip(suggested[i1:i2], corrected[j1:j2]))
+    return pairs
+
+
+def mine_ocr_confusions(con: sqlite3.Connection, site_code: str) -> dict[str, dict[str, float]]:
+    totals: dict[str, int] = {}
+    counts: dict[str, dict[str, int]] = {}
+    rows = con.execute(
+        """
+        SELECT suggested_plate, corrected_plate
+        FROM ocr_feedback
+        WHERE site_code = ? AND suggested_plate IS NOT NULL
+        """,
+        (site_code,),
+    )
+    for row in rows:
+        for observed, actual in aligned_characters(row["suggested_plate"], row["corrected_plate"]):
+            totals[observed] = totals.get(observed, 0) + 1
+            if observed != actual:
+                targets = counts.setdefault(observed, {})
+                targets[actual] = targets.get(actual, 0) + 1
+    return {
+        observed: {actual: round(count / (totals[observed] + 1), 4) for actual, count in targets.items()}
+        for observed, targets in counts.items()
+    }
+
+
+def update_ocr_confusions(site_code: str, con: sqlite3.Connection) -> int:
+    confusions = mine_ocr_confusions(con, site_code)
+    path = ocr_model_path(site_code, "-confusions")
+    write_json_snapshot(path, {"version": OCR_MODEL_SNAPSHOT_VERSION, "confusions": confusions})
+    with _models_lock:
+        _confusions[path] = (path.stat().st_mtime_ns, confusions)
+    return sum(len(targets) for targets in confusions.values())
+
+
+def site_confusions(site_code: str) -> dict[str, dict[str, float]]:
+    path = ocr_model_path(site_code, "-confusions")
+    try:
+        mtime = path.stat().st_mtime_ns
+    except OSError:
+        return {}
+    cached = _confusions.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    try:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    confusions = payload.get("confusions") if isinstance(payload, dict) else None
+    if not isinstance(confusions, dict):
+        return {}
+    with _models_lock:
+        _confusions[path] = (mtime, confusions)
+    return confusions
+
+
+def record_ocr_feedback(
+    site_code: str,
+    raw_ocr_text: str | None,
+    suggested_plate: str | None,
+    corrected_plate: str | None,
+    candidates: list[str] | None = None,
+    photo_path: str | None = None,
+) -> None:
+    with connect(site_code) as con:
+        insert_ocr_feedback(con, site_code, raw_ocr_text, suggested_plate, corrected_plate, candidates, photo_path)
         con.commit()
+        refresh_correction_model(site_code, con)
 
 
-def get_learning_candidates(site_code: str, raw_ocr_text: str | None, scanned_candidates: list[str]) -> tuple[list[str], dict[str, float]]:
+def get_learning_candidates(
+    site_code: str,
+    raw_ocr_text: str | None,
+    scanned_candidates: list[str],
+    model: CorrectionModel | None = None,
+) -> tuple[list[str], dict[str, float]]:
     normalized_scanned: list[str] = []
     seen: set[str] = set()
     for item in scanned_candidates:
@@ -101,48 +321,32 @@ def get_learning_candidates(site_code: str, raw_ocr_text: str | None, scanned_ca
 
     boosts: dict[str, float] = {}
     raw_key = normalize_ocr_key(raw_ocr_text)
+    model = model or refresh_correction_model(site_code)
 
-    with connect() as con:
+    with _models_lock:
         if raw_key:
-            rows = con.execute(
-                """
-                SELECT corrected_plate, SUM(CASE WHEN accepted = 1 THEN 3 ELSE 5 END) AS weight
-                FROM ocr_feedback
-                WHERE site_code = ? AND raw_key = ?
-                GROUP BY corrected_plate
-                ORDER BY weight DESC, MAX(id) DESC
-                LIMIT 5
-                """,
-                (site_code, raw_key),
-            ).fetchall()
-            for row in rows:
-                plate = normalize_plate(row["corrected_plate"])
-                if plate:
-                    boosts[plate] = boosts.get(plate, 0.0) + float(row["weight"] or 0.0) + 40.0
+            for plate, weight in ranked_corrections(model.raw, raw_key, 5):
+                boosts[plate] = boosts.get(plate, 0.0) + weight + 40.0
 
         for candidate in normalized_scanned[:5]:
-            rows = con.execute(
-                """
-                SELECT corrected_plate, SUM(CASE WHEN accepted = 1 THEN 2 ELSE 6 END) AS weight
-                FROM ocr_feedback
-                WHERE site_code = ? AND suggested_plate = ?
-                GROUP BY corrected_plate
-                ORDER BY weight DESC, MAX(id) DESC
-                LIMIT 4
-                """,
-                (site_code, candidate),
-            ).fetchall()
-            for row in rows:
-                plate = normalize_plate(row["corrected_plate"])
-                if plate:
-                    boosts[plate] = boosts.get(plate, 0.0) + float(row["weight"] or 0.0)
+            for plate, weight in ranked_corrections(model.suggested, candidate, 4):
+                boosts[plate] = boosts.get(plate, 0.0) + weight
 
     ranked = sorted(boosts.items(), key=lambda item: item[1], reverse=True)
     return [plate for plate, _ in ranked], boosts
 
 
+def get_confusion_repairs(site_code: str, raw_ocr_text: str | None, scanned_candidates: list[str]) -> list[tuple[str, float]]:
+    scanned = [plate for plate in (normalize_plate(item) for item in scanned_candidates) if plate]
+    repair_source = "\n".join([str(raw_ocr_text or ""), *scanned[:5]])
+    return [
+        (plate, probability * CONFUSION_BOOST)
+        for plate, probability in weighted_plate_repairs(repair_source, site_confusions(site_code))
+    ]
+
+
 def get_learning_status(site_code: str) -> dict[str, Any]:
-    with connect() as con:
+    with connect(site_code) as con:
         counts = con.execute(
             """
             SELECT
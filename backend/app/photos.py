@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import hashlib
+import io
+import os
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+
+PHOTO_MAX_EDGE = 1600
+PHOTO_QUALITY = 80
+THUMB_MAX_EDGE = 320
+THUMB_QUALITY = 70
+THUMB_MARKER = ".thumb"
+PHOTO_DIR_NAME = "photos"
+
+
+@dataclass(slots=True)
+class ProcessedPhoto:
+    content_hash: str
+    suffix: str
+    payload: bytes
+    thumbnail: bytes | None
+
+
+def _webp_supported() -> bool:
+    try:
+        from PIL import features
+
+        return bool(features.check("webp"))
+    except Exception:
+        return False
+
+
+def _encode(image, max_edge: int, quality: int, image_format: str, exif: bytes = b"") -> bytes:
+    from PIL import Image
+
+    copy = image.copy()
+    copy.thumbnail((max_edge, max_edge), Image.Resampling.LANCZOS)
+    buffer = io.BytesIO()
+    if image_format == "WEBP":
+        copy.save(buffer, format="WEBP", quality=quality, method=4, exif=exif)
+    else:
+        copy.save(buffer, format="JPEG", quality=quality, optimize=True, progressive=True, exif=exif)
+    return buffer.getvalue()
+
+
+def _draft_size(size: tuple[int, int], max_edge: int) -> tuple[int, int]:
+    width, height = size
+    scale = max_edge / max(width, height, 1)
+    return max(int(width * scale), 1), max(int(height * scale), 1)
+
+
+def process_photo(payload: bytes, fallback_suffix: str = ".jpg") -> ProcessedPhoto:
+    content_hash = hashlib.sha256(payload).hexdigest()
+    try:
+        from PIL import Image, ImageOps
+
+        with Image.open(io.BytesIO(payload)) as opened:
+            opened.seek(0)
+            if opened.format == "JPEG":
+                opened.draft("RGB", _draft_size(opened.size, PHOTO_MAX_EDGE))
+            image = ImageOps.exif_transpose(opened).convert("RGB")
+            exif = image.getexif()
+            exif_bytes = exif.tobytes() if exif else b""
+    except Exception:
+        return ProcessedPhoto(content_hash=content_hash, suffix=fallback_suffix, payload=payload, thumbnail=None)
+
+    image_format = "WEBP" if _webp_supported() else "JPEG"
+    suffix = ".webp" if image_format == "WEBP" else ".jpg"
+    return ProcessedPhoto(
+        content_hash=content_hash,
+        suffix=suffix,
+        payload=_encode(image, PHOTO_MAX_EDGE, PHOTO_QUALITY, image_format, exif_bytes),
+        thumbnail=_encode(image, THUMB_MAX_EDGE, THUMB_QUALITY, image_format),
+    )
+
+
+def thumbnail_name(name: str) -> str:
+    path = Path(name)
+    return f"{path.stem}{THUMB_MARKER}{path.suffix}"
+
+
+def store_photo(target_dir: Path, processed: ProcessedPhoto) -> tuple[str, str | None]:
+    photo_dir = target_dir / PHOTO_DIR_NAME
+    photo_dir.mkdir(parents=True, exist_ok=True)
+    raw_marker = "" if processed.thumbnail is not None else "-raw"
+    name = f"{processed.content_hash}{raw_marker}{processed.suffix}"
+    photo_path = photo_dir / name
+    if not photo_path.exists():
+        _write_atomic(photo_path, processed.payload)
+    thumb = None
+    if processed.thumbnail is not None:
+        thumb = thumbnail_name(name)
+        thumb_path = photo_dir / thumb
+        if not thumb_path.exists():
+            _write_atomic(thumb_path, processed.thumbnail)
+        thumb = f"{PHOTO_DIR_NAME}/{thumb}"
+    return f"{PHOTO_DIR_NAME}/{name}", thumb
+
+
+def photo_thumbnail_url(photo_url: str | None) -> str | None:
+    if not photo_url:
+        return None
+    head, _, name = photo_url.rpartition("/")
+    if not head.endswith(f"/{PHOTO_DIR_NAME}") or THUMB_MARKER in name:
+        return photo_url
+    suffix = Path(name).suffix
+    if suffix not in {".webp", ".jpg"} or len(Path(name).stem) != 64:
+        return photo_url
+    return f"{head}/{thumbnail_name(name)}"
+
+
+def _write_atomic(path: Path, payload: bytes) -> None:
+    handle, temp_name = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(handle, "wb") as temp_file:
+            temp_file.write(payload)
+        os.replace(temp_name, path)
+    except BaseException:
+        Path(temp_name).unlink(missing_ok=True)
+        raise
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+from typing import Any, Iterable
+
+from .db import connect, connection_key, site_generations
+
+FUZZY_MAX_DISTANCE = max(1, min(2, int(os.getenv("PARKING_FUZZY_MAX_DISTANCE", "2"))))
+
+
+def deletion_variants(text: str, depth: int) -> set[str]:
+    variants = {text}
+    frontier = {text}
+    for _ in range(depth):
+        frontier = {item[:index] + item[index + 1 :] for item in frontier for index in range(len(item))}
+        variants |= frontier
+    return variants
+
+
+def edit_distance(left: str, right: str, limit: int) -> int:
+    if abs(len(left) - len(right)) > limit:
+        return limit + 1
+    previous = list(range(len(right) + 1))
+    for row, left_char in enumerate(left, start=1):
+        current = [row]
+        for column, right_char in enumerate(right, start=1):
+            current.append(
+                min(
+                    previous[column] + 1,
+                    current[column - 1] + 1,
+                    previous[column - 1] + (left_char != right_char),
+                )
+            )
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+
+class PlateIndex:
+    __slots__ = ("generation", "max_distance", "plates", "deletes")
+
+    def __init__(self, plates: Iterable[str], generation: int = 0, max_distance: int = FUZZY_MAX_DISTANCE):
+        self.generation = generation
+        self.max_distance = max_distance
+        self.plates = set(plates)
+        self.deletes: dict[str, list[str]] = {}
+        for plate in self.plates:
+            for variant in deletion_variants(plate, max_distance):
+                self.deletes.setdefault(variant, []).append(plate)
+
+    def nearest(self, plate: str, max_distance: int | None = None, limit: int = 5) -> list[tuple[str, int]]:
+        distance_limit = min(self.max_distance, max_distance if max_distance is not None else self.max_distance)
+        found: dict[str, int] = {}
+        for variant in deletion_variants(plate, distance_limit):
+            for candidate in self.deletes.get(variant, ()):
+                if candidate not in found:
+                    found[candidate] = edit_distance(plate, candidate, distance_limit)
+        ranked = sorted(
+            ((candidate, distance) for candidate, distance in found.items() if 0 < distance <= distance_limit),
+            key=lambda item: (item[1], item[0]),
+        )
+        return ranked[:limit]
+
+
+_indexes: dict[tuple[Any, str], PlateIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def site_plate_index(site_code: str, con: sqlite3.Connection | None = None) -> PlateIndex:
+    if con is None:
+        with connect(site_code) as con:
+            return site_plate_index(site_code, con)
+
+    key = (connection_key(site_code), site_code)
+    generation = site_generations(con, site_code, ("registry",))["registry"]
+    index = _indexes.get(key)
+    if index is not None and index.generation == generation:
+        return index
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None or index.generation != generation:
+            rows = con.execute(
+                "SELECT plate FROM vehicles WHERE site_code = ? AND deleted_at IS NULL",
+                (site_code,),
+            ).fetchall()
+            index = PlateIndex((row["plate"] for row in rows), generation)
+            _indexes[key] = index
+    return index
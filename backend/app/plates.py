@@ -24,6 +24,7 @@ DIGIT_SIMILAR_MAP = {
     "T": "7",
     "B": "8",
 }
+DIGIT_REPAIR_PROBABILITY = 0.6
 
 STATUS_ALIASES = {
     "active": "active",
@@ -163,6 +164,73 @@ def extract_plate_candidates(value: Any) -> list[str]:
     return [item[0] for item in sorted_items]
 
 
+def _slot_accepts(char: str, slot_is_middle: bool) -> bool:
+    return char in PLATE_MIDDLE_SET if slot_is_middle else char.isdigit()
+
+
+def _slot_options(char: str, slot_is_middle: bool, confusions: dict[str, dict[str, float]]) -> list[tuple[str, float, int]]:
+    options: dict[str, tuple[float, int]] = {}
+    if not slot_is_middle and char in DIGIT_SIMILAR_MAP:
+        options[DIGIT_SIMILAR_MAP[char]] = (DIGIT_REPAIR_PROBABILITY, 0)
+    for target, probability in confusions.get(char, {}).items():
+        if target != char and _slot_accepts(target, slot_is_middle) and probability > options.get(target, (0.0, 0))[0]:
+            options[target] = (probability, 1)
+    return [(target, probability, cost) for target, (probability, cost) in options.items()]
+
+
+def _weighted_window_edits(
+    window: str,
+    confusions: dict[str, dict[str, float]],
+    max_edits: int,
+) -> list[tuple[str, float]]:
+    middle_index = len(window) - 5
+    if middle_index not in {2, 3}:
+        return []
+    slots = [index == middle_index for index in range(len(window))]
+    unrepairable = sum(
+        1 for char, slot in zip(window, slots) if not _slot_accepts(char, slot) and (slot or char not in DIGIT_SIMILAR_MAP)
+    )
+    if unrepairable > max_edits:
+        return []
+
+    beams: list[tuple[str, float, int, bool]] = [("", 1.0, 0, False)]
+    for char, slot in zip(window, slots):
+        accepted = _slot_accepts(char, slot)
+        options = _slot_options(char, slot, confusions)
+        next_beams: list[tuple[str, float, int, bool]] = []
+        for prefix, probability, edits, learned in beams:
+            if accepted:
+                next_beams.append((prefix + char, probability, edits, learned))
+            for target, weight, cost in options:
+                if edits + cost <= max_edits:
+                    next_beams.append((prefix + target, probability * weight, edits + cost, learned or cost > 0))
+        if not next_beams:
+            return []
+        beams = next_beams
+    return [(candidate, probability) for candidate, probability, _, learned in beams if learned and PLATE_PATTERN.fullmatch(candidate)]
+
+
+def weighted_plate_repairs(
+    value: Any,
+    confusions: dict[str, dict[str, float]],
+    max_edits: int = 2,
+    limit: int = 5,
+    min_probability: float = 0.05,
+) -> list[tuple[str, float]]:
+    if not confusions:
+        return []
+    scored: dict[str, float] = {}
+    for line in str(value or "").splitlines() or [""]:
+        compact = compact_plate_text(line)
+        for window_size in (7, 8):
+            for index in range(len(compact) - window_size + 1):
+                for candidate, probability in _weighted_window_edits(compact[index : index + window_size], confusions, max_edits):
+                    if probability >= min_probability and probability > scored.get(candidate, 0.0):
+                        scored[candidate] = probability
+    ranked = sorted(scored.items(), key=lambda item: item[1], reverse=True)
+    return ranked[:limit]
+
+
 def normalize_status(value: Any) -> str:
     text = str(value or "").strip().lower()
     compact = re.sub(r"\s+", "", text)
@@ -0,0 +1,258 @@
+from __future__ import annotations
+
+import json
+import os
+import socket
+import threading
+import traceback
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Callable
+
+from .db import SCHEDULER_HISTORY_KEEP, connect
+
+SCHEDULER_IDLE_SECONDS = 60
+SCHEDULER_LOCK_SECONDS = 3600
+CRON_FIELD_RANGES = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 7))
+CRON_ALIASES = {
+    "@hourly": "0 * * * *",
+    "@daily": "0 0 * * *",
+    "@weekly": "0 0 * * 0",
+    "@monthly": "0 0 1 * *",
+}
+
+
+def parse_cron_field(text: str, low: int, high: int) -> frozenset[int]:
+    values: set[int] = set()
+    for part in text.split(","):
+        base, _, step_text = part.partition("/")
+        step = int(step_text) if step_text else 1
+        if step < 1:
+            raise ValueError(f"invalid cron step: {part}")
+        if base == "*":
+            start, end = low, high
+        elif "-" in base:
+            start_text, end_text = base.split("-", 1)
+            start, end = int(start_text), int(end_text)
+        else:
+            start = int(base)
+            end = high if step_text else start
+        if start < low or end > high or start > end:
+            raise ValueError(f"cron value out of range: {part}")
+        values.update(range(start, end + 1, step))
+    return frozenset(values)
+
+
+@dataclass(frozen=True, slots=True)
+class CronSchedule:
+    expression: str
+    minutes: frozenset[int]
+    hours: frozenset[int]
+    days: frozenset[int]
+    months: frozenset[int]
+    weekdays: frozenset[int]
+    any_day: bool
+    any_weekday: bool
+
+    @classmethod
+    def parse(cls, expression: str) -> "CronSchedule":
+        text = CRON_ALIASES.get(expression.strip(), expression.strip())
+        parts = text.split()
+        if len(parts) != 5:
+            raise ValueError(f"cron expression needs 5 fields: {expression}")
+        minutes, hours, days, months, weekdays = (
+            parse_cron_field(part, low, high) for part, (low, high) in zip(parts, CRON_FIELD_RANGES)
+        )
+        weekdays = frozenset(value % 7 for value in weekdays)
+        return cls(expression, minutes, hours, days, months, weekdays, any_day=parts[2] == "*", any_weekday=parts[4] == "*")
+
+    def day_matches(self, moment: datetime) -> bool:
+        day_ok = moment.day in self.days
+        weekday_ok = (moment.weekday() + 1) % 7 in self.weekdays
+        if self.any_day or self.any_weekday:
+            return day_ok and weekday_ok
+        return day_ok or weekday_ok
+
+    def next_after(self, moment: datetime) -> datetime:
+        candidate = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = candidate + timedelta(days=366 * 4)
+        while candidate < limit:
+            if candidate.month not in self.months:
+                year, month = divmod(candidate.month, 12)
+                candidate = candidate.replace(year=candidate.year + year, month=month + 1, day=1, hour=0, minute=0)
+                continue
+            if not self.day_matches(candidate):
+                candidate = (candidate + timedelta(days=1)).replace(hour=0, minute=0)
+                continue
+            if candidate.hour not in self.hours:
+                candidate = (candidate + timedelta(hours=1)).replace(minute=0)
+                continue
+            if candidate.minute not in self.minutes:
+                candidate += timedelta(minutes=1)
+                continue
+            return candidate
+        raise ValueError(f"cron expression never matches: {self.expression}")
+
+
+@dataclass(slots=True)
+class ScheduledJob:
+    name: str
+    schedule: CronSchedule | None
+    func: Callable[[], Any]
+    lock_seconds: int = SCHEDULER_LOCK_SECONDS
+    next_run: datetime | None = None
+
+
+class Scheduler:
+    def __init__(self) -> None:
+        self.jobs: dict[str, ScheduledJob] = {}
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._run_lock = threading.Lock()
+
+    def register(self, name: str, schedule: str | None, func: Callable[[], Any], *, lock_seconds: int = SCHEDULER_LOCK_SECONDS) -> ScheduledJob:
+        expression = str(schedule or "").strip()
+        parsed = None if expression.lower() in {"", "off", "none", "disabled"} else CronSchedule.parse(expression)
+        job = ScheduledJob(name=name, schedule=parsed, func=func, lock_seconds=lock_seconds)
+        self.jobs[name] = job
+        return job
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        now = datetime.now()
+        for job in self.jobs.values():
+            job.next_run = job.schedule.next_after(now) if job.schedule else None
+        self._thread = threading.Thread(target=self._loop, name="parking-scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+        self._thread = None
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            now = datetime.now()
+            for job in sorted(self.jobs.values(), key=lambda item: item.next_run or datetime.max):
+                if self._stop.is_set() or job.next_run is None or job.next_run > now:
+                    continue
+                slot = job.next_run
+                job.next_run = job.schedule.next_after(max(now, slot)) if job.schedule else None
+                self.run(job.name, scheduled_for=slot)
+            pending = [job.next_run for job in self.jobs.values() if job.next_run]
+            wait = min([(moment - datetime.now()).total_seconds() for moment in pending] + [SCHEDULER_IDLE_SECONDS])
+            self._stop.wait(max(wait, 1))
+
+    def run(self, name: str, *, scheduled_for: datetime | None = None) -> dict[str, Any]:
+        job = self.jobs.get(name)
+        if job is None:
+            raise KeyError(name)
+        trigger = "schedule" if scheduled_for else "manual"
+        slot = (scheduled_for or datetime.now()).isoformat(timespec="seconds" if scheduled_for else "microseconds")
+        with self._run_lock:
+            if not self._acquire(job):
+                return {"job": name, "status": "locked"}
+            try:
+                run_id = self._start_run(job, slot, trigger)
+                if run_id is None:
+                    return {"job": name, "status": "duplicate"}
+                try:
+                    result = job.func()
+                except Exception as exc:
+                    detail = {"error": str(exc), "traceback": traceback.format_exc(limit=5)}
+                    self._finish_run(run_id, "failed", detail)
+                    print(f"[scheduler] {name} failed: {exc}")
+                    return {"job": name, "status": "failed", "detail": detail}
+                self._finish_run(run_id, "ok", result)
+                return {"job": name, "status": "ok", "detail": result}
+            finally:
+                self._release(job)
+
+    def _acquire(self, job: ScheduledJob) -> bool:
+        with connect() as con:
+            cur = con.execute(
+                """
+                INSERT INTO scheduler_locks(job_name, owner, locked_until)
+                VALUES (?, ?, datetime('now', ?))
+                ON CONFLICT(job_name) DO UPDATE SET
+                  owner = excluded.owner,
+                  locked_until = excluded.locked_until
+                WHERE scheduler_locks.locked_until < datetime('now') OR scheduler_locks.owner = excluded.owner
+                """,
+                (job.name, self.owner, f"+{job.lock_seconds} seconds"),
+            )
+            con.commit()
+            return cur.rowcount == 1
+
+    def _release(self, job: ScheduledJob) -> None:
+        with connect() as con:
+            con.execute("DELETE FROM scheduler_locks WHERE job_name = ? AND owner = ?", (job.name, self.owner))
+            con.commit()
+
+    def _start_run(self, job: ScheduledJob, slot: str, trigger: str) -> int | None:
+        with connect() as con:
+            cur = con.execute(
+                """
+                INSERT OR IGNORE INTO scheduler_job_runs(job_name, scheduled_for, trigger, owner)
+                VALUES (?, ?, ?, ?)
+                """,
+                (job.name, slot, trigger, self.owner),
+            )
+            con.commit()
+            return cur.lastrowid if cur.rowcount == 1 else None
+
+    def _finish_run(self, run_id: int, status: str, detail: Any) -> None:
+        with connect() as con:
+            con.execute(
+                """
+                UPDATE scheduler_job_runs
+                SET status = ?, detail = ?, finished_at = datetime('now')
+                WHERE id = ?
+                """,
+                (status, json.dumps(detail, ensure_ascii=False, default=str) if detail is not None else None, run_id),
+            )
+            con.execute(
+                """
+                DELETE FROM scheduler_job_runs
+                WHERE job_name = (SELECT job_name FROM scheduler_job_runs WHERE id = ?)
+                  AND id NOT IN (
+                    SELECT id FROM scheduler_job_runs
+                    WHERE job_name = (SELECT job_name FROM scheduler_job_runs WHERE id = ?)
+                    ORDER BY id DESC
+                    LIMIT ?
+                  )
+                """,
+                (run_id, run_id, SCHEDULER_HISTORY_KEEP),
+            )
+            con.commit()
+
+    def history(self, name: str | None = None, limit: int = 50) -> list[dict[str, Any]]:
+        where = "WHERE job_name = ?" if name else ""
+        params: list[Any] = [name] if name else []
+        with connect() as con:
+            rows = con.execute(
+                f"""
+                SELECT id, job_name, scheduled_for, trigger, owner, status, detail, started_at, finished_at
+                FROM scheduler_job_runs
+                {where}
+                ORDER BY id DESC
+                LIMIT ?
+                """,
+                (*params, limit),
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def describe(self) -> list[dict[str, Any]]:
+        return [
+            {
+                "name": job.name,
+                "schedule": job.schedule.expression if job.schedule else None,
+                "next_run": job.next_run.isoformat(timespec="minutes") if job.next_run else None,
+            }
+            for job in self.jobs.values()
+        ]
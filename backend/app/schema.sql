@@ -1,5 +1,3 @@
-PRAGMA journal_mode=WAL;
-
 CREATE TABLE IF NOT EXISTS vehicles (
   site_code TEXT NOT NULL,
   plate TEXT NOT NULL,
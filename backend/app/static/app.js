@@ -168,6 +168,9 @@ let nativeOcrWaiters = [];
 let currentCheckMatches = [];
 let currentCheckIndex = 0;
 let currentCheckRequestedPlate = "";
+let checkSequence = 0;
+let registrySnapshot = null;
+let registryPlateIndex = new Map();
 let scanAttemptCount = 0;
 let cctvAssignees = [];
 let activeMobileTab = "enforce";
@@ -410,7 +413,58 @@ function initFirstUseGuide() {
   });
 }
 
+const liveDirtyTabs = new Set(["cctv", "recent"]);
+let liveStream = null;
+let liveRefreshTimer = 0;
+
+function liveTabFresh(tab) {
+  return Boolean(liveStream && liveStream.readyState === EventSource.OPEN && !liveDirtyTabs.has(tab));
+}
+
+function refreshLiveTab(tab) {
+  liveDirtyTabs.delete(tab);
+  if (tab === "cctv") {
+    return loadCctvRequests().catch(() => liveDirtyTabs.add(tab));
+  }
+  return loadRecent().catch(() => liveDirtyTabs.add(tab));
+}
+
+function scheduleLiveRefresh(tab) {
+  liveDirtyTabs.add(tab);
+  const desktop = !window.matchMedia("(max-width: 720px)").matches;
+  if (!desktop && activeMobileTab !== tab) {
+    return;
+  }
+  window.clearTimeout(liveRefreshTimer);
+  liveRefreshTimer = window.setTimeout(() => {
+    [...liveDirtyTabs].filter((name) => desktop || name === activeMobileTab).forEach(refreshLiveTab);
+  }, 300);
+}
+
+function initLiveUpdates() {
+  if (typeof window.EventSource !== "function") {
+    return;
+  }
+  liveStream = new EventSource(apiUrl("/api/events/stream"));
+  ["cctv.created", "cctv.updated", "cctv.deleted"].forEach((type) => {
+    liveStream.addEventListener(type, () => scheduleLiveRefresh("cctv"));
+  });
+  ["enforcement.created", "enforcement.updated", "enforcement.deleted"].forEach((type) => {
+    liveStream.addEventListener(type, () => scheduleLiveRefresh("recent"));
+  });
+  liveStream.addEventListener("registry.synced", () => {
+    refreshRegistrySnapshot().catch(() => {});
+  });
+  liveStream.addEventListener("error", () => {
+    liveDirtyTabs.add("cctv");
+    liveDirtyTabs.add("recent");
+  });
+}
+
 function refreshActiveMobileTab(tab) {
+  if ((tab === "cctv" || tab === "recent") && liveTabFresh(tab)) {
+    return;
+  }
   if (tab === "cctv") {
     loadCctvAssignees()
       .catch(() => {})
@@ -548,6 +602,14 @@ function renderIdleVerdict() {
   updateOcrLearningPanel();
 }
 
+function photoThumbMarkup(row) {
+  if (!row.photo_path) {
+    return "";
+  }
+  const thumb = row.photo_thumb_url || row.photo_path;
+  return `<a class="photo-thumb-link" href="${escapeHtml(row.photo_path)}" target="_blank" rel="noopener"><img class="photo-thumb" src="${escapeHtml(thumb)}" alt="첨부 사진" loading="lazy" decoding="async"></a>`;
+}
+
 function toMatchItem(data) {
   return {
     plate: data.plate || "",
@@ -559,6 +621,9 @@ function toMatchItem(data) {
     status: data.status || null,
     valid_from: data.valid_from || null,
     valid_to: data.valid_to || null,
+    prior_violations: Number(data.prior_violations || 0),
+    prior_events_count: Number(data.prior_events_count || 0),
+    last_seen_at: data.last_seen_at || null,
   };
 }
 
@@ -602,6 +667,12 @@ function renderVerdict(data) {
     { label: "연락처", html: contactActionsMarkup(data.phone, data.plate, "light") },
     { label: "시작일", value: data.valid_from || "-" },
     { label: "만료일", value: data.valid_to || "-" },
+    {
+      label: "이전 위반",
+      value: Number(data.prior_violations || 0) > 0
+        ? `${data.prior_violations}건${data.last_seen_at ? ` · 최근 ${data.last_seen_at}` : ""}`
+        : "없음",
+    },
   ];
   verdictMeta.innerHTML = meta
     .map((item) => `<div><dt>${escapeHtml(item.label)}</dt><dd>${item.html ?? escapeHtml(item.value || "-")}</dd></div>`)
@@ -731,7 +802,7 @@ function renderRecent(rows, append = false) {
         <div>${escapeHtml(row.verdict_message || "-")}</div>
         <div class="subtle">${escapeHtml(row.location || "-")} · ${escapeHtml(row.inspector || "-")} · ${escapeHtml(displayDateTime(row.created_at))}</div>
         <div class="subtle">${escapeHtml(row.owner_name || "-")} / ${escapeHtml(row.unit || "-")}${row.memo ? ` · ${escapeHtml(row.memo)}` : ""}</div>
-        ${row.photo_path ? `<a class="contact-action" href="${escapeHtml(row.photo_path)}" target="_blank" rel="noopener">사진 보기</a>` : ""}
+        ${photoThumbMarkup(row)}
         <div class="enforcement-edit-grid">
           <label>
             <span>차량번호</span>
@@ -1187,7 +1258,7 @@ function renderSiteList(sites) {
             </div>
             <span class="result-badge badge-idle">사용자 ${escapeHtml(site.users_count || 0)}</span>
           </div>
-          <div class="subtle">등록차량 ${escapeHtml(site.vehicles_count || 0)}대</div>
+          <div class="subtle">등록차량 ${escapeHtml(site.vehicles_count || 0)}대 · 이번 달 단속 ${escapeHtml(site.monthly_events_count || 0)}건 · 진행 중 CCTV ${escapeHtml(site.open_cctv_count || 0)}건</div>
         </article>
       `;
     })
@@ -1488,7 +1559,7 @@ function renderCctvRequests(rows) {
   cctvRequestList.innerHTML = rows
     .map((row) => {
       const status = cctvStatusOption(row.status);
-      const photo = row.photo_path ? `<a class="contact-action" href="${escapeHtml(row.photo_path)}" target="_blank" rel="noopener">사진 보기</a>` : "";
+      const photo = photoThumbMarkup(row);
       return `
         <article class="result-item cctv-item" data-cctv-row="${escapeHtml(row.id)}">
           <div class="result-top">
@@ -1542,8 +1613,19 @@ function renderCctvRequests(rows) {
   });
 }
 
+const etagCache = new Map();
+const ETAG_CACHE_LIMIT = 40;
+
 async function fetchJson(url, options = {}) {
-  const response = await fetch(url, options);
+  const method = String(options.method || "GET").toUpperCase();
+  const cached = method === "GET" ? etagCache.get(url) : null;
+  const requestOptions = cached
+    ? { ...options, cache: "no-store", headers: { ...(options.headers || {}), "If-None-Match": cached.etag } }
+    : options;
+  const response = await fetch(url, requestOptions);
+  if (response.status === 304 && cached) {
+    return structuredClone(cached.body);
+  }
   if (!response.ok) {
     let message = `요청 실패: ${response.status}`;
     try {
@@ -1552,9 +1634,20 @@ async function fetchJson(url, options = {}) {
     } catch (_) {
       // ignore
     }
-    throw new Error(message);
+    const error = new Error(message);
+    error.status = response.status;
+    throw error;
   }
-  return response.json();
+  const body = await response.json();
+  const etag = response.headers.get("ETag");
+  if (method === "GET" && etag) {
+    etagCache.delete(url);
+    etagCache.set(url, { etag, body: structuredClone(body) });
+    if (etagCache.size > ETAG_CACHE_LIMIT) {
+      etagCache.delete(etagCache.keys().next().value);
+    }
+  }
+  return body;
 }
 
 function nativeOcrAvailable() {
@@ -1602,20 +1695,241 @@ function waitForNativeOcr(timeoutMs = 1400) {
   });
 }
 
+const REGISTRY_DB_NAME = "parking-registry";
+const REGISTRY_STORE_NAME = "snapshots";
+const EVENT_QUEUE_STORE_NAME = "event-queue";
+const EVENT_BATCH_SIZE = 20;
+const EVENT_RETRY_STATUSES = new Set([401, 403, 408, 429]);
+const REGISTRY_REFRESH_MS = 5 * 60 * 1000;
+const REGISTRY_PRIVATE_FIELDS = ["owner_name", "phone"];
+const PLATE_FULL_PATTERN = /^\d{2,3}[가-힣]\d{4}$/;
+
+function openRegistryDb() {
+  return new Promise((resolve, reject) => {
+    if (!window.indexedDB) {
+      reject(new Error("IndexedDB unavailable"));
+      return;
+    }
+    const request = window.indexedDB.open(REGISTRY_DB_NAME, 2);
+    request.onupgradeneeded = () => {
+      const db = request.result;
+      if (!db.objectStoreNames.contains(REGISTRY_STORE_NAME)) {
+        db.createObjectStore(REGISTRY_STORE_NAME, { keyPath: "site_code" });
+      }
+      if (!db.objectStoreNames.contains(EVENT_QUEUE_STORE_NAME)) {
+        db.createObjectStore(EVENT_QUEUE_STORE_NAME, { keyPath: "client_event_id" });
+      }
+    };
+    request.onsuccess = () => resolve(request.result);
+    request.onerror = () => reject(request.error);
+  });
+}
+
+async function registryStoreRequest(mode, action, storeName = REGISTRY_STORE_NAME) {
+  const db = await openRegistryDb();
+  try {
+    return await new Promise((resolve, reject) => {
+      const request = action(db.transaction(storeName, mode).objectStore(storeName));
+      request.onsuccess = () => resolve(request.result);
+      request.onerror = () => reject(request.error);
+    });
+  } finally {
+    db.close();
+  }
+}
+
+function setRegistrySnapshot(snapshot) {
+  registrySnapshot = snapshot;
+  registryPlateIndex = new Map();
+  const fields = snapshot?.fields || [];
+  (snapshot?.rows || []).forEach((values, index) => {
+    const row = Object.fromEntries(fields.map((field, fieldIndex) => [field, values[fieldIndex]]));
+    registryPlateIndex.set(row.plate, { ...row, index });
+  });
+}
+
+async function loadStoredRegistrySnapshot() {
+  if (!currentSiteCode) {
+    return;
+  }
+  const stored = await registryStoreRequest("readonly", (store) => store.get(currentSiteCode));
+  if (stored?.fields?.some((field) => REGISTRY_PRIVATE_FIELDS.includes(field))) {
+    await registryStoreRequest("readwrite", (store) => store.delete(currentSiteCode));
+    return;
+  }
+  if (stored && !registrySnapshot) {
+    setRegistrySnapshot(stored);
+  }
+}
+
+function applyRegistryDelta(delta) {
+  const fields = registrySnapshot.fields;
+  const rows = new Map((registrySnapshot.rows || []).map((values) => [values[fields.indexOf("plate")], values]));
+  (delta.deletes || []).forEach((plate) => rows.delete(plate));
+  (delta.upserts || []).forEach((values) => {
+    const item = Object.fromEntries(delta.fields.map((field, index) => [field, values[index]]));
+    rows.set(item.plate, fields.map((field) => item[field] ?? null));
+  });
+  const sortedRows = [...rows.values()].sort((left, right) => String(left[fields.indexOf("plate")]).localeCompare(String(right[fields.indexOf("plate")])));
+  const suffixes = {};
+  sortedRows.forEach((values, index) => {
+    const suffix = String(values[fields.indexOf("plate")]).slice(-4);
+    if (/^\d{4}$/.test(suffix)) {
+      (suffixes[suffix] ||= []).push(index);
+    }
+  });
+  setRegistrySnapshot({ ...registrySnapshot, generation: delta.generation, etag: delta.etag, rows: sortedRows, suffixes });
+}
+
+async function refreshRegistrySnapshot() {
+  if (!currentSiteCode || navigator.onLine === false) {
+    return;
+  }
+  if (!registrySnapshot) {
+    setRegistrySnapshot(await fetchJson(apiUrl("/api/registry/snapshot"), { cache: "no-cache" }));
+  } else {
+    const startGeneration = registrySnapshot.generation;
+    let hasMore = true;
+    while (hasMore) {
+      const data = await fetchJson(`${apiUrl("/api/registry/changes")}?since=${encodeURIComponent(registrySnapshot.generation)}`, { cache: "no-cache" });
+      if (data.mode === "snapshot") {
+        setRegistrySnapshot(data);
+        break;
+      }
+      applyRegistryDelta(data);
+      hasMore = Boolean(data.has_more);
+    }
+    if (registrySnapshot.generation === startGeneration) {
+      return;
+    }
+  }
+  await registryStoreRequest("readwrite", (store) => store.put(registrySnapshot)).catch(() => {});
+}
+
+function initRegistrySnapshot() {
+  const refresh = () => refreshRegistrySnapshot().catch(() => {});
+  loadStoredRegistrySnapshot()
+    .catch(() => {})
+    .finally(refresh);
+  window.addEventListener("online", refresh);
+  document.addEventListener("visibilitychange", () => {
+    if (document.visibilityState === "visible") {
+      refresh();
+    }
+  });
+  window.setInterval(refresh, REGISTRY_REFRESH_MS);
+}
+
+function localDateText(value = new Date()) {
+  const month = String(value.getMonth() + 1).padStart(2, "0");
+  const day = String(value.getDate()).padStart(2, "0");
+  return `${value.getFullYear()}-${month}-${day}`;
+}
+
+function snapshotDate(value) {
+  const text = String(value || "").trim().slice(0, 10);
+  return /^\d{4}-\d{2}-\d{2}$/.test(text) ? text : null;
+}
+
+function evaluateSnapshotRow(row, today = localDateText()) {
+  if (!row) {
+    return { verdict: "UNREGISTERED", message: "미등록 차량" };
+  }
+  const base = {
+    unit: row.unit || null,
+    status: row.status,
+    valid_from: String(row.valid_from || "").trim() || null,
+    valid_to: String(row.valid_to || "").trim() || null,
+  };
+  const startDate = snapshotDate(row.valid_from);
+  const endDate = snapshotDate(row.valid_to);
+  if (row.status === "blocked") {
+    return { ...base, verdict: "BLOCKED", message: "차단 차량" };
+  }
+  if (startDate && today < startDate) {
+    return { ...base, verdict: "TEMP", message: "등록 시작 전" };
+  }
+  if (endDate && today > endDate) {
+    return { ...base, verdict: "EXPIRED", message: "등록 기간 만료" };
+  }
+  if (row.status === "temp") {
+    return { ...base, verdict: "TEMP", message: "임시 등록 차량" };
+  }
+  return { ...base, verdict: "OK", message: "정상 등록 차량" };
+}
+
+function snapshotMatch(plate, row) {
+  return {
+    plate,
+    building: row?.building || null,
+    unit_number: row?.unit_number || null,
+    ...evaluateSnapshotRow(row),
+  };
+}
+
+function localCheckResponse(requested) {
+  if (!registrySnapshot) {
+    return null;
+  }
+  const offline = navigator.onLine === false;
+  const compact = requested.toUpperCase().replace(/[\s\-_/.:]/g, "");
+  if (/^\d{4}$/.test(compact)) {
+    const verdictOrder = { OK: 0, TEMP: 1, EXPIRED: 2, BLOCKED: 3, UNREGISTERED: 4 };
+    const matches = (registrySnapshot.suffixes?.[compact] || [])
+      .map((index) => registrySnapshot.rows[index])
+      .map((values) => registryPlateIndex.get(values[registrySnapshot.fields.indexOf("plate")]))
+      .map((row) => snapshotMatch(row.plate, row))
+      .sort((left, right) => (verdictOrder[left.verdict] ?? 9) - (verdictOrder[right.verdict] ?? 9) || left.plate.localeCompare(right.plate));
+    const primary = matches[0] || snapshotMatch(compact, null);
+    return { ...primary, site_code: currentSiteCode, requested_plate: compact, match_mode: "suffix", match_count: matches.length, match_index: 0, matches, offline: true };
+  }
+  const row = registryPlateIndex.get(compact);
+  if (!row && !offline && !PLATE_FULL_PATTERN.test(compact)) {
+    return null;
+  }
+  return { ...snapshotMatch(compact, row), site_code: currentSiteCode, requested_plate: compact, match_mode: "exact", match_count: 1, match_index: 0, matches: [], offline: true };
+}
+
+function setCheckStatus(data) {
+  const source = data.offline ? " (단말 DB)" : "";
+  if (data.match_mode === "suffix" && data.match_count > 1) {
+    setStatus(`뒤 4자리 ${data.requested_plate} 일치 차량 ${data.match_count}대${source}`, "warn");
+  } else {
+    setStatus(`${data.plate} 조회 완료${source}`, data.verdict === "OK" ? "success" : data.verdict === "TEMP" ? "warn" : "danger");
+  }
+}
+
 async function runCheck() {
   const plate = plateInput.value.trim();
   if (!plate) {
     alert("차량번호를 입력해 주세요.");
     return;
   }
-  setStatus("등록차량 DB 조회 중", "active");
-  const data = await fetchJson(`${apiUrl("/api/registry/check")}?plate=${encodeURIComponent(plate)}`);
-  applyCheckResponse(data);
-  if (data.match_mode === "suffix" && data.match_count > 1) {
-    setStatus(`뒤 4자리 ${data.requested_plate} 일치 차량 ${data.match_count}대`, "warn");
+  const sequence = ++checkSequence;
+  const local = localCheckResponse(plate);
+  if (local) {
+    applyCheckResponse(local);
+    setCheckStatus(local);
+    if (navigator.onLine === false) {
+      return;
+    }
   } else {
-    setStatus(`${data.plate} 조회 완료`, data.verdict === "OK" ? "success" : data.verdict === "TEMP" ? "warn" : "danger");
+    setStatus("등록차량 DB 조회 중", "active");
+  }
+  let data;
+  try {
+    data = await fetchJson(`${apiUrl("/api/registry/check")}?plate=${encodeURIComponent(plate)}`);
+  } catch (error) {
+    if (local) {
+      return;
+    }
+    throw error;
   }
+  if (sequence !== checkSequence) {
+    return;
+  }
+  applyCheckResponse(data);
+  setCheckStatus(data);
 }
 
 async function runScan() {
@@ -1703,6 +2017,124 @@ function resetWorkflow() {
   setStatus("다음 차량 촬영 준비", "idle");
 }
 
+function newClientEventId() {
+  if (window.crypto?.randomUUID) {
+    return window.crypto.randomUUID().replace(/-/g, "");
+  }
+  return `${Date.now().toString(36)}${Math.random().toString(36).slice(2, 12)}`;
+}
+
+function queueStoreRequest(mode, action) {
+  return registryStoreRequest(mode, action, EVENT_QUEUE_STORE_NAME);
+}
+
+async function siteQueuedEvents() {
+  const events = await queueStoreRequest("readonly", (store) => store.getAll());
+  return (events || []).filter((event) => event.site_code === currentSiteCode);
+}
+
+async function queuedEvents() {
+  return (await siteQueuedEvents()).filter((event) => !event.rejected_error);
+}
+
+function rejectQueuedEvent(event, message) {
+  return queueStoreRequest("readwrite", (store) =>
+    store.put({ ...event, rejected_error: message, rejected_at: new Date().toISOString() }),
+  );
+}
+
+function isRetryableEventError(error) {
+  return !error.status || error.status >= 500 || EVENT_RETRY_STATUSES.has(error.status);
+}
+
+let eventFlushPromise = null;
+
+async function sendEventBatch(events) {
+  const formData = new FormData();
+  formData.append(
+    "events",
+    JSON.stringify(events.map(({ photo, photo_name, site_code, rejected_error, rejected_at, ...event }) => event)),
+  );
+  events.forEach((event) => {
+    if (event.photo) {
+      formData.append(`photo_${event.client_event_id}`, event.photo, event.photo_name || "photo.jpg");
+    }
+  });
+  const data = await fetchJson(apiUrl("/api/enforcement/batch"), { method: "POST", body: formData });
+  return Array.isArray(data.results) ? data.results : [];
+}
+
+function flushEventQueue() {
+  if (!eventFlushPromise) {
+    eventFlushPromise = (async () => {
+      const results = new Map();
+      if (navigator.onLine === false) {
+        return results;
+      }
+      let pending = await queuedEvents();
+      while (pending.length) {
+        const batch = pending.slice(0, EVENT_BATCH_SIZE);
+        pending = pending.slice(EVENT_BATCH_SIZE);
+        let batchResults;
+        try {
+          batchResults = await sendEventBatch(batch);
+        } catch (error) {
+          if (isRetryableEventError(error)) {
+            throw error;
+          }
+          for (const event of batch) {
+            await rejectQueuedEvent(event, error.message);
+            results.set(event.client_event_id, { client_event_id: event.client_event_id, error: error.message });
+          }
+          continue;
+        }
+        for (const result of batchResults) {
+          results.set(result.client_event_id, result);
+          const event = batch.find((item) => item.client_event_id === result.client_event_id);
+          if (result.error && event) {
+            await rejectQueuedEvent(event, result.error);
+          } else {
+            await queueStoreRequest("readwrite", (store) => store.delete(result.client_event_id));
+          }
+        }
+      }
+      return results;
+    })().finally(() => {
+      eventFlushPromise = null;
+      updateEventQueueStatus().catch(() => {});
+    });
+  }
+  return eventFlushPromise;
+}
+
+async function updateEventQueueStatus() {
+  const events = await siteQueuedEvents();
+  const rejected = events.filter((event) => event.rejected_error);
+  const count = events.length - rejected.length;
+  if (rejected.length) {
+    setStatus(`전송이 거부된 단속 기록 ${rejected.length}건 · ${rejected[0].rejected_error} (기기에 보관 중이니 관리자에게 확인해 주세요)`, "danger");
+  } else if (count) {
+    setStatus(`전송 대기 중인 단속 기록 ${count}건 · 연결되면 자동 전송됩니다.`, "warn");
+  }
+  return count;
+}
+
+function initEventQueue() {
+  const flush = () => {
+    flushEventQueue()
+      .then((results) => (results.size ? loadRecent() : null))
+      .catch((error) => {
+        if (error.status) {
+          setStatus(`단속 기록 전송 실패 · ${error.message}`, "danger");
+        }
+      });
+  };
+  window.addEventListener("online", flush);
+  updateEventQueueStatus()
+    .then((count) => (count ? flush() : null))
+    .catch(() => {});
+}
+
 async function saveEvent() {
   const plate = plateInput.value.trim();
   if (!plate) {
@@ -1714,22 +2146,54 @@ async function saveEvent() {
   }
 
   setStatus("단속 기록 저장 중", "active");
-  const formData = new FormData();
-  formData.append("plate", plateInput.value.trim());
-  formData.append("inspector", inspectorInput.value.trim());
-  formData.append("location", locationInput.value.trim());
-  formData.append("memo", memoInput.value.trim());
-  formData.append("raw_ocr_text", latestRawText);
-  formData.append("ocr_best_plate", latestOcrBestPlate);
-  formData.append("ocr_candidates", JSON.stringify(latestOcrCandidates));
-  if (currentGeo.lat !== null) formData.append("lat", String(currentGeo.lat));
-  if (currentGeo.lng !== null) formData.append("lng", String(currentGeo.lng));
-  if (photoInput.files?.length) formData.append("photo", photoInput.files[0]);
-
-  const saved = await fetchJson(apiUrl("/api/enforcement/submit"), { method: "POST", body: formData });
-  await loadRecent();
+  const event = {
+    client_event_id: newClientEventId(),
+    site_code: currentSiteCode,
+    captured_at: new Date().toISOString(),
+    plate: plateInput.value.trim(),
+    inspector: inspectorInput.value.trim(),
+    location: locationInput.value.trim(),
+    memo: memoInput.value.trim(),
+    raw_ocr_text: latestRawText,
+    ocr_best_plate: latestOcrBestPlate,
+    ocr_candidates: latestOcrCandidates,
+    lat: currentGeo.lat,
+    lng: currentGeo.lng,
+    photo: photoInput.files?.[0] || null,
+    photo_name: photoInput.files?.[0]?.name || null,
+  };
+
+  let saved = null;
+  let queued = true;
+  try {
+    await queueStoreRequest("readwrite", (store) => store.put(event));
+  } catch (_) {
+    queued = false;
+  }
+  try {
+    if (queued) {
+      await eventFlushPromise?.catch(() => {});
+      saved = (await flushEventQueue()).get(event.client_event_id) || null;
+    } else {
+      saved = (await sendEventBatch([event]))[0] || null;
+    }
+  } catch (error) {
+    if (!queued || error.status) {
+      throw error;
+    }
+  }
+  if (saved?.error) {
+    updateEventQueueStatus().catch(() => {});
+    throw new Error(`${saved.error} · 기록은 기기에 보관됩니다.`);
+  }
+
   vibrate([80, 40, 80]);
   resetWorkflow();
+  if (!saved) {
+    setStatus("오프라인 저장됨 · 연결되면 자동으로 전송됩니다.", "warn");
+    return;
+  }
+  await loadRecent();
   const learning = saved.ocr_learning_feedback || {};
   if (learning.recorded && learning.corrected) {
     setStatus("기록 저장 완료 · 교정값이 OCR 학습에 반영됐습니다.", "success");
@@ -2622,6 +3086,9 @@ initFirstUseGuide();
 initMobileTabs();
 
 loadSiteSettings().catch(() => {});
+initRegistrySnapshot();
+initEventQueue();
+initLiveUpdates();
 
 const isCompactScreen = window.matchMedia("(max-width: 720px)").matches;
 
@@ -0,0 +1,603 @@
+from __future__ import annotations
+
+import os
+import re
+import sqlite3
+import threading
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any, Iterable, Iterator, Sequence
+
+POSTGRES_POOL_MIN = max(int(os.getenv("PARKING_DB_POOL_MIN", "1")), 0)
+POSTGRES_POOL_MAX = max(int(os.getenv("PARKING_DB_POOL_MAX", "10")), 1)
+POSTGRES_POOL_TIMEOUT = float(os.getenv("PARKING_DB_POOL_TIMEOUT", "30"))
+POSTGRES_WRITE_LOCK_KEY = 0x5041524B
+DML_KEYWORDS = {"INSERT", "UPDATE", "DELETE", "REPLACE"}
+
+POSTGRES_COMPAT_SQL = r"""
+CREATE OR REPLACE FUNCTION sqlite_timestamp(value text, modifiers text[]) RETURNS timestamp
+LANGUAGE plpgsql STABLE AS $fn$
+DECLARE
+  result timestamp;
+  modifier text;
+  matched text;
+BEGIN
+  IF value IS NULL THEN
+    RETURN NULL;
+  END IF;
+  IF lower(value) = 'now' THEN
+    result := date_trunc('second', timezone('UTC', statement_timestamp()));
+  ELSE
+    matched := substring(value from '^\d{4}-\d{2}-\d{2}(?:[ T]\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?)?');
+    IF matched IS NULL THEN
+      RETURN NULL;
+    END IF;
+    result := replace(matched, 'T', ' ')::timestamp;
+  END IF;
+  FOREACH modifier IN ARRAY COALESCE(modifiers, '{}') LOOP
+    modifier := lower(trim(modifier));
+    IF modifier = 'start of month' THEN
+      result := date_trunc('month', result);
+    ELSIF modifier = 'start of year' THEN
+      result := date_trunc('year', result);
+    ELSIF modifier = 'start of day' THEN
+      result := date_trunc('day', result);
+    ELSIF modifier IN ('utc', 'localtime') THEN
+      NULL;
+    ELSIF modifier ~ '^[+-]?\s*\d+(\.\d+)?\s+(second|minute|hour|day|month|year)s?$' THEN
+      result := result + modifier::interval;
+    ELSE
+      RETURN NULL;
+    END IF;
+  END LOOP;
+  RETURN result;
+END
+$fn$;
+
+CREATE OR REPLACE FUNCTION sqlite_datetime(value text, VARIADIC modifiers text[] DEFAULT '{}') RETURNS text
+LANGUAGE sql STABLE AS $fn$ SELECT to_char(sqlite_timestamp(value, modifiers), 'YYYY-MM-DD HH24:MI:SS') $fn$;
+
+CREATE OR REPLACE FUNCTION sqlite_date(value text, VARIADIC modifiers text[] DEFAULT '{}') RETURNS text
+LANGUAGE sql STABLE AS $fn$ SELECT to_char(sqlite_timestamp(value, modifiers), 'YYYY-MM-DD') $fn$;
+
+CREATE OR REPLACE FUNCTION sqlite_julianday(value text, VARIADIC modifiers text[] DEFAULT '{}') RETURNS double precision
+LANGUAGE sql STABLE AS $fn$ SELECT extract(epoch FROM sqlite_timestamp(value, modifiers))::double precision / 86400.0 + 2440587.5 $fn$;
+
+CREATE OR REPLACE FUNCTION sqlite_strftime(fmt text, value text, VARIADIC modifiers text[] DEFAULT '{}') RETURNS text
+LANGUAGE plpgsql STABLE AS $fn$
+DECLARE
+  ts timestamp := sqlite_timestamp(value, modifiers);
+  output text := '';
+  idx integer := 1;
+  code text;
+BEGIN
+  IF ts IS NULL OR fmt IS NULL THEN
+    RETURN NULL;
+  END IF;
+  IF fmt = '%Y-%m' THEN
+    RETURN to_char(ts, 'YYYY-MM');
+  ELSIF fmt = '%H' THEN
+    RETURN to_char(ts, 'HH24');
+  END IF;
+  WHILE idx <= length(fmt) LOOP
+    code := substr(fmt, idx, 1);
+    IF code = '%' AND idx < length(fmt) THEN
+      idx := idx + 1;
+      code := substr(fmt, idx, 1);
+      output := output || CASE code
+        WHEN 'Y' THEN to_char(ts, 'YYYY')
+        WHEN 'm' THEN to_char(ts, 'MM')
+        WHEN 'd' THEN to_char(ts, 'DD')
+        WHEN 'H' THEN to_char(ts, 'HH24')
+        WHEN 'M' THEN to_char(ts, 'MI')
+        WHEN 'S' THEN to_char(ts, 'SS')
+        WHEN 'j' THEN to_char(ts, 'DDD')
+        WHEN 'w' THEN extract(dow FROM ts)::integer::text
+        WHEN 's' THEN extract(epoch FROM ts)::bigint::text
+        WHEN '%' THEN '%'
+        ELSE '%' || code
+      END;
+    ELSE
+      output := output || code;
+    END IF;
+    idx := idx + 1;
+  END LOOP;
+  RETURN output;
+END
+$fn$;
+
+CREATE OR REPLACE FUNCTION sqlite_integer(value text) RETURNS bigint
+LANGUAGE sql IMMUTABLE AS $fn$ SELECT COALESCE(substring(value from '^\s*([+-]?\d+)')::bigint, 0) $fn$;
+
+CREATE OR REPLACE FUNCTION sqlite_integer(value double precision) RETURNS bigint
+LANGUAGE sql IMMUTABLE AS $fn$ SELECT trunc(value)::bigint $fn$;
+
+CREATE OR REPLACE FUNCTION sqlite_integer(value numeric) RETURNS bigint
+LANGUAGE sql IMMUTABLE AS $fn$ SELECT trunc(value)::bigint $fn$;
+
+CREATE OR REPLACE FUNCTION sqlite_integer(value bigint) RETURNS bigint
+LANGUAGE sql IMMUTABLE AS $fn$ SELECT value $fn$;
+
+CREATE OR REPLACE FUNCTION max(a anycompatible, b anycompatible) RETURNS anycompatible
+LANGUAGE sql IMMUTABLE AS $fn$ SELECT CASE WHEN a IS NULL OR b IS NULL THEN NULL ELSE GREATEST(a, b) END $fn$;
+
+CREATE OR REPLACE FUNCTION min(a anycompatible, b anycompatible) RETURNS anycompatible
+LANGUAGE sql IMMUTABLE AS $fn$ SELECT CASE WHEN a IS NULL OR b IS NULL THEN NULL ELSE LEAST(a, b) END $fn$;
+"""
+
+STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+MASKED_LITERAL = re.compile(r"\x00(\d+)\x00")
+TRIGGER_PATTERN = re.compile(
+    r"^\s*CREATE\s+TRIGGER\s+(?:IF\s+NOT\s+EXISTS\s+)?(\w+)\s+(AFTER|BEFORE)\s+"
+    r"(INSERT|DELETE|UPDATE(?:\s+OF\s+[\w\s,]+?)?)\s+ON\s+(\w+)(?:\s+WHEN\s+(.*?))?\s+BEGIN\b(.*)\bEND\s*;?\s*$",
+    re.IGNORECASE | re.DOTALL,
+)
+DROP_TRIGGER_PATTERN = re.compile(r"^\s*DROP\s+TRIGGER\s+IF\s+EXISTS\s+(\w+)\s*;?\s*$", re.IGNORECASE)
+PRAGMA_PATTERN = re.compile(r"^\s*PRAGMA\s+(\w+)\s*(?:\(\s*(\w+)\s*\)|=\s*(\S+))?\s*;?\s*$", re.IGNORECASE)
+BEGIN_PATTERN = re.compile(r"^\s*BEGIN(?:\s+(DEFERRED|IMMEDIATE|EXCLUSIVE))?(?:\s+TRANSACTION)?\s*;?\s*$", re.IGNORECASE)
+INSERT_TABLE_PATTERN = re.compile(r"^\s*INSERT\s+(?:OR\s+\w+\s+)?INTO\s+([\w.]+)\s*(?:\(([^)]*)\))?", re.IGNORECASE)
+CONFLICT_UPDATE_PATTERN = re.compile(r"\bDO\s+UPDATE\s+SET\b(.*?)(\bWHERE\b|\bRETURNING\b|$)", re.IGNORECASE | re.DOTALL)
+DDL_PATTERN = re.compile(r"^\s*(CREATE\s+(?:TEMP\s+|TEMPORARY\s+)?TABLE|ALTER\s+TABLE)\b", re.IGNORECASE)
+
+
+def mask_literals(sql: str) -> tuple[str, list[str]]:
+    literals: list[str] = []
+
+    def keep(match: re.Match[str]) -> str:
+        literals.append(match.group(0))
+        return f"\x00{len(literals) - 1}\x00"
+
+    return STRING_LITERAL.sub(keep, sql), literals
+
+
+def unmask_literals(sql: str, literals: list[str]) -> str:
+    return MASKED_LITERAL.sub(lambda match: literals[int(match.group(1))], sql)
+
+
+def split_statements(sql: str) -> list[str]:
+    masked, literals = mask_literals(sql)
+    return [unmask_literals(part, literals).strip() for part in masked.split(";") if part.strip()]
+
+
+def replace_calls(sql: str, name: str, replace: Any) -> str:
+    pattern = re.compile(rf"\b{name}\s*\(", re.IGNORECASE)
+    output: list[str] = []
+    position = 0
+    while match := pattern.search(sql, position):
+        depth = 1
+        index = match.end()
+        while index < len(sql) and depth:
+            depth += {"(": 1, ")": -1}.get(sql[index], 0)
+            index += 1
+        output.append(sql[position : match.start()])
+        output.append(replace(sql[match.end() : index - 1]))
+        position = index
+    output.append(sql[position:])
+    return "".join(output)
+
+
+def translate_cast(inner: str) -> str:
+    match = re.match(r"^(.*)\s+AS\s+(\w+)\s*$", inner, re.IGNORECASE | re.DOTALL)
+    if match and match.group(2).upper() == "INTEGER":
+        return f"sqlite_integer({replace_calls(match.group(1), 'CAST', translate_cast)})"
+    return f"CAST({replace_calls(inner, 'CAST', translate_cast)})"
+
+
+def split_top_level(text: str) -> list[str]:
+    parts: list[str] = []
+    depth = 0
+    start = 0
+    for index, char in enumerate(text):
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif char == "," and depth == 0:
+            parts.append(text[start:index])
+            start = index + 1
+    parts.append(text[start:])
+    return parts
+
+
+def qualify_conflict_update(statement: str) -> str:
+    target = INSERT_TABLE_PATTERN.match(statement)
+    if not target or not target.group(2):
+        return statement
+    table = target.group(1).split(".")[-1]
+    columns = {column.strip().lower() for column in target.group(2).split(",")}
+
+    def qualify(expression: str) -> str:
+        return re.sub(
+            r"(?<![\w.])([A-Za-z_]\w*)\b(?!\s*\()",
+            lambda name: f"{table}.{name.group(1)}" if name.group(1).lower() in columns else name.group(1),
+            expression,
+        )
+
+    def qualify_assignments(match: re.Match[str]) -> str:
+        parts = []
+        for assignment in split_top_level(match.group(1)):
+            column, equals, expression = assignment.partition("=")
+            parts.append(f"{column}{equals}{qualify(expression)}" if equals else qualify(assignment))
+        return f"DO UPDATE SET{','.join(parts)}{match.group(2)}"
+
+    return CONFLICT_UPDATE_PATTERN.sub(qualify_assignments, statement)
+
+
+def translate_types(statement: str) -> str:
+    statement = re.sub(
+        r"\bINTEGER\s+PRIMARY\s+KEY\s+AUTOINCREMENT\b",
+        "BIGINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY",
+        statement,
+        flags=re.IGNORECASE,
+    )
+    statement = re.sub(r"\bINTEGER\b", "BIGINT", statement, flags=re.IGNORECASE)
+    statement = re.sub(r"\bREAL\b", "DOUBLE PRECISION", statement, flags=re.IGNORECASE)
+    statement = re.sub(r"\bBLOB\b", "BYTEA", statement, flags=re.IGNORECASE)
+    return re.sub(r"\)\s*WITHOUT\s+ROWID\b", ")", statement, flags=re.IGNORECASE)
+
+
+def translate_statement(masked: str) -> str:
+    if DDL_PATTERN.match(masked):
+        masked = translate_types(masked)
+    ignore = re.match(r"^(\s*INSERT)\s+OR\s+IGNORE\b", masked, re.IGNORECASE)
+    if ignore:
+        masked = f"{ignore.group(1)}{masked[ignore.end():].rstrip()} ON CONFLICT DO NOTHING"
+    masked = re.sub(r"\btemp\.", "pg_temp.", masked)
+    masked = re.sub(r"\b(datetime|date|strftime|julianday)\s*\(", lambda match: f"sqlite_{match.group(1).lower()}(", masked, flags=re.IGNORECASE)
+    masked = re.sub(r"\bjson_group_array\s*\(", "jsonb_agg(", masked, flags=re.IGNORECASE)
+    masked = re.sub(r"\bjson_group_object\s*\(", "jsonb_object_agg(", masked, flags=re.IGNORECASE)
+    masked = re.sub(r"\bLIKE\b", "ILIKE", masked, flags=re.IGNORECASE)
+    masked = re.sub(r"\bIS\s+NOT\s+(?!NULL\b|DISTINCT\b|TRUE\b|FALSE\b)", "IS DISTINCT FROM ", masked, flags=re.IGNORECASE)
+    masked = re.sub(r"\bIS\s+(?!NOT\b|NULL\b|DISTINCT\b|TRUE\b|FALSE\b)", "IS NOT DISTINCT FROM ", masked, flags=re.IGNORECASE)
+    masked = replace_calls(masked, "CAST", translate_cast)
+    if re.search(r"\bON\s+CONFLICT\b", masked, re.IGNORECASE):
+        masked = qualify_conflict_update(masked)
+    return masked
+
+
+def translate_trigger(match: re.Match[str], literals: list[str]) -> str:
+    name, timing, event, table, condition, body = match.groups()
+    statements = [translate_statement(part.strip()) for part in body.split(";") if part.strip()]
+    when = f" WHEN ({translate_statement(condition)})" if condition else ""
+    function = f"{name}_fn"
+    sql = (
+        f"CREATE OR REPLACE FUNCTION {function}() RETURNS trigger LANGUAGE plpgsql AS $trg$ BEGIN "
+        + " ".join(f"{statement};" for statement in statements)
+        + f" RETURN NULL; END $trg$; "
+        f"CREATE OR REPLACE TRIGGER {name} {timing} {' '.join(event.split())} ON {table} FOR EACH ROW{when} EXECUTE FUNCTION {function}()"
+    )
+    return unmask_literals(sql, literals)
+
+
+@lru_cache(maxsize=4096)
+def translate_sql(sql: str, parameters: bool = True) -> str:
+    masked, literals = mask_literals(sql)
+    trigger = TRIGGER_PATTERN.match(masked)
+    if trigger:
+        return translate_trigger(trigger, literals)
+    masked = translate_statement(masked)
+    if parameters:
+        masked = masked.replace("%", "%%").replace("?", "%s")
+        literals = [literal.replace("%", "%%") for literal in literals]
+    return unmask_literals(masked, literals)
+
+
+def statement_keyword(sql: str) -> str:
+    match = re.match(r"\s*(\w+)", sql)
+    return match.group(1).upper() if match else ""
+
+
+def is_lock_error(exc: Exception) -> bool:
+    return getattr(exc, "sqlstate", None) in {"40001", "40P01", "55P03", "57014"}
+
+
+def sqlite_error(exc: Exception) -> sqlite3.Error:
+    sqlstate = getattr(exc, "sqlstate", None) or ""
+    if is_lock_error(exc):
+        error: sqlite3.Error = sqlite3.OperationalError(f"database is locked ({exc})")
+    elif sqlstate.startswith("23"):
+        error = sqlite3.IntegrityError(str(exc))
+    else:
+        error = sqlite3.OperationalError(str(exc))
+    error.__cause__ = exc
+    return error
+
+
+class StorageRow(tuple):
+    _index: dict[str, int] = {}
+
+    def __getitem__(self, key: Any) -> Any:
+        if isinstance(key, str):
+            return tuple.__getitem__(self, self._index[key])
+        return tuple.__getitem__(self, key)
+
+    def keys(self) -> list[str]:
+        return list(self._index)
+
+
+@lru_cache(maxsize=1024)
+def row_class(names: tuple[str, ...]) -> type[StorageRow]:
+    return type("StorageRow", (StorageRow,), {"_index": {name: index for index, name in enumerate(names)}})
+
+
+def sqlite_value(value: Any) -> Any:
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    if isinstance(value, memoryview):
+        return value.tobytes()
+    return value
+
+
+def storage_row_factory(cursor: Any):
+    if not cursor.description:
+        return tuple
+    cls = row_class(tuple(column.name for column in cursor.description))
+    return lambda values: cls(sqlite_value(value) for value in values)
+
+
+class StorageCursor:
+    def __init__(self, cursor: Any = None, *, rows: list[Any] | None = None, lastrowid: int | None = None) -> None:
+        self._cursor = cursor
+        self._rows = rows
+        self.lastrowid = lastrowid
+        self.rowcount = cursor.rowcount if cursor is not None else len(rows or [])
+
+    @property
+    def description(self) -> Any:
+        return self._cursor.description if self._cursor is not None else None
+
+    def fetchone(self) -> Any:
+        if self._rows is not None:
+            return self._rows.pop(0) if self._rows else None
+        if self._cursor is None or self._cursor.description is None:
+            return None
+        return self._cursor.fetchone()
+
+    def fetchall(self) -> list[Any]:
+        if self._rows is not None:
+            rows, self._rows = self._rows, []
+            return rows
+        if self._cursor is None or self._cursor.description is None:
+            return []
+        return self._cursor.fetchall()
+
+    def fetchmany(self, size: int = 1) -> list[Any]:
+        if self._rows is not None:
+            rows, self._rows = self._rows[:size], self._rows[size:]
+            return rows
+        if self._cursor is None or self._cursor.description is None:
+            return []
+        return self._cursor.fetchmany(size)
+
+    def __iter__(self) -> Iterator[Any]:
+        while (row := self.fetchone()) is not None:
+            yield row
+
+
+class PostgresConnection:
+    def __init__(self, storage: "PostgresStorage", raw: Any, site_code: str | None = None) -> None:
+        self.storage = storage
+        self.raw = raw
+        self.site_code = site_code
+        self.row_factory = None
+
+    @property
+    def in_transaction(self) -> bool:
+        return self.raw.info.transaction_status != 0
+
+    def __enter__(self) -> "PostgresConnection":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        try:
+            if exc_type is None:
+                self.commit()
+            else:
+                self.rollback()
+        finally:
+            self.close()
+        return False
+
+    def _run(self, sql: str, params: Sequence[Any] | None = None) -> Any:
+        try:
+            return self.raw.execute(sql, params)
+        except self.storage.psycopg.Error as exc:
+            raise sqlite_error(exc) from exc
+
+    def _begin_implicit(self, keyword: str) -> None:
+        if keyword in DML_KEYWORDS and not self.in_transaction:
+            self._run("BEGIN")
+
+    def execute(self, sql: str, params: Sequence[Any] = ()) -> StorageCursor:
+        special = self._special(sql)
+        if special is not None:
+            return special
+        keyword = statement_keyword(sql)
+        self._begin_implicit(keyword)
+        if keyword == "SAVEPOINT" and not self.in_transaction:
+            self._run("BEGIN")
+        translated = translate_sql(sql, bool(params))
+        returning_id = keyword == "INSERT" and self._returns_id(sql)
+        if returning_id:
+            translated = f"{translated} RETURNING id"
+        cursor = self._run(translated, tuple(params) if params else None)
+        if keyword in {"CREATE", "ALTER", "DROP"}:
+            self.storage.forget_columns()
+        if returning_id:
+            row = cursor.fetchone()
+            return StorageCursor(cursor, lastrowid=row[0] if row else None)
+        return StorageCursor(cursor)
+
+    def executemany(self, sql: str, seq_of_params: Iterable[Sequence[Any]]) -> StorageCursor:
+        self._begin_implicit(statement_keyword(sql))
+        rows = [tuple(params) for params in seq_of_params]
+        cursor = self.raw.cursor()
+        if rows:
+            try:
+                cursor.executemany(translate_sql(sql, True), rows)
+            except self.storage.psycopg.Error as exc:
+                raise sqlite_error(exc) from exc
+        return StorageCursor(cursor)
+
+    def executescript(self, script: str) -> StorageCursor:
+        for statement in split_statements(script):
+            self.execute(statement)
+        return StorageCursor(rows=[])
+
+    def commit(self) -> None:
+        if self.in_transaction:
+            self._run("COMMIT")
+
+    def rollback(self) -> None:
+        if self.in_transaction:
+            self._run("ROLLBACK")
+
+    def close(self) -> None:
+        if self.raw is None:
+            return
+        raw, self.raw = self.raw, None
+        self.storage.release(raw)
+
+    def _returns_id(self, sql: str) -> bool:
+        if re.search(r"\bRETURNING\b|\bSELECT\b", sql, re.IGNORECASE):
+            return False
+        target = INSERT_TABLE_PATTERN.match(sql)
+        return bool(target) and "id" in self.storage.columns(self, target.group(1).split(".")[-1])
+
+    def _special(self, sql: str) -> StorageCursor | None:
+        begin = BEGIN_PATTERN.match(sql)
+        if begin:
+            if not self.in_transaction:
+                self._run("BEGIN")
+            if (begin.group(1) or "").upper() in {"IMMEDIATE", "EXCLUSIVE"}:
+                self._run("SELECT pg_advisory_xact_lock(%s, hashtext(%s))", (POSTGRES_WRITE_LOCK_KEY, self.site_code or ""))
+            return StorageCursor(rows=[])
+        drop = DROP_TRIGGER_PATTERN.match(sql)
+        if drop:
+            for row in self._run(
+                "SELECT tgrelid::regclass::text FROM pg_trigger WHERE tgname = %s AND NOT tgisinternal",
+                (drop.group(1).lower(),),
+            ).fetchall():
+                self._run(f"DROP TRIGGER IF EXISTS {drop.group(1)} ON {row[0]}")
+            return StorageCursor(rows=[])
+        pragma = PRAGMA_PATTERN.match(sql)
+        if pragma:
+            name, argument = pragma.group(1).lower(), pragma.group(2)
+            if name == "table_info" and argument:
+                return StorageCursor(rows=self.storage.table_info(self, argument))
+            if name == "user_version":
+                return StorageCursor(rows=self.storage.user_version(self, pragma.group(3)))
+            return StorageCursor(rows=[])
+        return None
+
+
+class PostgresStorage:
+    name = "postgres"
+
+    def __init__(self, url: str) -> None:
+        try:
+            import psycopg
+            from psycopg_pool import ConnectionPool
+        except ImportError as exc:
+            raise RuntimeError("PostgreSQL 저장소를 사용하려면 psycopg[binary]와 psycopg-pool 패키지가 필요합니다.") from exc
+        self.url = url
+        self.psycopg = psycopg
+        self.pool = ConnectionPool(
+            url,
+            min_size=POSTGRES_POOL_MIN,
+            max_size=max(POSTGRES_POOL_MAX, POSTGRES_POOL_MIN),
+            timeout=POSTGRES_POOL_TIMEOUT,
+            kwargs={"autocommit": True, "row_factory": storage_row_factory},
+            check=ConnectionPool.check_connection,
+            name="parking-db",
+            open=True,
+        )
+        self._columns: dict[str, set[str]] = {}
+        self._columns_lock = threading.Lock()
+
+    def connect(self, site_code: str | None = None) -> PostgresConnection:
+        try:
+            raw = self.pool.getconn()
+        except self.psycopg.Error as exc:
+            raise sqlite_error(exc) from exc
+        return PostgresConnection(self, raw, site_code)
+
+    def release(self, raw: Any) -> None:
+        if raw.info.transaction_status != 0:
+            raw.rollback()
+        self.pool.putconn(raw)
+
+    def install_compat(self, con: PostgresConnection) -> None:
+        con._run(POSTGRES_COMPAT_SQL)
+
+    def table_info(self, con: PostgresConnection, table: str) -> list[StorageRow]:
+        rows = con._run(
+            """
+            SELECT c.ordinal_position - 1 AS cid, c.column_name AS name, upper(c.data_type) AS type,
+                   CASE WHEN c.is_nullable = 'NO' THEN 1 ELSE 0 END AS notnull, c.column_default AS dflt_value,
+                   COALESCE(array_position(i.indkey::int2[], c.ordinal_position::int2) + 1, 0) AS pk
+            FROM information_schema.columns c
+            LEFT JOIN pg_index i ON i.indrelid = to_regclass(quote_ident(c.table_name)) AND i.indisprimary
+            WHERE c.table_name = %s AND c.table_schema = ANY(current_schemas(false))
+            ORDER BY c.ordinal_position
+            """,
+            (table.lower(),),
+        ).fetchall()
+        return rows
+
+    def user_version(self, con: PostgresConnection, value: str | None = None) -> list[StorageRow]:
+        exists = con._run("SELECT to_regclass('parking_user_version') IS NOT NULL").fetchone()[0]
+        if value is not None:
+            if not exists:
+                con._run("CREATE TABLE parking_user_version (version BIGINT NOT NULL)")
+            con._run("DELETE FROM parking_user_version")
+            con._run("INSERT INTO parking_user_version(version) VALUES (%s)", (int(value),))
+            return []
+        row = con._run("SELECT version FROM parking_user_version").fetchone() if exists else None
+        return [row_class(("user_version",))((int(row[0]) if row else 0,))]
+
+    def columns(self, con: PostgresConnection, table: str) -> set[str]:
+        key = table.lower()
+        with self._columns_lock:
+            cached = self._columns.get(key)
+        if cached is None:
+            cached = {row["name"] for row in self.table_info(con, key)}
+            with self._columns_lock:
+                self._columns[key] = cached
+        return cached
+
+    def forget_columns(self) -> None:
+        with self._columns_lock:
+            self._columns.clear()
+
+    def stats(self) -> dict[str, Any]:
+        return {"backend": self.name, **self.pool.get_stats()}
+
+    def close(self) -> None:
+        self.pool.close()
+
+
+_storages: dict[str, PostgresStorage] = {}
+_storages_lock = threading.Lock()
+
+
+def postgres_storage(url: str) -> PostgresStorage:
+    with _storages_lock:
+        storage = _storages.get(url)
+        if storage is None:
+            storage = _storages[url] = PostgresStorage(url)
+        return storage
+
+
+def close_storages() -> None:
+    with _storages_lock:
+        storages = list(_storages.values())
+        _storages.clear()
+    for storage in storages:
+        storage.close()
+
+
+def is_postgres_url(url: str) -> bool:
+    return url.startswith(("postgres://", "postgresql://"))
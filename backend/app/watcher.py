@@ -0,0 +1,257 @@
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+from .excel_import import EXCEL_SUFFIXES, is_temporary_excel_filename
+
+WATCH_DEBOUNCE_SECONDS = 2.0
+WATCH_POLL_SECONDS = 5.0
+WATCH_SAFETY_POLL_SECONDS = 60.0
+WATCH_RESCAN_SECONDS = 30.0
+
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+INOTIFY_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF
+INOTIFY_EVENT = struct.Struct("iIII")
+
+
+def is_watched_excel_name(name: str) -> bool:
+    return Path(name).suffix.lower() in EXCEL_SUFFIXES and not is_temporary_excel_filename(name)
+
+
+def excel_signature(directory: Path) -> tuple[tuple[str, int, int], ...]:
+    try:
+        entries = list(os.scandir(directory))
+    except OSError:
+        return ()
+    signature = []
+    for entry in entries:
+        if not is_watched_excel_name(entry.name):
+            continue
+        try:
+            stat = entry.stat()
+        except OSError:
+            continue
+        signature.append((entry.name, stat.st_size, stat.st_mtime_ns))
+    return tuple(sorted(signature))
+
+
+class InotifyBackend:
+    def __init__(self) -> None:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = (ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32)
+        self._rm_watch = libc.inotify_rm_watch
+        self._rm_watch.argtypes = (ctypes.c_int, ctypes.c_int)
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._watches: dict[int, Path] = {}
+        self._paths: dict[Path, int] = {}
+
+    def watch(self, directories: set[Path]) -> None:
+        for path in list(self._paths):
+            if path not in directories:
+                self._rm_watch(self.fd, self._paths.pop(path))
+        for path in directories:
+            if path in self._paths or not path.is_dir():
+                continue
+            wd = self._add_watch(self.fd, os.fsencode(path), INOTIFY_MASK)
+            if wd >= 0:
+                self._watches[wd] = path
+                self._paths[path] = wd
+
+    def wait(self, timeout: float) -> tuple[set[Path], bool]:
+        readable, _, _ = select.select([self.fd], [], [], max(timeout, 0))
+        if not readable:
+            return set(), False
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return set(), False
+        changed: set[Path] = set()
+        rescan = False
+        offset = 0
+        while offset + INOTIFY_EVENT.size <= len(data):
+            wd, mask, _, length = INOTIFY_EVENT.unpack_from(data, offset)
+            name = data[offset + INOTIFY_EVENT.size : offset + INOTIFY_EVENT.size + length].rstrip(b"\0")
+            offset += INOTIFY_EVENT.size + length
+            if mask & IN_Q_OVERFLOW:
+                rescan = True
+                changed.update(self._paths)
+                continue
+            path = self._watches.get(wd)
+            if path is None:
+                continue
+            if mask & (IN_IGNORED | IN_DELETE_SELF | IN_MOVE_SELF):
+                self._watches.pop(wd, None)
+                self._paths.pop(path, None)
+                rescan = True
+                continue
+            if mask & IN_ISDIR:
+                rescan = True
+                continue
+            if is_watched_excel_name(os.fsdecode(name)):
+                changed.add(path)
+        return changed, rescan
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class PollingBackend:
+    def watch(self, directories: set[Path]) -> None:
+        pass
+
+    def wait(self, timeout: float) -> tuple[set[Path], bool]:
+        time.sleep(max(timeout, 0))
+        return set(), False
+
+    def close(self) -> None:
+        pass
+
+
+def create_watch_backend(mode: str = "auto"):
+    if mode != "poll" and sys.platform.startswith("linux"):
+        try:
+            return InotifyBackend()
+        except (OSError, AttributeError):
+            if mode == "inotify":
+                raise
+    return PollingBackend()
+
+
+class ImportDirectoryWatcher:
+    def __init__(
+        self,
+        resolve_dirs: Callable[[], dict[str, Path]],
+        on_change: Callable[[str], Any],
+        *,
+        mode: str = "auto",
+        debounce_seconds: float = WATCH_DEBOUNCE_SECONDS,
+    ) -> None:
+        self.resolve_dirs = resolve_dirs
+        self.on_change = on_change
+        self.mode = mode
+        self.debounce_seconds = debounce_seconds
+        self.backend = None
+        self._sites: dict[Path, set[str]] = {}
+        self._signatures: dict[Path, tuple[tuple[str, int, int], ...]] = {}
+        self._pending: dict[str, float] = {}
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._backend_lock = threading.Lock()
+
+    @property
+    def backend_name(self) -> str:
+        return "inotify" if isinstance(self.backend, InotifyBackend) else "poll"
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            if not self._stop.is_set():
+                return
+            self._thread.join()
+        self._stop.clear()
+        self.backend = create_watch_backend(self.mode)
+        self.rescan(initial=True)
+        self._thread = threading.Thread(target=self._loop, name="parking-import-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+            if self._thread.is_alive():
+                print("[watcher] still running a sync, the watcher thread will close its backend on exit")
+                return
+        self._thread = None
+        self._close_backend()
+
+    def _close_backend(self) -> None:
+        with self._backend_lock:
+            backend, self.backend = self.backend, None
+        if backend is not None:
+            backend.close()
+
+    def rescan(self, *, initial: bool = False) -> None:
+        sites: dict[Path, set[str]] = {}
+        for site_code, directory in self.resolve_dirs().items():
+            sites.setdefault(Path(directory).resolve(), set()).add(site_code)
+        self._sites = sites
+        if self.backend is not None:
+            self.backend.watch(set(sites))
+        for directory in list(self._signatures):
+            if directory not in sites:
+                self._signatures.pop(directory)
+        for directory in sites:
+            if directory not in self._signatures:
+                self._signatures[directory] = excel_signature(directory)
+                if not initial and self._signatures[directory]:
+                    self.mark(directory)
+
+    def mark(self, directory: Path, now: float | None = None) -> None:
+        deadline = (now if now is not None else time.monotonic()) + self.debounce_seconds
+        for site_code in self._sites.get(directory, ()):
+            self._pending[site_code] = deadline
+
+    def poll(self, now: float | None = None) -> None:
+        for directory in self._sites:
+            signature = excel_signature(directory)
+            if signature != self._signatures.get(directory):
+                self._signatures[directory] = signature
+                self.mark(directory, now)
+
+    def flush(self, now: float | None = None) -> list[str]:
+        current = now if now is not None else time.monotonic()
+        due = [site_code for site_code, deadline in self._pending.items() if deadline <= current]
+        for site_code in due:
+            self._pending.pop(site_code, None)
+            try:
+                self.on_change(site_code)
+            except Exception as exc:
+                print(f"[watcher] registry sync failed for {site_code}: {exc}")
+        return due
+
+    def _loop(self) -> None:
+        try:
+            self._watch_until_stopped()
+        finally:
+            if self._stop.is_set():
+                self._close_backend()
+
+    def _watch_until_stopped(self) -> None:
+        poll_interval = WATCH_SAFETY_POLL_SECONDS if isinstance(self.backend, InotifyBackend) else WATCH_POLL_SECONDS
+        next_poll = time.monotonic() + poll_interval
+        next_rescan = time.monotonic() + WATCH_RESCAN_SECONDS
+        while not self._stop.is_set():
+            now = time.monotonic()
+            wake = min([next_poll, next_rescan, *self._pending.values()])
+            changed, rescan = self.backend.wait(min(max(wake - now, 0.05), 1.0))
+            now = time.monotonic()
+            for directory in changed:
+                self._signatures[directory] = excel_signature(directory)
+                self.mark(directory, now)
+            if rescan or now >= next_rescan:
+                self.rescan()
+                next_rescan = now + WATCH_RESCAN_SECONDS
+            if now >= next_poll:
+                self.poll(now)
+                next_poll = now + poll_interval
+            self.flush(now)
@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import asyncio
+import queue
+import sqlite3
+import threading
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Any, Callable
+
+from . import db
+from .db import begin_immediate
+
+WRITE_BATCH_MAX_JOBS = 64
+
+WriteJob = Callable[[sqlite3.Connection], Any]
+ConnectionKey = tuple[Path, Path | None]
+QueuedJob = tuple[WriteJob, Future, str | None]
+
+
+class WriteCoordinator:
+    def __init__(self, *, max_batch: int = WRITE_BATCH_MAX_JOBS) -> None:
+        self.max_batch = max_batch
+        self._queue: queue.SimpleQueue[QueuedJob | None] = queue.SimpleQueue()
+        self._thread: threading.Thread | None = None
+        self._start_lock = threading.Lock()
+        self._cons: dict[ConnectionKey, sqlite3.Connection] = {}
+        self.transactions = 0
+        self.jobs = 0
+        self.largest_batch = 0
+
+    def submit(self, job: WriteJob, site_code: str | None = None) -> Future:
+        future: Future = Future()
+        if threading.current_thread() is self._thread:
+            try:
+                future.set_result(job(self._connection(site_code)))
+            except BaseException as exc:
+                future.set_exception(exc)
+            return future
+        self._ensure_started()
+        self._queue.put((job, future, site_code))
+        return future
+
+    def run(self, job: WriteJob, site_code: str | None = None) -> Any:
+        return self.submit(job, site_code).result()
+
+    async def run_async(self, job: WriteJob, site_code: str | None = None) -> Any:
+        return await asyncio.wrap_future(self.submit(job, site_code))
+
+    def stop(self, timeout: float = 5.0) -> None:
+        with self._start_lock:
+            thread = self._thread
+            if thread is None:
+                return
+            self._queue.put(None)
+            thread.join(timeout)
+            self._thread = None
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "running": bool(self._thread and self._thread.is_alive()),
+            "transactions": self.transactions,
+            "jobs": self.jobs,
+            "largest_batch": self.largest_batch,
+        }
+
+    def _ensure_started(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        with self._start_lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._loop, name="parking-db-writer", daemon=True)
+            self._thread.start()
+
+    def _connection(self, site_code: str | None) -> sqlite3.Connection:
+        key = db.connection_key(site_code)
+        for stale in [other for other in self._cons if other[0] != key[0]]:
+            self._cons.pop(stale).close()
+        if key not in self._cons:
+            self._cons[key] = db.connect(site_code)
+        return self._cons[key]
+
+    def _loop(self) -> None:
+        running = True
+        while running:
+            item = self._queue.get()
+            if item is None:
+                break
+            batch = [item]
+            while len(batch) < self.max_batch:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    running = False
+                    break
+                batch.append(item)
+            groups: dict[ConnectionKey, list[QueuedJob]] = {}
+            for queued in batch:
+                try:
+                    key = db.connection_key(queued[2])
+                except ValueError as exc:
+                    queued[1].set_exception(exc)
+                    continue
+                groups.setdefault(key, []).append(queued)
+            for group in groups.values():
+                self._commit_batch(group)
+        for con in self._cons.values():
+            con.close()
+        self._cons.clear()
+
+    def _commit_batch(self, batch: list[QueuedJob]) -> None:
+        outcomes: list[tuple[Future, Any, BaseException | None]] = []
+        try:
+            con = self._connection(batch[0][2])
+            begin_immediate(con)
+        except Exception as exc:
+            for _, future, _ in batch:
+                future.set_exception(exc)
+            return
+        for job, future, _ in batch:
+            if not future.set_running_or_notify_cancel():
+                continue
+            result, error = self._run_job(con, job)
+            outcomes.append((future, result, error))
+        try:
+            con.commit()
+        except Exception as exc:
+            con.rollback()
+            for future, _, _ in outcomes:
+                future.set_exception(exc)
+            return
+        self.transactions += 1
+        self.jobs += len(outcomes)
+        self.largest_batch = max(self.largest_batch, len(outcomes))
+        for future, result, error in outcomes:
+            if error is None:
+                future.set_result(result)
+            else:
+                future.set_exception(error)
+
+    def _run_job(self, con: sqlite3.Connection, job: WriteJob) -> tuple[Any, BaseException | None]:
+        con.execute("SAVEPOINT write_job")
+        try:
+            result = job(con)
+        except BaseException as exc:
+            con.execute("ROLLBACK TO write_job")
+            con.execute("RELEASE write_job")
+            return None, exc
+        con.execute("RELEASE write_job")
+        return result, None
+
+
+write_coordinator = WriteCoordinator()
@@ -0,0 +1,44 @@
+import os
+import sys
+import unittest
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+TEST_DATABASE_URL = os.getenv("PARKING_TEST_DATABASE_URL", "").strip()
+
+
+def reset_between_databases(db, storage) -> None:
+    import psycopg
+
+    original_init_db = db.init_db
+    current = {"path": None}
+
+    def init_db() -> int:
+        if current["path"] != db.DB_PATH:
+            current["path"] = db.DB_PATH
+            storage.close_storages()
+            with psycopg.connect(TEST_DATABASE_URL, autocommit=True) as con:
+                con.execute("DROP SCHEMA public CASCADE")
+                con.execute("CREATE SCHEMA public")
+        return original_init_db()
+
+    db.init_db = init_db
+
+
+def main() -> int:
+    if not TEST_DATABASE_URL:
+        print("PARKING_TEST_DATABASE_URL is not set")
+        return 2
+    os.environ["PARKING_DATABASE_URL"] = TEST_DATABASE_URL
+    sys.path.insert(0, str(BACKEND_DIR))
+    from app import db, storage
+
+    reset_between_databases(db, storage)
+    pattern = sys.argv[1] if len(sys.argv) > 1 else "test_*.py"
+    suite = unittest.defaultTestLoader.discover(str(BACKEND_DIR / "tests"), pattern=pattern)
+    result = unittest.TextTestRunner(verbosity=2).run(suite)
+    return 0 if result.wasSuccessful() else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -127,6 +127,20 @@ class BillingTests(unittest.TestCase):
         self.assertEqual(row["plan"], "trial")
         self.assertEqual(row["status"], "trialing")
 
+    def test_capacity_check_creates_a_missing_billing_row(self):
+        main.BILLING_ENFORCEMENT_ENABLED = True
+        with db.connect() as con:
+            con.execute("DELETE FROM site_billing WHERE site_code = 'APT1100'")
+            con.commit()
+
+        response = self.client.post("/api/enforcement/submit", data={"plate": "12가3456"})
+
+        self.assertEqual(response.status_code, 200)
+        with db.connect() as con:
+            row = con.execute("SELECT plan, status, trial_ends_at FROM site_billing WHERE site_code = 'APT1100'").fetchone()
+        self.assertEqual((row["plan"], row["status"]), ("trial", "trialing"))
+        self.assertIsNotNone(row["trial_ends_at"])
+
     def test_billing_enforcement_can_block_user_over_limit(self):
         main.BILLING_ENFORCEMENT_ENABLED = True
         response = self.client.post(
@@ -137,6 +151,75 @@ class BillingTests(unittest.TestCase):
         self.assertEqual(response.status_code, 402)
         self.assertIn("요금제", response.json()["detail"])
 
+    def test_usage_counters_follow_inserts_and_deletes(self):
+        with db.connect() as con:
+            con.executemany(
+                """
+                INSERT INTO enforcement_events(site_code, plate, verdict, verdict_message)
+                VALUES (?, ?, ?, ?)
+                """,
+                [("APT1100", "12가3456", "OK", "정상"), ("APT1100", "34나5678", "UNREGISTERED", "미등록")],
+            )
+            con.execute(
+                """
+                INSERT INTO enforcement_events(site_code, plate, verdict, verdict_message, created_at)
+                VALUES ('APT1100', '56다7890', 'OK', '정상', '2020-01-05 10:00:00')
+                """
+            )
+            con.execute("DELETE FROM enforcement_events WHERE plate = '34나5678'")
+            con.commit()
+
+        usage = self.client.get("/api/billing/status").json()["usage"]
+        self.assertEqual(usage["monthly_records"], 1)
+        self.assertEqual(usage["users"], 3)
+
+        with db.connect() as con:
+            counters = {
+                (row["period"], row["metric"]): row["value"]
+                for row in con.execute("SELECT period, metric, value FROM site_usage_counters WHERE site_code = 'APT1100'")
+            }
+            db.rebuild_usage_counters(con, "APT1100")
+            rebuilt = {
+                (row["period"], row["metric"]): row["value"]
+                for row in con.execute("SELECT period, metric, value FROM site_usage_counters WHERE site_code = 'APT1100' AND value > 0")
+            }
+        self.assertEqual(counters[("2020-01", "monthly_records")], 1)
+        self.assertEqual({key: value for key, value in counters.items() if value > 0}, rebuilt)
+
+    def test_billing_enforcement_blocks_records_over_monthly_limit(self):
+        main.BILLING_ENFORCEMENT_ENABLED = True
+        with db.connect() as con:
+            con.execute(
+                """
+                INSERT INTO site_usage_counters(site_code, period, metric, value)
+                VALUES ('APT1100', strftime('%Y-%m', 'now'), 'monthly_records', 1000)
+                """
+            )
+            con.commit()
+
+        response = self.client.post("/api/enforcement/submit", data={"plate": "12가3456"})
+
+        self.assertEqual(response.status_code, 402)
+
+    def test_batch_fails_only_events_over_monthly_limit(self):
+        main.BILLING_ENFORCEMENT_ENABLED = True
+        with db.connect() as con:
+            con.execute(
+                """
+                INSERT INTO site_usage_counters(site_code, period, metric, value)
+                VALUES ('APT1100', strftime('%Y-%m', 'now'), 'monthly_records', 998)
+                """
+            )
+            con.commit()
+        events = [{"client_event_id": f"evt-limit-000{index}", "plate": "12가3456"} for index in range(3)]
+
+        response = self.client.post("/api/enforcement/batch", data={"events": json.dumps(events)})
+
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual((body["inserted"], body["errors"]), (2, 1))
+        self.assertIn("한도", body["results"][2]["error"])
+
     def test_google_play_status_exposes_product_ids(self):
         main.BILLING_PROVIDER = "google_play"
         response = self.client.get("/api/billing/status")
@@ -1,3 +1,4 @@
+import io
 import tempfile
 import unittest
 from pathlib import Path
@@ -236,6 +237,7 @@ class CctvRequestTests(unittest.TestCase):
                 VALUES ('APT1100', 'viewer', '/uploads/old.jpg', '103동', '2026-04-25T12:30', '기존 요청')
                 """
             )
+            con.execute("PRAGMA user_version = 0")
             con.commit()
 
         db.init_db()
@@ -248,5 +250,89 @@ class CctvRequestTests(unittest.TestCase):
         self.assertNotIn("search_time", columns)
 
 
+    def test_photo_upload_is_reencoded_deduped_and_thumbnailed(self):
+        from PIL import Image
+
+        buffer = io.BytesIO()
+        Image.new("RGB", (3000, 2000), (40, 90, 160)).save(buffer, format="PNG")
+        payload = buffer.getvalue()
+        client = self.login("cleaner", "cleaner1234")
+        bodies = []
+        for _ in range(2):
+            response = client.post(
+                "/api/cctv/requests",
+                data={
+                    "location": "지하 2층",
+                    "search_start_time": "2026-04-25T12:20",
+                    "search_end_time": "2026-04-25T12:40",
+                    "content": "차량 확인",
+                },
+                files={"photo": ("large.png", payload, "image/png")},
+            )
+            self.assertEqual(response.status_code, 200)
+            bodies.append(response.json())
+
+        self.assertEqual(bodies[0]["photo_path"], bodies[1]["photo_path"])
+        self.assertNotEqual(bodies[0]["photo_thumb_url"], bodies[0]["photo_path"])
+        photo_dir = main.site_upload_dir("APT1100") / "photos"
+        stored = sorted(path.name for path in photo_dir.iterdir())
+        self.assertEqual(len(stored), 2)
+        photo_file = photo_dir / bodies[0]["photo_path"].rsplit("/", 1)[1]
+        thumb_file = photo_dir / bodies[0]["photo_thumb_url"].rsplit("/", 1)[1]
+        with Image.open(photo_file) as image:
+            self.assertLessEqual(max(image.size), 1600)
+        with Image.open(thumb_file) as image:
+            self.assertLessEqual(max(image.size), 320)
+
+        listing = client.get("/api/cctv/requests").json()
+        self.assertEqual({row["photo_thumb_url"] for row in listing}, {bodies[0]["photo_thumb_url"]})
+
+    def test_reencoded_evidence_photo_keeps_exif(self):
+        from PIL import Image
+
+        exif = Image.Exif()
+        exif[0x010F] = "ParkingCam"
+        exif[0x0132] = "2026:04:25 12:30:00"
+        exif[0x0112] = 6
+        buffer = io.BytesIO()
+        Image.new("RGB", (4000, 3000), (40, 90, 160)).save(buffer, format="JPEG", exif=exif.tobytes())
+        client = self.login("cleaner", "cleaner1234")
+        response = client.post(
+            "/api/cctv/requests",
+            data={
+                "location": "지하 2층",
+                "search_start_time": "2026-04-25T12:20",
+                "search_end_time": "2026-04-25T12:40",
+                "content": "차량 확인",
+            },
+            files={"photo": ("evidence.jpg", buffer.getvalue(), "image/jpeg")},
+        )
+        self.assertEqual(response.status_code, 200)
+
+        photo_dir = main.site_upload_dir("APT1100") / "photos"
+        self.assertEqual([path.name for path in photo_dir.iterdir() if path.name.endswith(".tmp")], [])
+        with Image.open(photo_dir / response.json()["photo_path"].rsplit("/", 1)[1]) as image:
+            self.assertEqual(image.size, (1200, 1600))
+            stored = image.getexif()
+        self.assertEqual(stored[0x010F], "ParkingCam")
+        self.assertEqual(stored[0x0132], "2026:04:25 12:30:00")
+        self.assertNotIn(0x0112, stored)
+
+
+    def test_request_changes_are_published_to_live_stream(self):
+        before = main.live_events.publish("APT1100", "test.marker", {}).id
+        client = self.login("cleaner", "cleaner1234")
+        request_id = self.create_request(client).json()["id"]
+        admin = self.login("admin", "admin1234")
+        self.assertEqual(admin.delete(f"/api/cctv/requests/{request_id}").status_code, 200)
+
+        events = main.live_events.replay("APT1100", before)
+        self.assertEqual([event.type for event in events], ["cctv.created", "cctv.deleted"])
+        self.assertEqual(events[0].data["id"], request_id)
+        self.assertNotIn("content", events[0].data)
+        self.assertTrue(events[0].encode().startswith(f"id: {events[0].id}\nevent: cctv.created\n"))
+        self.assertEqual(main.live_events.replay("APT9999", before), [])
+
+
 if __name__ == "__main__":
     unittest.main()
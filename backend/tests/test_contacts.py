@@ -1,3 +1,5 @@
+import subprocess
+import sys
 import tempfile
 import unittest
 from pathlib import Path
@@ -98,5 +100,38 @@ class ContactManagementTests(unittest.TestCase):
         self.assertEqual(response.status_code, 400)
 
 
+    def test_contacts_and_settings_support_conditional_get(self):
+        first = self.admin.get("/api/contacts")
+        self.assertEqual(first.status_code, 200)
+        etag = first.headers["etag"]
+        self.assertEqual(first.headers["cache-control"], "private, no-cache")
+        self.assertEqual(self.admin.get("/api/contacts", headers={"If-None-Match": etag}).status_code, 304)
+
+        settings = self.admin.get("/api/site/settings")
+        self.assertEqual(
+            self.admin.get("/api/site/settings", headers={"If-None-Match": settings.headers["etag"]}).status_code,
+            304,
+        )
+
+        created = self.admin.post("/api/contacts", json={"category": "public", "name": "관리사무소", "phone": "051-000-0000"})
+        self.assertEqual(created.status_code, 200)
+        changed = self.admin.get("/api/contacts", headers={"If-None-Match": etag})
+        self.assertEqual(changed.status_code, 200)
+        self.assertEqual([row["name"] for row in changed.json()], ["관리사무소"])
+        self.assertNotEqual(changed.headers["etag"], etag)
+        self.assertEqual(
+            self.admin.get("/api/site/settings", headers={"If-None-Match": settings.headers["etag"]}).status_code,
+            304,
+        )
+
+    def test_etags_are_stable_across_processes(self):
+        probe = "import app.main as m; print(m.ETAG_SALT)"
+        salts = {
+            subprocess.run([sys.executable, "-c", probe], cwd=Path(__file__).resolve().parents[1], capture_output=True, text=True, check=True).stdout.strip()
+            for _ in range(2)
+        }
+        self.assertEqual(salts, {main.ETAG_SALT})
+        self.assertEqual(main.ETAG_SALT, f"{main.APP_VERSION}-{db.SCHEMA_VERSION}")
+
 if __name__ == "__main__":
     unittest.main()
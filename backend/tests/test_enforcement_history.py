@@ -1,5 +1,7 @@
+import json
 import tempfile
 import unittest
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
 from fastapi.testclient import TestClient
@@ -14,11 +16,14 @@ class EnforcementHistoryTests(unittest.TestCase):
         self.original_seed_demo = db.SEED_DEMO
         self.original_app_ready = main._app_ready
         self.original_auto_sync = main.auto_sync_registry
+        self.original_upload_dir = main.UPLOAD_DIR
+        self.original_stats_offset = main.STATS_UTC_OFFSET
 
         db.DB_PATH = Path(self.temp_dir.name) / "parking-test.db"
         db.SEED_DEMO = False
         main._app_ready = False
         main.auto_sync_registry = lambda: None
+        main.STATS_UTC_OFFSET = timedelta(0)
 
         db.init_db()
         db.seed_users()
@@ -46,6 +51,7 @@ class EnforcementHistoryTests(unittest.TestCase):
         self.assertEqual(login.status_code, 302)
 
     def tearDown(self):
+        main.STATS_UTC_OFFSET = self.original_stats_offset
         main.auto_sync_registry = self.original_auto_sync
         main._app_ready = self.original_app_ready
         db.SEED_DEMO = self.original_seed_demo
@@ -79,6 +85,144 @@ class EnforcementHistoryTests(unittest.TestCase):
         self.assertEqual([row["plate"] for row in verdict.json()["items"]], ["77하9999"])
         self.assertEqual([row["plate"] for row in date_range.json()["items"]], ["34나5678"])
 
+    def test_stats_are_served_from_rollups(self):
+        params = {"date_from": "2026-04-01", "date_to": "2026-04-30"}
+        response = self.client.get("/api/enforcement/stats", params=params)
+
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual(body["total"], 3)
+        self.assertEqual(body["by_verdict"], {"OK": 1, "UNREGISTERED": 1, "BLOCKED": 1})
+        self.assertEqual([item["day"] for item in body["daily"]], ["2026-04-20", "2026-04-21", "2026-04-22"])
+        self.assertIn({"weekday": 2, "hour": 9, "count": 1}, body["heatmap"])
+
+        event_id = self.client.get("/api/enforcement/history", params={"verdict": "BLOCKED"}).json()["items"][0]["id"]
+        updated = self.client.patch(f"/api/enforcement/events/{event_id}", json={"location": "정문"})
+        self.assertEqual(updated.status_code, 200)
+        first_id = self.client.get("/api/enforcement/history", params={"q": "정상 확인"}).json()["items"][0]["id"]
+        self.assertEqual(self.client.delete(f"/api/enforcement/events/{first_id}").status_code, 200)
+
+        body = self.client.get("/api/enforcement/stats", params=params).json()
+        self.assertEqual(body["total"], 2)
+        self.assertEqual(body["locations"][0], {"location": "정문", "count": 1})
+        self.assertNotIn("OK", body["by_verdict"])
+
+        with db.connect() as con:
+            live = con.execute("SELECT * FROM enforcement_rollups WHERE events_count > 0 ORDER BY day, hour, verdict").fetchall()
+            db.rebuild_enforcement_rollups(con, "APT1100")
+            rebuilt = con.execute("SELECT * FROM enforcement_rollups ORDER BY day, hour, verdict").fetchall()
+        self.assertEqual([tuple(row) for row in live], [tuple(row) for row in rebuilt])
+
+    def test_batch_validates_fields_per_event(self):
+        captured_at = (datetime.now(timezone.utc) - timedelta(hours=1)).isoformat()
+        events = [
+            {"client_event_id": "evt-field-0001", "plate": "12가3456", "inspector": 7, "captured_at": captured_at},
+            {"client_event_id": "evt-field-0002", "plate": "12가3456", "memo": {"text": "소화전"}},
+            {"client_event_id": "evt-field-0003", "plate": "12가3456", "captured_at": captured_at[:19]},
+        ]
+
+        body = self.client.post("/api/enforcement/batch", data={"events": json.dumps(events, ensure_ascii=False)}).json()
+
+        self.assertEqual((body["inserted"], body["errors"]), (1, 2))
+        self.assertIn("메모", body["results"][1]["error"])
+        self.assertIn("시간대", body["results"][2]["error"])
+        with db.connect() as con:
+            row = con.execute("SELECT inspector FROM enforcement_events WHERE client_event_id = 'evt-field-0001'").fetchone()
+        self.assertEqual(row["inspector"], "7")
+
+    def test_stats_buckets_by_site_local_day(self):
+        main.STATS_UTC_OFFSET = timedelta(hours=9)
+        with db.connect() as con:
+            con.executemany(
+                "INSERT INTO enforcement_events(site_code, plate, verdict, verdict_message, created_at) VALUES (?, ?, ?, ?, ?)",
+                [
+                    ("APT1100", "56다7890", "UNREGISTERED", "미등록 차량", "2026-03-31 16:00:00"),
+                    ("APT1100", "78라1234", "UNREGISTERED", "미등록 차량", "2026-04-30 20:00:00"),
+                ],
+            )
+            con.commit()
+
+        april = self.client.get("/api/enforcement/stats", params={"date_from": "2026-04-01", "date_to": "2026-04-30"}).json()
+        self.assertEqual(april["total"], 4)
+        self.assertEqual(april["daily"][0], {"day": "2026-04-01", "count": 1, "by_verdict": {"UNREGISTERED": 1}})
+        self.assertIn({"weekday": 2, "hour": 18, "count": 1}, april["heatmap"])
+        self.assertIn({"weekday": 3, "hour": 1, "count": 1}, april["heatmap"])
+
+        may = self.client.get("/api/enforcement/stats", params={"date_from": "2026-05-01", "date_to": "2026-05-01"}).json()
+        self.assertEqual(may["total"], 1)
+        self.assertEqual(may["heatmap"], [{"weekday": 5, "hour": 5, "count": 1}])
+
+    def test_stats_rejects_invalid_range(self):
+        response = self.client.get("/api/enforcement/stats", params={"date_from": "2026-05-01", "date_to": "2026-04-01"})
+        self.assertEqual(response.status_code, 400)
+
+
+    def test_batch_submit_is_idempotent_and_checks_capture_time(self):
+        main.UPLOAD_DIR = Path(self.temp_dir.name) / "uploads"
+        self.addCleanup(setattr, main, "UPLOAD_DIR", self.original_upload_dir)
+        yesterday = (datetime.now(timezone.utc) - timedelta(days=1)).date().isoformat()
+        captured_at = (datetime.now(timezone.utc) - timedelta(days=2)).isoformat()
+        with db.connect() as con:
+            con.execute(
+                "INSERT INTO vehicles(site_code, plate, unit, owner_name, status, valid_to) VALUES (?, ?, ?, ?, ?, ?)",
+                ("APT1100", "55라5555", "105-101", "박만료", "active", yesterday),
+            )
+            con.commit()
+        events = [
+            {"client_event_id": "evt-batch-0001", "plate": "55라5555", "location": "지하 2층", "captured_at": captured_at},
+            {"client_event_id": "evt-batch-0002", "plate": "34나5678", "memo": "소화전 앞", "lat": "37.5", "lng": "127.0"},
+            {"client_event_id": "evt-batch-0003", "plate": ""},
+        ]
+        payload = {"events": json.dumps(events, ensure_ascii=False)}
+        files = {"photo_evt-batch-0002": ("plate.jpg", b"queued-photo", "image/jpeg")}
+
+        first = self.client.post("/api/enforcement/batch", data=payload, files=files)
+        self.assertEqual(first.status_code, 200)
+        body = first.json()
+        self.assertEqual((body["inserted"], body["duplicates"], body["errors"]), (2, 0, 1))
+        self.assertEqual(body["results"][0]["verdict"], "OK")
+        self.assertEqual(body["results"][1]["verdict"], "UNREGISTERED")
+        self.assertIn("error", body["results"][2])
+
+        retry = self.client.post("/api/enforcement/batch", data=payload, files=files).json()
+        self.assertEqual((retry["inserted"], retry["duplicates"]), (0, 2))
+        self.assertEqual(retry["results"][0]["id"], body["results"][0]["id"])
+
+        with db.connect() as con:
+            rows = con.execute(
+                "SELECT plate, created_at, photo_path FROM enforcement_events WHERE client_event_id IS NOT NULL ORDER BY id"
+            ).fetchall()
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[0]["created_at"][:10], captured_at[:10])
+        self.assertIn("/uploads/", rows[1]["photo_path"])
+
+    def test_batch_replay_racing_another_upload_reports_duplicate(self):
+        original_build_check_response = main.build_check_response
+
+        def build_while_another_replay_commits(site_code, plate, today=None):
+            check = original_build_check_response(site_code, plate, today)
+            with db.connect() as con:
+                con.execute(
+                    "INSERT INTO enforcement_events(site_code, plate, verdict, verdict_message, client_event_id) VALUES (?, ?, ?, ?, ?)",
+                    (site_code, check.plate, check.verdict, check.message, "evt-race-0001"),
+                )
+                con.commit()
+            return check
+
+        main.build_check_response = build_while_another_replay_commits
+        try:
+            response = self.client.post(
+                "/api/enforcement/batch",
+                data={"events": json.dumps([{"client_event_id": "evt-race-0001", "plate": "34나5678"}])},
+            )
+        finally:
+            main.build_check_response = original_build_check_response
+
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual((body["inserted"], body["duplicates"]), (0, 1))
+        self.assertTrue(body["results"][0]["duplicate"])
+
 
 if __name__ == "__main__":
     unittest.main()
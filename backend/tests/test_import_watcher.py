@@ -0,0 +1,103 @@
+import sys
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+from app.watcher import ImportDirectoryWatcher, InotifyBackend
+
+
+class ImportDirectoryWatcherTests(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.temp_dir.name).resolve()
+        (self.root / "apt2200").mkdir()
+        self.dirs = {"APT1100": self.root, "APT2200": self.root / "apt2200"}
+        self.synced = []
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_poll_debounces_changes_per_site_and_ignores_lock_files(self):
+        watcher = ImportDirectoryWatcher(lambda: self.dirs, self.synced.append, mode="poll", debounce_seconds=2)
+        watcher.rescan(initial=True)
+
+        (self.root / "apt2200" / "~$vehicles.xlsx").write_bytes(b"lock")
+        (self.root / "notes.txt").write_text("memo", encoding="utf-8")
+        watcher.poll(now=100)
+        self.assertEqual(watcher.flush(now=110), [])
+
+        (self.root / "apt2200" / "vehicles.xlsx").write_bytes(b"first")
+        watcher.poll(now=100)
+        (self.root / "apt2200" / "vehicles.xlsx").write_bytes(b"second save")
+        watcher.poll(now=101)
+        self.assertEqual(watcher.flush(now=102.5), [])
+        self.assertEqual(watcher.flush(now=103), ["APT2200"])
+        self.assertEqual(self.synced, ["APT2200"])
+
+        watcher.poll(now=104)
+        self.assertEqual(watcher.flush(now=110), [])
+
+    def test_new_site_directory_with_files_is_synced_after_rescan(self):
+        watcher = ImportDirectoryWatcher(lambda: self.dirs, self.synced.append, mode="poll", debounce_seconds=0)
+        watcher.rescan(initial=True)
+        late = self.root / "apt3300"
+        late.mkdir()
+        (late / "vehicles.xlsm").write_bytes(b"data")
+        self.dirs["APT3300"] = late
+
+        watcher.rescan()
+        watcher.flush()
+
+        self.assertEqual(self.synced, ["APT3300"])
+
+    @unittest.skipUnless(sys.platform.startswith("linux"), "inotify is Linux only")
+    def test_inotify_backend_triggers_sync_within_debounce(self):
+        done = threading.Event()
+
+        def on_change(site_code):
+            self.synced.append(site_code)
+            done.set()
+
+        watcher = ImportDirectoryWatcher(lambda: self.dirs, on_change, mode="inotify", debounce_seconds=0.2)
+        watcher.start()
+        try:
+            self.assertIsInstance(watcher.backend, InotifyBackend)
+            (self.root / "vehicles.xlsx").write_bytes(b"data")
+            self.assertTrue(done.wait(5))
+        finally:
+            watcher.stop()
+
+        self.assertEqual(self.synced, ["APT1100"])
+
+    def test_stop_keeps_the_backend_open_until_a_running_sync_returns(self):
+        syncing = threading.Event()
+        release = threading.Event()
+
+        def slow_sync(site_code):
+            syncing.set()
+            release.wait(5)
+
+        watcher = ImportDirectoryWatcher(lambda: self.dirs, slow_sync, mode="poll", debounce_seconds=0)
+        watcher.start()
+        backend = watcher.backend
+        closed = []
+        backend.close = lambda: closed.append(True)
+        thread = watcher._thread
+        try:
+            watcher.mark(self.root)
+            self.assertTrue(syncing.wait(5))
+            watcher.stop(timeout=0.05)
+            self.assertTrue(thread.is_alive())
+            self.assertEqual(closed, [])
+        finally:
+            release.set()
+            thread.join(5)
+
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(closed, [True])
+        self.assertIsNone(watcher.backend)
+
+
+if __name__ == "__main__":
+    unittest.main()
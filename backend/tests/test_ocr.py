@@ -0,0 +1,40 @@
+import io
+import unittest
+
+from PIL import Image
+
+from app import ocr
+
+
+def encoded_image(size, image_format, orientation=None):
+    buffer = io.BytesIO()
+    image = Image.new("RGB", size, (200, 200, 200))
+    if orientation:
+        exif = Image.Exif()
+        exif[0x0112] = orientation
+        image.save(buffer, image_format, exif=exif)
+    else:
+        image.save(buffer, image_format)
+    return Image.open(io.BytesIO(buffer.getvalue()))
+
+
+class PrepareBaseImageTests(unittest.TestCase):
+    def test_large_jpeg_is_decoded_at_reduced_size(self):
+        image = encoded_image((6000, 4000), "JPEG")
+        prepared = ocr._prepare_base_image(image)
+
+        self.assertEqual(image.size, (3000, 2000))
+        self.assertEqual(prepared.size, (2200, 1466))
+        self.assertEqual(prepared.mode, "RGB")
+
+    def test_exif_rotation_is_applied_after_draft(self):
+        prepared = ocr._prepare_base_image(encoded_image((4800, 3200), "JPEG", orientation=6))
+        self.assertEqual(prepared.size, (1466, 2200))
+
+    def test_small_images_are_upscaled_to_the_minimum_edge(self):
+        prepared = ocr._prepare_base_image(encoded_image((600, 300), "PNG"))
+        self.assertEqual(prepared.size, (1800, 900))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,13 +1,16 @@
 import io
+import json
 import tempfile
 import unittest
+import zipfile
 from pathlib import Path
+from unittest import mock
 
 from fastapi.testclient import TestClient
 
-from app import db, main
+from app import db, main, ocr_learning, plate_index
 from app.ocr import OCRScanResult
-from app.ocr_learning import get_learning_candidates, normalize_ocr_key, parse_candidates_json, record_ocr_feedback
+from app.ocr_learning import get_confusion_repairs, get_learning_candidates, insert_ocr_feedback, normalize_ocr_key, parse_candidates_json, record_ocr_feedback
 
 
 class OCRLearningTests(unittest.TestCase):
@@ -81,6 +84,66 @@ class OCRLearningTests(unittest.TestCase):
         self.assertEqual(best_plate, "12가3456")
         self.assertEqual(ordered[0], "12가3456")
 
+    @unittest.skipIf(db.storage_backend() == "postgres", "uses the SQLite trace callback")
+    def test_correction_model_follows_feedback_and_survives_restart(self):
+        record_ocr_feedback("APT1100", "I2가34S6", "12가3458", "12가3456", ["12가3458"])
+        with db.connect() as con:
+            insert_ocr_feedback(con, "APT1100", "I2가34S6", "12가3458", "12가3456", ["12가3458"])
+            con.commit()
+
+        _, boosts = get_learning_candidates("APT1100", "I2가34S6", ["12가3458"])
+        self.assertEqual(boosts["12가3456"], 5.0 + 5.0 + 40.0 + 6.0 + 6.0)
+        self.assertTrue(ocr_learning.ocr_model_path("APT1100").exists())
+
+        ocr_learning._models.clear()
+        statements: list[str] = []
+        original_connect = ocr_learning.connect
+
+        def traced_connect(site_code=None):
+            con = original_connect(site_code)
+            con.set_trace_callback(statements.append)
+            return con
+
+        ocr_learning.connect = traced_connect
+        try:
+            self.assertEqual(get_learning_candidates("APT1100", "I2가34S6", ["12가3458"])[1], boosts)
+        finally:
+            ocr_learning.connect = original_connect
+        self.assertFalse([sql for sql in statements if "ocr_feedback" in sql])
+
+        with db.connect() as con:
+            con.execute("DELETE FROM ocr_feedback WHERE id = (SELECT MAX(id) FROM ocr_feedback)")
+            con.commit()
+        _, boosts = get_learning_candidates("APT1100", "I2가34S6", ["12가3458"])
+        self.assertEqual(boosts["12가3456"], 5.0 + 40.0 + 6.0)
+
+    def test_confusion_model_generalizes_character_corrections(self):
+        record_ocr_feedback("APT1100", "77비7777", "77비7777", "77가7777", [])
+        record_ocr_feedback("APT1100", "88가8888", "88가8888", "88가8888", [])
+        self.assertEqual(get_confusion_repairs("APT1100", "12비3458", []), [])
+
+        self.assertEqual(main.run_ocr_confusion_job(), {"sites": 1, "confusions": 1})
+        self.assertEqual(ocr_learning.site_confusions("APT1100"), {"비": {"가": 0.5}})
+
+        self.assertEqual(get_confusion_repairs("APT1100", "번호판 12비3458", []), [("12가3458", 0.5 * ocr_learning.CONFUSION_BOOST)])
+        self.assertEqual(get_learning_candidates("APT1100", "번호판 12비3458", [])[0], [])
+
+        ocr_learning._confusions.clear()
+        best_plate, _ = main.choose_best_scan_candidate("APT1100", "I2비3458", None, [])
+        self.assertEqual(best_plate, "12가3458")
+
+    def test_confusion_repair_never_replaces_a_valid_read(self):
+        record_ocr_feedback("APT1100", "35머5678", "35머5678", "35버5678", [])
+        for index in range(9):
+            record_ocr_feedback("APT1100", f"5{index}머1234", f"5{index}머1234", f"5{index}머1234", [])
+        main.run_ocr_confusion_job()
+        self.assertGreaterEqual(ocr_learning.site_confusions("APT1100")["머"]["버"], 0.05)
+
+        best_plate, ordered = main.choose_best_scan_candidate("APT1100", "34머5678", None, ["34머5678"])
+
+        self.assertEqual(best_plate, "34머5678")
+        self.assertEqual(ordered, ["34머5678", "34버5678"])
+
     def test_scan_endpoint_uses_client_ocr_without_tesseract(self):
         original_scan_plate_image = main.scan_plate_image
 
@@ -129,6 +192,101 @@ class OCRLearningTests(unittest.TestCase):
         self.assertEqual(body["provider"], "tesseract")
         self.assertEqual(body["best_plate"], "12가3456")
 
+    def test_batch_endpoint_streams_results_for_photos_and_zip(self):
+        original_scan_plate_image = main.scan_plate_image
+        readings = {b"first": "12가3456", b"second": "13가3458", b"third": "99하9999", b"blank": ""}
+
+        def fake_scan(image_bytes):
+            text = readings[image_bytes]
+            return OCRScanResult(provider="tesseract", raw_text=text, candidates=[text] if text else [])
+
+        archive = io.BytesIO()
+        with zipfile.ZipFile(archive, "w") as bundle:
+            bundle.writestr("patrol/third.jpg", b"third")
+            bundle.writestr("patrol/blank.png", b"blank")
+            bundle.writestr("patrol/notes.txt", b"memo")
+        main.scan_plate_image = fake_scan
+        try:
+            response = self.client.post(
+                "/api/ocr/batch",
+                files=[
+                    ("photos", ("first.jpg", io.BytesIO(b"first"), "image/jpeg")),
+                    ("photos", ("second.jpg", io.BytesIO(b"second"), "image/jpeg")),
+                    ("archive", ("patrol.zip", archive.getvalue(), "application/zip")),
+                ],
+            )
+        finally:
+            main.scan_plate_image = original_scan_plate_image
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers["content-type"], "application/x-ndjson")
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        self.assertEqual(lines[0]["type"], "start")
+        self.assertEqual(lines[0]["total"], 4)
+        self.assertEqual(lines[0]["skipped"][0]["filename"], "patrol/notes.txt")
+        results = {item["filename"]: item for item in lines[1:-1]}
+        self.assertEqual(results["first.jpg"]["match"]["verdict"], "OK")
+        self.assertEqual(results["second.jpg"]["best_plate"], "13가3458")
+        self.assertEqual(results["second.jpg"]["candidates"], ["13가3458", "12가3458", "12가3456"])
+        self.assertEqual(results["second.jpg"]["match"]["verdict"], "UNREGISTERED")
+        self.assertEqual(results["patrol/third.jpg"]["match"]["verdict"], "UNREGISTERED")
+        self.assertIsNone(results["patrol/blank.png"]["best_plate"])
+        self.assertEqual(lines[-1]["type"], "done")
+        self.assertEqual(lines[-1]["verdicts"], {"OK": 1, "UNREGISTERED": 2, "UNREADABLE": 1})
+
+    def test_batch_endpoint_reports_failed_images_and_loads_models_once(self):
+        generation_lookups: list[tuple[str, ...]] = []
+
+        def fake_scan(image_bytes):
+            if image_bytes == b"boom":
+                raise RuntimeError("decoder crashed")
+            return OCRScanResult(provider="tesseract", raw_text="13가3458", candidates=["13가3458"])
+
+        def counted_generations(con, site_code, scopes):
+            generation_lookups.append(tuple(scopes))
+            return original_generations(con, site_code, scopes)
+
+        original_generations = ocr_learning.site_generations
+        with mock.patch.object(main, "scan_plate_image", fake_scan), \
+                mock.patch.object(ocr_learning, "site_generations", counted_generations), \
+                mock.patch.object(plate_index, "site_generations", counted_generations):
+            response = self.client.post(
+                "/api/ocr/batch",
+                files=[
+                    ("photos", ("first.jpg", io.BytesIO(b"first"), "image/jpeg")),
+                    ("photos", ("boom.jpg", io.BytesIO(b"boom"), "image/jpeg")),
+                    ("photos", ("third.jpg", io.BytesIO(b"third"), "image/jpeg")),
+                ],
+            )
+
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        results = {item["filename"]: item for item in lines[1:-1]}
+        self.assertIn("decoder crashed", results["boom.jpg"]["error"])
+        self.assertEqual(results["boom.jpg"]["index"], 1)
+        self.assertEqual(results["third.jpg"]["best_plate"], "13가3458")
+        self.assertEqual(lines[-1]["type"], "done")
+        self.assertEqual(lines[-1]["verdicts"], {"UNREGISTERED": 2, "UNREADABLE": 1})
+        self.assertEqual(sorted(generation_lookups), [("ocr",), ("registry",)])
+
+    def test_batch_endpoint_checks_upload_sizes_before_reading(self):
+        archive = io.BytesIO()
+        with zipfile.ZipFile(archive, "w") as bundle:
+            bundle.writestr("patrol/first.jpg", b"first" * 64)
+        original_limits = (main.OCR_BATCH_MAX_BYTES, main.MAX_PHOTO_UPLOAD_BYTES)
+        main.OCR_BATCH_MAX_BYTES, main.MAX_PHOTO_UPLOAD_BYTES = 128, 16
+        try:
+            oversized_archive = self.client.post("/api/ocr/batch", files=[("archive", ("patrol.zip", archive.getvalue(), "application/zip"))])
+            oversized_photo = self.client.post("/api/ocr/batch", files=[("photos", ("large.jpg", io.BytesIO(b"x" * 32), "image/jpeg"))])
+        finally:
+            main.OCR_BATCH_MAX_BYTES, main.MAX_PHOTO_UPLOAD_BYTES = original_limits
+
+        self.assertEqual(oversized_archive.status_code, 413)
+        self.assertEqual(oversized_photo.status_code, 400)
+
+    def test_batch_endpoint_rejects_empty_uploads(self):
+        response = self.client.post("/api/ocr/batch", files=[("photos", ("memo.txt", io.BytesIO(b"memo"), "text/plain"))])
+        self.assertEqual(response.status_code, 400)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,72 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from app import db, main
+from app.plate_index import PlateIndex, edit_distance, site_plate_index
+
+
+class PlateIndexTests(unittest.TestCase):
+    def test_nearest_returns_registered_plates_within_two_edits(self):
+        index = PlateIndex(["12가3456", "12가3458", "34나5678", "123다4567"])
+
+        self.assertEqual(index.nearest("12가3457"), [("12가3456", 1), ("12가3458", 1)])
+        self.assertEqual(index.nearest("23다4567"), [("123다4567", 1)])
+        self.assertEqual(index.nearest("34너5670"), [("34나5678", 2)])
+        self.assertEqual(index.nearest("34너5670", max_distance=1), [])
+        self.assertEqual(index.nearest("12가3456"), [("12가3458", 1)])
+        self.assertEqual(index.nearest("99러9999"), [])
+
+    def test_edit_distance_stops_past_the_limit(self):
+        self.assertEqual(edit_distance("12가3456", "12나3465", 2), 3)
+        self.assertEqual(edit_distance("12가3456", "123가3456", 2), 1)
+
+
+class FuzzyScanCandidateTests(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.original_db_path = db.DB_PATH
+        self.original_seed_demo = db.SEED_DEMO
+        self.original_auto_sync = main.auto_sync_registry
+        db.DB_PATH = Path(self.temp_dir.name) / "parking-test.db"
+        db.SEED_DEMO = False
+        main._app_ready = False
+        main.auto_sync_registry = lambda: None
+
+        db.init_db()
+        db.seed_users()
+        with db.connect() as con:
+            con.executemany(
+                "INSERT INTO vehicles(site_code, plate, unit, owner_name, status) VALUES ('APT1100', ?, ?, ?, 'active')",
+                [("12가3456", "101-1203", "홍길동"), ("56러7788", "102-803", "김영희")],
+            )
+            con.commit()
+
+    def tearDown(self):
+        main.auto_sync_registry = self.original_auto_sync
+        main._app_ready = False
+        db.SEED_DEMO = self.original_seed_demo
+        db.DB_PATH = self.original_db_path
+        self.temp_dir.cleanup()
+
+    def test_nearest_registered_plate_is_only_a_suggestion(self):
+        best_plate, ordered = main.choose_best_scan_candidate("APT1100", "12가3457", None, ["12가3457"])
+
+        self.assertEqual(best_plate, "12가3457")
+        self.assertEqual(ordered, ["12가3457", "12가3456"])
+        self.assertEqual(main.build_check_response("APT1100", best_plate).verdict, "UNREGISTERED")
+
+    def test_index_follows_registry_changes(self):
+        self.assertEqual(site_plate_index("APT1100").nearest("56러7789"), [("56러7788", 1)])
+        with db.connect() as con:
+            con.execute("UPDATE vehicles SET deleted_at = datetime('now') WHERE plate = '56러7788'")
+            con.execute("INSERT INTO vehicles(site_code, plate, status) VALUES ('APT1100', '56러7780', 'active')")
+            con.commit()
+
+        self.assertEqual(site_plate_index("APT1100").nearest("56러7789"), [("56러7780", 1)])
+        best_plate, ordered = main.choose_best_scan_candidate("APT1100", "99하9999", None, ["99하9999"])
+        self.assertEqual((best_plate, ordered), ("99하9999", ["99하9999"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,10 +1,12 @@
+import json
 import tempfile
 import unittest
+import zlib
 from pathlib import Path
 
 from fastapi.testclient import TestClient
 
-from app import db, main
+from app import backups, db, main
 
 
 class RegistryCheckTests(unittest.TestCase):
@@ -84,6 +86,209 @@ class RegistryCheckTests(unittest.TestCase):
         self.assertEqual(body[0]["plate"], "12가3456")
         self.assertEqual(body[0]["phone"], "010-1111-2222")
 
+    def test_check_includes_prior_violations_from_offense_summary(self):
+        with db.connect() as con:
+            con.executemany(
+                "INSERT INTO enforcement_events(site_code, plate, verdict, verdict_message, created_at) VALUES (?, ?, ?, ?, ?)",
+                [
+                    ("APT1100", "99너9999", "UNREGISTERED", "미등록 차량", "2026-04-01 09:00:00"),
+                    ("APT1100", "99너9999", "UNREGISTERED", "미등록 차량", "2026-04-03 09:00:00"),
+                    ("APT1100", "99너9999", "OK", "등록 차량", "2026-04-05 09:00:00"),
+                    ("APT1100", "12가3456", "OK", "등록 차량", "2026-04-02 09:00:00"),
+                ],
+            )
+            con.execute("UPDATE enforcement_events SET verdict = 'BLOCKED' WHERE id = 3")
+            con.execute("DELETE FROM enforcement_events WHERE id = 1")
+            con.commit()
+
+        body = self.client.get("/api/registry/check", params={"plate": "99너9999"}).json()
+        self.assertEqual(body["verdict"], "UNREGISTERED")
+        self.assertEqual(body["prior_events_count"], 2)
+        self.assertEqual(body["prior_violations"], 2)
+        self.assertEqual(body["prior_verdict_counts"], {"UNREGISTERED": 1, "BLOCKED": 1})
+        self.assertEqual(body["recent_event_ids"], [3, 2])
+        self.assertEqual(body["last_seen_at"], "2026-04-05 09:00:00")
+
+        with db.connect() as con:
+            con.execute(
+                "INSERT INTO enforcement_events(site_code, plate, verdict, verdict_message, created_at) VALUES ('APT1100', '99너9999', 'TEMP', '임시 등록 차량', '2026-04-06 09:00:00')"
+            )
+            con.commit()
+        body = self.client.get("/api/registry/check", params={"plate": "99너9999"}).json()
+        self.assertEqual(body["prior_events_count"], 3)
+        self.assertEqual(body["prior_violations"], 2)
+
+        body = self.client.get("/api/registry/check", params={"plate": "3456"}).json()
+        registered = {item["plate"]: item for item in body["matches"]}
+        self.assertEqual(registered["12가3456"]["prior_events_count"], 1)
+        self.assertEqual(registered["12가3456"]["prior_violations"], 0)
+        self.assertEqual(registered["77하3456"]["prior_events_count"], 0)
+
+
+    def test_snapshot_is_versioned_and_honors_if_none_match(self):
+        first = self.client.get("/api/registry/snapshot")
+        self.assertEqual(first.status_code, 200)
+        body = first.json()
+        self.assertEqual(first.headers["etag"], body["etag"])
+        self.assertEqual(body["fields"], ["plate", "status", "valid_from", "valid_to", "unit", "building", "unit_number"])
+        self.assertNotIn("010-1111-2222", first.text)
+        rows = [dict(zip(body["fields"], row)) for row in body["rows"]]
+        self.assertEqual([row["plate"] for row in rows], ["12가3456", "77하3456"])
+        self.assertEqual(rows[1]["status"], "temp")
+        self.assertEqual(body["suffixes"], {"3456": [0, 1]})
+
+        cached = self.client.get("/api/registry/snapshot", headers={"If-None-Match": body["etag"]})
+        self.assertEqual(cached.status_code, 304)
+
+        with db.connect() as con:
+            con.execute("UPDATE vehicles SET deleted_at = datetime('now') WHERE site_code = 'APT1100' AND plate = '77하3456'")
+            con.commit()
+
+        refreshed = self.client.get("/api/registry/snapshot", headers={"If-None-Match": body["etag"]})
+        self.assertEqual(refreshed.status_code, 200)
+        self.assertGreater(refreshed.json()["generation"], body["generation"])
+        self.assertEqual([row[0] for row in refreshed.json()["rows"]], ["12가3456"])
+        check = self.client.get("/api/registry/check", params={"plate": "77하3456"}).json()
+        self.assertEqual(check["verdict"], "UNREGISTERED")
+
+    def test_changes_return_upserts_and_tombstones_since_generation(self):
+        base = self.client.get("/api/registry/changes", params={"since": 0}).json()
+        self.assertEqual(base["mode"], "snapshot")
+        since = base["generation"]
+
+        with db.connect() as con:
+            con.execute("UPDATE vehicles SET status = 'blocked' WHERE site_code = 'APT1100' AND plate = '12가3456'")
+            con.execute("UPDATE vehicles SET plate = '88하3456' WHERE site_code = 'APT1100' AND plate = '77하3456'")
+            db.replace_site_vehicles(
+                con,
+                "APT1100",
+                [dict(row) for row in con.execute("SELECT * FROM vehicles WHERE site_code = 'APT1100'").fetchall()],
+            )
+            con.commit()
+
+        delta = self.client.get("/api/registry/changes", params={"since": since}).json()
+        self.assertEqual(delta["mode"], "delta")
+        self.assertNotIn("phone", delta["fields"])
+        upserts = {row[0]: dict(zip(delta["fields"], row)) for row in delta["upserts"]}
+        self.assertEqual(set(upserts), {"12가3456", "88하3456"})
+        self.assertEqual(upserts["12가3456"]["status"], "blocked")
+        self.assertEqual(delta["deletes"], ["77하3456"])
+
+        empty = self.client.get("/api/registry/changes", params={"since": delta["generation"]}).json()
+        self.assertEqual((empty["upserts"], empty["deletes"]), ([], []))
+
+        with db.connect() as con:
+            con.execute("UPDATE registry_changes SET changed_at = datetime('now', '-90 days') WHERE deleted = 1")
+            self.assertEqual(db.compact_registry_changes(con, "APT1100"), 1)
+            con.commit()
+        fallback = self.client.get("/api/registry/changes", params={"since": since}).json()
+        self.assertEqual(fallback["mode"], "snapshot")
+        self.assertEqual([row[0] for row in fallback["rows"]], ["12가3456", "88하3456"])
+
+
+    def test_backups_are_deduplicated_compressed_and_restore_exactly(self):
+        with db.connect() as con:
+            original = [dict(row) for row in con.execute(f"SELECT {', '.join(backups.BACKUP_COLUMNS)} FROM vehicles ORDER BY plate")]
+            legacy_json = json.dumps(original, ensure_ascii=False, default=str)
+            con.execute(
+                "INSERT INTO vehicle_backups(site_code, backup_name, vehicles_json, vehicles_count) VALUES ('APT1100', 'legacy', ?, 2)",
+                (legacy_json,),
+            )
+            con.commit()
+
+        first = self.client.post("/api/registry/backups").json()
+        second = self.client.post("/api/registry/backups").json()
+        with db.connect() as con:
+            hashes = {row["id"]: row["blob_hash"] for row in con.execute("SELECT id, blob_hash FROM vehicle_backups WHERE blob_hash IS NOT NULL")}
+            self.assertEqual(hashes[first["id"]], hashes[second["id"]])
+            self.assertEqual(backups.backup_store_stats()["blobs"], 1)
+            self.assertEqual(backups.compact_pending_backups(con), 1)
+            con.commit()
+            legacy = con.execute("SELECT * FROM vehicle_backups WHERE backup_name = 'legacy'").fetchone()
+            self.assertEqual(legacy["vehicles_json"], "")
+            self.assertEqual(json.dumps(backups.load_backup_rows(con, legacy), ensure_ascii=False, default=str), legacy_json)
+        if db.storage_backend() == "sqlite":
+            self.assertTrue(backups.backup_store_path().exists())
+
+        with db.connect() as con:
+            con.execute("UPDATE vehicles SET owner_name = '변경됨', phone = NULL WHERE plate = '12가3456'")
+            con.execute("DELETE FROM vehicles WHERE plate = '77하3456'")
+            con.commit()
+        restored = self.client.post(f"/api/registry/backups/{first['id']}/restore")
+        self.assertEqual(restored.status_code, 200)
+        with db.connect() as con:
+            current = [dict(row) for row in con.execute(f"SELECT {', '.join(backups.BACKUP_COLUMNS)} FROM vehicles ORDER BY plate")]
+        self.assertEqual(current, original)
+
+
+    def test_restore_stages_rows_and_snapshots_previous_state(self):
+        with db.connect() as con:
+            con.executemany(
+                "INSERT INTO vehicles(site_code, plate, unit, building, status) VALUES ('APT1100', ?, ?, ?, 'active')",
+                [(f"{index:02d}가{index:04d}", f"{100 + index}-0101", "0101") for index in range(2500)],
+            )
+            con.commit()
+            original = [dict(row) for row in con.execute(f"SELECT {', '.join(backups.BACKUP_COLUMNS)} FROM vehicles ORDER BY plate")]
+        backup_id = self.client.post("/api/registry/backups").json()["id"]
+        with db.connect() as con:
+            con.execute("DELETE FROM vehicles WHERE plate LIKE '1%'")
+            con.execute("UPDATE vehicles SET building = '0202' WHERE plate = '12가3456'")
+            con.execute("INSERT INTO vehicles(site_code, plate, status) VALUES ('APT1100', '00하0000', 'temp')")
+            con.commit()
+            changed_state = [dict(row) for row in con.execute(f"SELECT {', '.join(backups.BACKUP_COLUMNS)} FROM vehicles ORDER BY plate")]
+
+        marker = main.live_events.publish("APT1100", "test.marker", {}).id
+        body = self.client.post(f"/api/registry/backups/{backup_id}/restore").json()
+
+        self.assertEqual(body["vehicles_count"], len(original))
+        self.assertEqual(body["removed"], 1)
+        with db.connect() as con:
+            current = [dict(row) for row in con.execute(f"SELECT {', '.join(backups.BACKUP_COLUMNS)} FROM vehicles ORDER BY plate")]
+            self.assertEqual(current, original)
+            before = con.execute("SELECT * FROM vehicle_backups WHERE id = ?", (body["backup_before_restore"]["id"],)).fetchone()
+            self.assertIsNone(before["blob_hash"])
+            self.assertEqual(backups.load_backup_rows(con, before), changed_state)
+            self.assertEqual(backups.compact_pending_backups(con), 1)
+            con.commit()
+            before = con.execute("SELECT * FROM vehicle_backups WHERE id = ?", (before["id"],)).fetchone()
+            self.assertEqual(backups.load_backup_rows(con, before), changed_state)
+            self.assertEqual(con.execute("SELECT COUNT(*) FROM vehicle_backup_snapshots").fetchone()[0], 0)
+
+        phases = [event.data["phase"] for event in main.live_events.replay("APT1100", marker) if event.type == "registry.restore"]
+        self.assertEqual(phases, ["decode", "decode", "decode", "snapshot", "applied"])
+
+        with backups.connect_backup_store() as store:
+            store.execute("UPDATE backup_blobs SET payload = ? WHERE content_hash = ?", (zlib.compress(b'["site_code"]'), before["blob_hash"]))
+            store.commit()
+        corrupted = self.client.post(f"/api/registry/backups/{before['id']}/restore")
+        self.assertEqual(corrupted.status_code, 409)
+
+    def test_restore_stages_the_backup_before_taking_the_write_lock(self):
+        backup_id = self.client.post("/api/registry/backups").json()["id"]
+        original_stage = main.stage_vehicle_backup
+        writes_during_stage = []
+
+        def stage_and_write(con, backup_row, progress=None):
+            staged = original_stage(con, backup_row, progress)
+            with db.connect() as other:
+                other.execute("PRAGMA busy_timeout = 0")
+                other.execute("BEGIN IMMEDIATE")
+                other.execute("UPDATE vehicles SET note = '단속 중 수정' WHERE plate = '77하3456'")
+                other.commit()
+                writes_during_stage.append(True)
+            return staged
+
+        main.stage_vehicle_backup = stage_and_write
+        try:
+            response = self.client.post(f"/api/registry/backups/{backup_id}/restore")
+        finally:
+            main.stage_vehicle_backup = original_stage
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(writes_during_stage, [True])
+        with db.connect() as con:
+            self.assertEqual(con.execute("SELECT note FROM vehicles WHERE plate = '77하3456'").fetchone()["note"], "임시")
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,129 @@
+import os
+import tempfile
+import time
+import unittest
+from datetime import datetime
+from pathlib import Path
+
+from openpyxl import Workbook
+
+from app import db, main
+from app.scheduler import CronSchedule, Scheduler
+
+
+class SchedulerTests(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.original_db_path = db.DB_PATH
+        self.original_seed_demo = db.SEED_DEMO
+        self.original_upload_dir = main.UPLOAD_DIR
+        self.original_import_dir = main.IMPORT_DIR
+
+        db.DB_PATH = Path(self.temp_dir.name) / "parking-test.db"
+        db.SEED_DEMO = False
+        main.UPLOAD_DIR = Path(self.temp_dir.name) / "uploads"
+        main.IMPORT_DIR = Path(self.temp_dir.name) / "imports"
+        main.IMPORT_DIR.mkdir()
+
+        db.init_db()
+        db.seed_users()
+
+    def tearDown(self):
+        main.IMPORT_DIR = self.original_import_dir
+        main.UPLOAD_DIR = self.original_upload_dir
+        db.SEED_DEMO = self.original_seed_demo
+        db.DB_PATH = self.original_db_path
+        self.temp_dir.cleanup()
+
+    def test_cron_schedule_finds_next_matching_minute(self):
+        now = datetime(2026, 10, 19, 14, 7)
+        self.assertEqual(CronSchedule.parse("*/10 * * * *").next_after(now), datetime(2026, 10, 19, 14, 10))
+        self.assertEqual(CronSchedule.parse("30 2 * * *").next_after(now), datetime(2026, 10, 20, 2, 30))
+        self.assertEqual(CronSchedule.parse("0 9 * * 1-5").next_after(datetime(2026, 10, 23, 10, 0)), datetime(2026, 10, 26, 9, 0))
+        self.assertEqual(CronSchedule.parse("0 0 29 2 *").next_after(now), datetime(2028, 2, 29, 0, 0))
+        with self.assertRaises(ValueError):
+            CronSchedule.parse("61 * * * *")
+
+    def test_runs_are_recorded_once_per_slot_and_respect_foreign_lock(self):
+        calls = []
+        scheduler = Scheduler()
+        scheduler.register("demo", "@hourly", lambda: calls.append(1) or {"count": len(calls)})
+        slot = datetime(2026, 10, 19, 3, 0)
+
+        self.assertEqual(scheduler.run("demo", scheduled_for=slot)["status"], "ok")
+        self.assertEqual(scheduler.run("demo", scheduled_for=slot)["status"], "duplicate")
+        self.assertEqual(len(calls), 1)
+
+        with db.connect() as con:
+            con.execute(
+                "INSERT INTO scheduler_locks(job_name, owner, locked_until) VALUES ('demo', 'other-host', datetime('now', '+1 hour'))"
+            )
+            con.commit()
+        self.assertEqual(scheduler.run("demo")["status"], "locked")
+
+        history = scheduler.history("demo")
+        self.assertEqual([(row["status"], row["trigger"]) for row in history], [("ok", "schedule")])
+        self.assertEqual(history[0]["detail"], '{"count": 1}')
+
+    def test_backup_retention_keeps_recent_and_minimum_backups(self):
+        with db.connect() as con:
+            con.executemany(
+                "INSERT INTO vehicle_backups(site_code, backup_name, vehicles_json, created_at) VALUES ('APT1100', ?, '[]', datetime('now', ?))",
+                [(f"backup-{index}", f"-{index * 10} days") for index in range(12)],
+            )
+            con.commit()
+
+        result = main.run_backup_retention_job()
+
+        self.assertEqual(result["backups_pruned"], 2)
+        with db.connect() as con:
+            names = [row["backup_name"] for row in con.execute("SELECT backup_name FROM vehicle_backups ORDER BY created_at DESC")]
+            self.assertEqual(names, [f"backup-{index}" for index in range(10)])
+            self.assertEqual(db.prune_vehicle_backups(con, retention_days=1), 5)
+            self.assertEqual(con.execute("SELECT COUNT(*) FROM vehicle_backups").fetchone()[0], db.BACKUP_MIN_KEEP)
+
+    def test_photo_cleanup_removes_only_old_unreferenced_files(self):
+        photo_dir = main.site_upload_dir("APT1100") / "photos"
+        photo_dir.mkdir(parents=True)
+        kept = "a" * 64 + ".webp"
+        for name in (kept, main.thumbnail_name(kept), "b" * 64 + ".webp", "c" * 64 + ".webp"):
+            (photo_dir / name).write_bytes(b"photo")
+        old = time.time() - 3 * 86400
+        for name in (kept, main.thumbnail_name(kept), "b" * 64 + ".webp"):
+            os.utime(photo_dir / name, (old, old))
+        with db.connect() as con:
+            con.execute(
+                "INSERT INTO enforcement_events(site_code, plate, verdict, verdict_message, photo_path) VALUES ('APT1100', '12가3456', 'OK', '등록 차량', ?)",
+                (main.site_upload_url("APT1100", f"photos/{kept}"),),
+            )
+            con.commit()
+
+        result = main.run_photo_cleanup_job()
+
+        self.assertEqual(result["files_removed"], 1)
+        self.assertEqual(
+            sorted(path.name for path in photo_dir.iterdir()),
+            sorted([kept, main.thumbnail_name(kept), "c" * 64 + ".webp"]),
+        )
+
+    def test_registry_sync_job_only_imports_changed_directories(self):
+        workbook = Workbook()
+        sheet = workbook.active
+        sheet.append(["차량번호", "동호수", "성명"])
+        sheet.append(["12가3456", "101-1203", "홍길동"])
+        workbook.save(main.IMPORT_DIR / "vehicles.xlsx")
+        (main.IMPORT_DIR / "~$vehicles.xlsx").write_bytes(b"lock")
+
+        first = main.run_registry_sync_job()
+        self.assertEqual(first["synced"], ["APT1100"])
+        os.utime(main.IMPORT_DIR / "vehicles.xlsx", (time.time() - 3600, time.time() - 3600))
+        second = main.run_registry_sync_job()
+        self.assertEqual(second["synced"], [])
+
+        with db.connect() as con:
+            plates = [row["plate"] for row in con.execute("SELECT plate FROM vehicles WHERE site_code = 'APT1100'")]
+        self.assertEqual(plates, ["12가3456"])
+
+
+if __name__ == "__main__":
+    unittest.main()
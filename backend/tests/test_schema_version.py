@@ -0,0 +1,90 @@
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+from app import db
+
+
+class SchemaVersionTests(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.original_db_path = db.DB_PATH
+        db.DB_PATH = Path(self.temp_dir.name) / "parking-test.db"
+
+    def tearDown(self):
+        db.DB_PATH = self.original_db_path
+        self.temp_dir.cleanup()
+
+    @unittest.skipIf(db.storage_backend() == "postgres", "uses the SQLite trace callback")
+    def test_current_database_only_checks_the_version(self):
+        self.assertEqual(db.init_db(), db.SCHEMA_VERSION)
+        statements: list[str] = []
+        with db.connect() as con:
+            self.assertEqual(db.schema_version(con), db.SCHEMA_VERSION)
+            con.set_trace_callback(statements.append)
+            self.assertEqual(db.migrate_schema(con), 0)
+        self.assertEqual(statements, ["PRAGMA user_version"])
+
+    @unittest.skipIf(db.storage_backend() == "postgres", "the PostgreSQL suite resets the schema inside init_db")
+    def test_concurrent_init_runs_the_migrations_once(self):
+        original_migrations = db.SCHEMA_MIGRATIONS
+        runs: list[str] = []
+
+        def counted(migration):
+            def run(con):
+                runs.append(migration.__name__)
+                migration(con)
+                time.sleep(0.2)
+
+            return run
+
+        original_ensure_vehicle_schema = db.ensure_vehicle_schema
+        locked_after_schema: list[bool] = []
+
+        def ensure_vehicle_schema(con):
+            locked_after_schema.append(con.in_transaction)
+            original_ensure_vehicle_schema(con)
+
+        db.SCHEMA_MIGRATIONS = tuple(counted(migration) for migration in original_migrations)
+        db.ensure_vehicle_schema = ensure_vehicle_schema
+        barrier = threading.Barrier(2)
+        results: list[int] = []
+
+        def boot():
+            barrier.wait()
+            results.append(db.init_db())
+
+        try:
+            threads = [threading.Thread(target=boot) for _ in range(2)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            db.SCHEMA_MIGRATIONS = original_migrations
+            db.ensure_vehicle_schema = original_ensure_vehicle_schema
+
+        self.assertEqual(locked_after_schema, [True])
+        self.assertEqual(sorted(results), [0, db.SCHEMA_VERSION])
+        self.assertEqual(runs, [migration.__name__ for migration in original_migrations])
+        with db.connect() as con:
+            self.assertEqual(con.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+
+    @unittest.skipIf(db.storage_backend() == "postgres", "legacy unversioned databases are SQLite files")
+    def test_unversioned_database_runs_the_baseline_once(self):
+        with db.connect() as con:
+            con.execute("CREATE TABLE users (username TEXT PRIMARY KEY, pw_hash TEXT NOT NULL, role TEXT NOT NULL)")
+            con.execute("INSERT INTO users(username, pw_hash, role) VALUES ('legacy', 'x', 'viewer')")
+            con.commit()
+
+        self.assertEqual(db.init_db(), db.SCHEMA_VERSION)
+        self.assertEqual(db.init_db(), 0)
+        with db.connect() as con:
+            row = con.execute("SELECT site_code, role FROM users WHERE username = 'legacy'").fetchone()
+        self.assertEqual(tuple(row), (db.DEFAULT_SITE_CODE, "cleaner"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,145 @@
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from fastapi.testclient import TestClient
+
+from app import db, main
+from app.writer import write_coordinator
+
+
+@unittest.skipIf(db.storage_backend() == "postgres", "site shards are SQLite files")
+class SiteShardTests(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.original_db_path = db.DB_PATH
+        self.original_shard_dir = db.SHARD_DIR
+        self.original_seed_demo = db.SEED_DEMO
+        self.original_auto_sync = main.auto_sync_registry
+        db.DB_PATH = Path(self.temp_dir.name) / "parking-test.db"
+        db.SHARD_DIR = None
+        db.SEED_DEMO = False
+        main._app_ready = False
+        main.auto_sync_registry = lambda: None
+
+        db.init_db()
+        db.seed_users()
+        with db.connect() as con:
+            con.execute("INSERT INTO sites(site_code, name) VALUES ('APT2200', '둘째 단지')")
+            con.executemany(
+                "INSERT INTO vehicles(site_code, plate, unit, owner_name, phone, status) VALUES (?, ?, ?, ?, ?, 'active')",
+                [
+                    ("APT1100", "12가3456", "101-1203", "홍길동", "010-1111-2222"),
+                    ("APT2200", "34나5678", "202-0101", "김영희", "010-2222-3333"),
+                ],
+            )
+            con.execute(
+                "INSERT INTO enforcement_events(site_code, plate, verdict, verdict_message) VALUES ('APT1100', '99가9999', 'UNREGISTERED', '미등록')"
+            )
+            con.commit()
+        db.SHARD_DIR = Path(self.temp_dir.name) / "shards"
+
+    def tearDown(self):
+        write_coordinator.stop()
+        main.auto_sync_registry = self.original_auto_sync
+        main._app_ready = False
+        db.SEED_DEMO = self.original_seed_demo
+        db.SHARD_DIR = self.original_shard_dir
+        db.DB_PATH = self.original_db_path
+        self.temp_dir.cleanup()
+
+    def login(self):
+        client = TestClient(main.app)
+        login = client.post("/login", data={"username": "admin", "password": "admin1234"}, follow_redirects=False)
+        self.assertEqual(login.status_code, 302)
+        return client
+
+    def test_split_moves_site_rows_out_of_the_central_db(self):
+        moved = db.split_into_shards()
+
+        self.assertEqual(moved["APT1100"]["vehicles"], 1)
+        self.assertEqual(moved["APT1100"]["enforcement_events"], 1)
+        self.assertEqual(moved["APT2200"]["vehicles"], 1)
+        self.assertTrue((db.SHARD_DIR / "APT1100.db").exists())
+        with db.connect() as con:
+            self.assertEqual(con.execute("SELECT COUNT(*) FROM vehicles").fetchone()[0], 0)
+            self.assertEqual(con.execute("SELECT COUNT(*) FROM users WHERE site_code = 'APT1100'").fetchone()[0], 3)
+        with db.connect("APT1100") as con:
+            self.assertEqual([row["plate"] for row in con.execute("SELECT plate FROM vehicles")], ["12가3456"])
+            self.assertIsNone(con.execute("SELECT name FROM main.sqlite_master WHERE name = 'users'").fetchone())
+            stats = con.execute(
+                "SELECT metric, value FROM main.site_usage_counters WHERE site_code = 'APT1100' AND metric IN ('active_vehicles', 'monthly_records')"
+            ).fetchall()
+        self.assertEqual(dict((row["metric"], row["value"]) for row in stats), {"active_vehicles": 1, "monthly_records": 1})
+
+        self.assertEqual(db.split_into_shards("APT1100")["APT1100"]["vehicles"], 0)
+        with db.connect() as con:
+            central_metrics = {row["metric"] for row in con.execute("SELECT metric FROM site_usage_counters WHERE site_code = 'APT1100'")}
+            self.assertEqual(central_metrics, {"users"})
+            self.assertEqual(con.execute("SELECT COUNT(*) FROM enforcement_rollups").fetchone()[0], 0)
+
+    def test_failed_split_leaves_both_databases_unchanged(self):
+        def fail_after_central_delete(con, site_code=None):
+            remaining = con.execute(f"SELECT COUNT(*) FROM {db.central_table(con, 'vehicles')} WHERE site_code = ?", (site_code,)).fetchone()[0]
+            if not remaining:
+                raise sqlite3.OperationalError("rebuild failed")
+
+        with mock.patch.dict(db.MATERIALIZED_VIEW_REBUILDERS, {"broken": fail_after_central_delete}):
+            with self.assertRaises(sqlite3.OperationalError):
+                db.split_site_into_shard("APT1100")
+
+        with db.connect() as con:
+            self.assertEqual(con.execute("SELECT COUNT(*) FROM vehicles WHERE site_code = 'APT1100'").fetchone()[0], 1)
+            self.assertEqual(con.execute("SELECT COUNT(*) FROM enforcement_events WHERE site_code = 'APT1100'").fetchone()[0], 1)
+        with db.connect("APT1100") as con:
+            self.assertEqual(con.execute("SELECT COUNT(*) FROM main.vehicles").fetchone()[0], 0)
+        self.assertEqual(db.split_site_into_shard("APT1100")["vehicles"], 1)
+
+    def test_routes_read_and_write_the_session_site_shard(self):
+        db.split_into_shards()
+        client = self.login()
+
+        check = client.get("/api/registry/check", params={"plate": "12가3456"}).json()
+        self.assertEqual(check["phone"], "010-1111-2222")
+        self.assertEqual(client.get("/api/registry/check", params={"plate": "34나5678"}).json()["verdict"], "UNREGISTERED")
+        submitted = client.post("/api/enforcement/submit", data={"plate": "12가3456"})
+        self.assertEqual(submitted.status_code, 200)
+        with db.connect("APT1100") as con:
+            self.assertEqual(con.execute("SELECT COUNT(*) FROM main.enforcement_events").fetchone()[0], 2)
+
+        billing = client.get("/api/billing/status").json()
+        self.assertEqual(billing["usage"]["users"], 3)
+        self.assertEqual(billing["usage"]["vehicles"], 1)
+        sites = {site["site_code"]: site for site in client.get("/api/sites").json()}
+        self.assertEqual(sites["APT1100"]["users_count"], 3)
+        self.assertEqual(sites["APT1100"]["vehicles_count"], 1)
+        self.assertEqual(sites["APT1100"]["monthly_events_count"], 2)
+        self.assertEqual(sites["APT2200"]["vehicles_count"], 1)
+
+    def test_site_shards_have_independent_write_locks(self):
+        db.split_into_shards()
+        with db.connect("APT2200") as busy:
+            db.begin_immediate(busy)
+            busy.execute("UPDATE vehicles SET note = '점검' WHERE plate = '34나5678'")
+            with db.connect("APT1100") as con:
+                con.execute("PRAGMA busy_timeout = 0")
+                db.begin_immediate(con, attempts=1)
+                con.execute("UPDATE vehicles SET note = '정상' WHERE plate = '12가3456'")
+                con.commit()
+            with db.connect() as central:
+                central.execute("PRAGMA busy_timeout = 0")
+                central.execute("BEGIN IMMEDIATE")
+                central.rollback()
+            with db.connect("APT2200") as blocked:
+                blocked.execute("PRAGMA busy_timeout = 0")
+                with self.assertRaises(sqlite3.OperationalError):
+                    db.begin_immediate(blocked, attempts=1)
+            busy.rollback()
+        with db.connect("APT1100") as con:
+            self.assertEqual(con.execute("SELECT note FROM vehicles").fetchone()[0], "정상")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,162 @@
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+from app import db, main, ocr
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+
+class StartupTests(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.original_db_path = db.DB_PATH
+        self.original_seed_demo = db.SEED_DEMO
+        self.original_auto_sync = main.auto_sync_registry
+        self.original_settings = (main.SCHEDULER_ENABLED, main.IMPORT_WATCH_MODE, main.STARTUP_WARMUP, main.UPLOAD_DIR, main.OCR_WARMUP)
+        self.original_provider = os.environ.get("PARKING_OCR_PROVIDER")
+        db.DB_PATH = Path(self.temp_dir.name) / "parking-test.db"
+        db.SEED_DEMO = False
+        main._app_ready = False
+        main.auto_sync_registry = lambda: None
+        main.SCHEDULER_ENABLED = False
+        main.IMPORT_WATCH_MODE = "off"
+        main.STARTUP_WARMUP = False
+        main.OCR_WARMUP = False
+        main.UPLOAD_DIR = Path(self.temp_dir.name) / "uploads"
+
+    def tearDown(self):
+        main.SCHEDULER_ENABLED, main.IMPORT_WATCH_MODE, main.STARTUP_WARMUP, main.UPLOAD_DIR, main.OCR_WARMUP = self.original_settings
+        if self.original_provider is None:
+            os.environ.pop("PARKING_OCR_PROVIDER", None)
+        else:
+            os.environ["PARKING_OCR_PROVIDER"] = self.original_provider
+        ocr.resolve_tesseract_cmd.cache_clear()
+        main.auto_sync_registry = self.original_auto_sync
+        main._app_ready = False
+        db.SEED_DEMO = self.original_seed_demo
+        db.DB_PATH = self.original_db_path
+        self.temp_dir.cleanup()
+
+    def test_app_import_defers_heavy_modules(self):
+        probe = (
+            "import sys, app.main; "
+            "print(','.join(name for name in ('openpyxl', 'numpy', 'cv2', 'google.auth', 'PIL.Image') if name in sys.modules))"
+        )
+        result = subprocess.run([sys.executable, "-c", probe], cwd=BACKEND_DIR, capture_output=True, text=True, check=True)
+        self.assertEqual(result.stdout.strip(), "")
+
+    def test_startup_runs_in_background_and_reports_phases(self):
+        with TestClient(main.app) as client:
+            self.assertEqual(client.get("/health").json(), {"ok": True})
+        profile = TestClient(main.app).get("/health/startup").json()
+
+        self.assertTrue(profile["ready"])
+        self.assertIn("import", profile["phases"])
+        self.assertIn("ready", profile["phases"])
+        self.assertIn("total", profile["phases"])
+        self.assertTrue(main.UPLOAD_DIR.is_dir())
+
+    def test_readiness_waits_for_the_ocr_warmup(self):
+        os.environ["PARKING_OCR_PROVIDER"] = "manual"
+        main.OCR_WARMUP = True
+        client = TestClient(main.app)
+        main._startup_complete.clear()
+        self.assertEqual(client.get("/ready").status_code, 503)
+        self.assertEqual(client.get("/health").status_code, 200)
+
+        with TestClient(main.app):
+            pass
+        ready = client.get("/ready")
+
+        self.assertEqual(ready.status_code, 200)
+        self.assertEqual(ready.json()["ocr"]["state"], "disabled")
+        self.assertIn("ocr", client.get("/health/startup").json()["phases"])
+
+    def test_failed_ready_phase_is_retried_before_the_remaining_phases(self):
+        original_ensure_ready, original_warm_up = main.ensure_ready, main.warm_up_ocr
+        original_retry_seconds = main.STARTUP_READY_RETRY_SECONDS
+        attempts = []
+        warmed = []
+
+        def flaky_ready():
+            attempts.append(True)
+            if len(attempts) < 3:
+                raise RuntimeError("database unavailable")
+            original_ensure_ready()
+
+        main.ensure_ready = flaky_ready
+        main.warm_up_ocr = lambda: warmed.append(True)
+        main.OCR_WARMUP = True
+        main.STARTUP_READY_RETRY_SECONDS = 0.01
+        try:
+            with TestClient(main.app) as client:
+                main._startup_thread.join(timeout=5)
+                ready = client.get("/ready")
+                profile = client.get("/health/startup").json()
+        finally:
+            main.ensure_ready, main.warm_up_ocr = original_ensure_ready, original_warm_up
+            main.STARTUP_READY_RETRY_SECONDS = original_retry_seconds
+
+        self.assertEqual(len(attempts), 3)
+        self.assertEqual(ready.status_code, 200)
+        self.assertEqual(profile["errors"], {})
+        self.assertEqual(warmed, [True])
+
+    def test_shutdown_stops_retrying_the_ready_phase(self):
+        original_ensure_ready = main.ensure_ready
+        attempts = []
+
+        def broken_ready():
+            attempts.append(True)
+            raise RuntimeError("database unavailable")
+
+        main.ensure_ready = broken_ready
+        try:
+            with TestClient(main.app):
+                while not attempts:
+                    time.sleep(0.01)
+            main._startup_thread.join(timeout=5)
+        finally:
+            main.ensure_ready = original_ensure_ready
+
+        self.assertFalse(main._startup_thread.is_alive())
+        self.assertEqual(len(attempts), 1)
+
+    def test_shutdown_does_not_wait_forever_for_startup(self):
+        release = threading.Event()
+        original_ensure_ready, original_join_seconds = main.ensure_ready, main.STARTUP_JOIN_SECONDS
+        main.ensure_ready = lambda: release.wait(5)
+        main.STARTUP_JOIN_SECONDS = 0.1
+        try:
+            started = time.perf_counter()
+            with TestClient(main.app):
+                pass
+            elapsed = time.perf_counter() - started
+        finally:
+            release.set()
+            main._startup_thread.join(timeout=5)
+            main.ensure_ready, main.STARTUP_JOIN_SECONDS = original_ensure_ready, original_join_seconds
+
+        self.assertLess(elapsed, 3)
+
+    def test_tesseract_command_is_resolved_once(self):
+        os.environ["TESSERACT_CMD"] = "/opt/ocr/tesseract"
+        try:
+            ocr.resolve_tesseract_cmd.cache_clear()
+            self.assertEqual(ocr.resolve_tesseract_cmd(), "/opt/ocr/tesseract")
+            os.environ["TESSERACT_CMD"] = "/usr/local/bin/tesseract"
+            self.assertEqual(ocr.resolve_tesseract_cmd(), "/opt/ocr/tesseract")
+        finally:
+            os.environ.pop("TESSERACT_CMD", None)
+
+
+if __name__ == "__main__":
+    unittest.main()
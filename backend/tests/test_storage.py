@@ -0,0 +1,126 @@
+import os
+import sqlite3
+import unittest
+
+from app import storage
+from app.storage import translate_sql
+
+TEST_DATABASE_URL = os.getenv("PARKING_TEST_DATABASE_URL", "").strip()
+
+
+class SqlTranslationTests(unittest.TestCase):
+    def test_sqlite_dialect_is_rewritten_for_postgres(self):
+        self.assertEqual(
+            translate_sql("INSERT OR IGNORE INTO users(username, role) VALUES (?, 'admin')"),
+            "INSERT INTO users(username, role) VALUES (%s, 'admin') ON CONFLICT DO NOTHING",
+        )
+        self.assertEqual(
+            translate_sql("SELECT * FROM vehicles WHERE plate LIKE ? AND note IS ? AND updated_at > datetime('now', '-1 day')"),
+            "SELECT * FROM vehicles WHERE plate ILIKE %s AND note IS NOT DISTINCT FROM %s AND updated_at > sqlite_datetime('now', '-1 day')",
+        )
+        self.assertEqual(
+            translate_sql("SELECT CAST(total AS INTEGER) FROM t WHERE note = '50%' AND plate = 'IS NULL'"),
+            "SELECT sqlite_integer(total) FROM t WHERE note = '50%%' AND plate = 'IS NULL'",
+        )
+
+    def test_conflict_updates_qualify_target_columns(self):
+        self.assertEqual(
+            translate_sql(
+                "INSERT INTO site_stats(site_code, vehicles) VALUES (?, 1) "
+                "ON CONFLICT(site_code) DO UPDATE SET vehicles = vehicles + excluded.vehicles"
+            ),
+            "INSERT INTO site_stats(site_code, vehicles) VALUES (%s, 1) "
+            "ON CONFLICT(site_code) DO UPDATE SET vehicles = site_stats.vehicles + excluded.vehicles",
+        )
+
+    def test_schema_types_and_triggers_are_translated(self):
+        self.assertEqual(
+            translate_sql("CREATE TABLE t (id INTEGER PRIMARY KEY AUTOINCREMENT, payload BLOB, ratio REAL)", False),
+            "CREATE TABLE t (id BIGINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY, payload BYTEA, ratio DOUBLE PRECISION)",
+        )
+        translated = translate_sql(
+            """
+            CREATE TRIGGER IF NOT EXISTS vehicles_touch AFTER UPDATE ON vehicles
+            WHEN NEW.status = 'active'
+            BEGIN
+              UPDATE site_stats SET vehicles = vehicles + 1 WHERE site_code = NEW.site_code;
+            END
+            """,
+            False,
+        )
+        self.assertIn("CREATE OR REPLACE FUNCTION vehicles_touch_fn() RETURNS trigger", translated)
+        self.assertIn("FOR EACH ROW WHEN (NEW.status = 'active') EXECUTE FUNCTION vehicles_touch_fn()", translated)
+
+    def test_postgres_urls_are_detected(self):
+        self.assertTrue(storage.is_postgres_url("postgresql://app@db/parking"))
+        self.assertTrue(storage.is_postgres_url("postgres://app@db/parking"))
+        self.assertFalse(storage.is_postgres_url(""))
+        self.assertFalse(storage.is_postgres_url("/data/parking.db"))
+
+
+@unittest.skipUnless(TEST_DATABASE_URL, "PARKING_TEST_DATABASE_URL is not set")
+class PostgresStorageTests(unittest.TestCase):
+    def setUp(self):
+        self.storage = storage.PostgresStorage(TEST_DATABASE_URL)
+        with self.storage.connect() as con:
+            con.executescript(
+                """
+                DROP TABLE IF EXISTS storage_probe;
+                CREATE TABLE storage_probe (
+                  id INTEGER PRIMARY KEY AUTOINCREMENT,
+                  site_code TEXT NOT NULL,
+                  plate TEXT NOT NULL,
+                  seen_at TEXT NOT NULL DEFAULT (datetime('now')),
+                  UNIQUE(site_code, plate)
+                );
+                """
+            )
+
+    def tearDown(self):
+        with self.storage.connect() as con:
+            con.execute("DROP TABLE IF EXISTS storage_probe")
+            con.commit()
+        self.storage.close()
+
+    def test_connections_behave_like_sqlite(self):
+        with self.storage.connect() as con:
+            first = con.execute("INSERT INTO storage_probe(site_code, plate) VALUES (?, ?)", ("APT1100", "12가3456")).lastrowid
+            con.execute("INSERT OR IGNORE INTO storage_probe(site_code, plate) VALUES (?, ?)", ("APT1100", "12가3456"))
+            con.commit()
+            with self.assertRaises(sqlite3.IntegrityError):
+                con.execute("INSERT INTO storage_probe(site_code, plate) VALUES (?, ?)", ("APT1100", "12가3456"))
+            con.rollback()
+            row = con.execute("SELECT id, plate, length(seen_at) AS seen_length FROM storage_probe WHERE site_code = ?", ("APT1100",)).fetchone()
+        self.assertEqual(first, row["id"])
+        self.assertEqual(tuple(row), (first, "12가3456", 19))
+        self.assertEqual(dict(row)["plate"], "12가3456")
+
+    def test_begin_immediate_serializes_writers_across_connections(self):
+        with self.storage.connect() as holder, self.storage.connect() as other:
+            holder.execute("BEGIN IMMEDIATE")
+            other.raw.execute("SET lock_timeout = '50ms'")
+            with self.assertRaises(sqlite3.OperationalError) as caught:
+                other.execute("BEGIN IMMEDIATE")
+            self.assertIn("database is locked", str(caught.exception))
+            other.rollback()
+            holder.commit()
+            other.execute("BEGIN IMMEDIATE")
+            self.assertTrue(other.in_transaction)
+            other.rollback()
+
+    def test_begin_immediate_only_serializes_writers_of_the_same_site(self):
+        with self.storage.connect("APT1100") as holder, self.storage.connect("APT2200") as other, self.storage.connect("APT1100") as same:
+            holder.execute("BEGIN IMMEDIATE")
+            other.raw.execute("SET lock_timeout = '50ms'")
+            same.raw.execute("SET lock_timeout = '50ms'")
+            other.execute("BEGIN IMMEDIATE")
+            self.assertTrue(other.in_transaction)
+            with self.assertRaises(sqlite3.OperationalError):
+                same.execute("BEGIN IMMEDIATE")
+            same.rollback()
+            other.rollback()
+            holder.commit()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -143,6 +143,57 @@ class UserManagementTests(unittest.TestCase):
         self.assertEqual(len(second_page.json()), 1)
         self.assertEqual([row["site_code"] for row in searched.json()], ["APT3300"])
 
+    def test_site_list_reads_usage_counters(self):
+        created = self.client.post(
+            "/api/sites",
+            json={
+                "site_code": "APT4400",
+                "name": "테스트 4단지",
+                "admin_username": "admin4400",
+                "admin_password": "password123",
+            },
+        )
+        self.assertEqual(created.status_code, 200)
+        self.assertEqual(created.json()["users_count"], 1)
+        self.assertEqual(created.json()["vehicles_count"], 0)
+
+        with db.connect() as con:
+            con.executemany(
+                """
+                INSERT INTO vehicles(site_code, plate, status, manual_override)
+                VALUES (?, ?, 'active', ?)
+                """,
+                [("APT4400", "12가3456", 0), ("APT4400", "34나5678", 1), ("APT4400", "56다7890", 1)],
+            )
+            con.execute("UPDATE vehicles SET deleted_at = datetime('now') WHERE site_code = 'APT4400' AND plate = '56다7890'")
+            con.execute(
+                """
+                INSERT INTO cctv_search_requests
+                (site_code, requester_username, photo_path, location, search_start_time, search_end_time, content, status)
+                VALUES ('APT4400', 'admin4400', '/uploads/a.jpg', '정문', '2026-05-01 10:00', '2026-05-01 11:00', '확인', 'requested')
+                """
+            )
+            con.execute("INSERT INTO enforcement_events(site_code, plate, verdict, verdict_message) VALUES ('APT4400', '12가3456', 'OK', '정상')")
+            con.commit()
+
+        site = self.client.get("/api/sites", params={"q": "4400"}).json()[0]
+        self.assertEqual(site["vehicles_count"], 2)
+        self.assertEqual(site["manual_vehicles_count"], 1)
+        self.assertEqual(site["open_cctv_count"], 1)
+        self.assertEqual(site["monthly_events_count"], 1)
+
+        with db.connect() as con:
+            con.execute("UPDATE cctv_search_requests SET status = 'done' WHERE site_code = 'APT4400'")
+            con.commit()
+            counters = "SELECT period, metric, value FROM site_usage_counters WHERE site_code = 'APT4400' ORDER BY period, metric"
+            before = [tuple(row) for row in con.execute(counters).fetchall()]
+            db.rebuild_usage_counters(con, "APT4400")
+            after = [tuple(row) for row in con.execute(counters).fetchall()]
+        self.assertIn(("total", "open_cctv", 0), before)
+        self.assertIn(("total", "vehicles", 3), before)
+        self.assertEqual(before, after)
+        self.assertEqual(self.client.get("/api/sites", params={"q": "4400"}).json()[0]["open_cctv_count"], 0)
+
     def test_same_username_can_login_to_different_sites_and_data_is_isolated(self):
         created_site = self.client.post(
             "/api/sites",
@@ -231,6 +282,7 @@ class UserManagementTests(unittest.TestCase):
                 "INSERT INTO users(username, pw_hash, role) VALUES (?, ?, ?)",
                 ("legacyviewer", main.pbkdf2_hash("viewerpass123"), "viewer"),
             )
+            con.execute("PRAGMA user_version = 0")
             con.commit()
 
         db.init_db()
@@ -256,6 +308,7 @@ class UserManagementTests(unittest.TestCase):
                 "INSERT INTO users(username, pw_hash, role) VALUES (?, ?, ?)",
                 ("legacyadmin", main.pbkdf2_hash("legacyadmin123"), "admin"),
             )
+            con.execute("PRAGMA user_version = 0")
             con.commit()
 
         db.init_db()
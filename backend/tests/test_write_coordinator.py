@@ -0,0 +1,130 @@
+import sqlite3
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+from app import db, main
+from app.writer import WriteCoordinator, write_coordinator
+
+
+class WriteCoordinatorTests(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.original_db_path = db.DB_PATH
+        self.original_seed_demo = db.SEED_DEMO
+        self.original_upload_dir = main.UPLOAD_DIR
+        self.original_auto_sync = main.auto_sync_registry
+        db.DB_PATH = Path(self.temp_dir.name) / "parking-test.db"
+        db.SEED_DEMO = False
+        main.UPLOAD_DIR = Path(self.temp_dir.name) / "uploads"
+        main._app_ready = False
+        main.auto_sync_registry = lambda: None
+        db.init_db()
+        db.seed_users()
+        self.coordinator = WriteCoordinator()
+
+    def tearDown(self):
+        self.coordinator.stop()
+        write_coordinator.stop()
+        main.auto_sync_registry = self.original_auto_sync
+        main.UPLOAD_DIR = self.original_upload_dir
+        db.SEED_DEMO = self.original_seed_demo
+        db.DB_PATH = self.original_db_path
+        main._app_ready = False
+        self.temp_dir.cleanup()
+
+    def insert_job(self, plate):
+        def job(con):
+            cur = con.execute(
+                "INSERT INTO enforcement_events(site_code, plate, verdict, verdict_message) VALUES ('APT1100', ?, 'OK', '등록 차량')",
+                (plate,),
+            )
+            return cur.lastrowid
+
+        return job
+
+    def test_queued_writes_share_one_transaction_and_failures_stay_isolated(self):
+        started = threading.Event()
+        release = threading.Event()
+        first = self.coordinator.submit(lambda con: started.set() or release.wait(5))
+        self.assertTrue(started.wait(5))
+        futures = [self.coordinator.submit(self.insert_job(f"12가{index:04d}")) for index in range(10)]
+
+        def broken(con):
+            self.insert_job("99가9999")(con)
+            raise ValueError("boom")
+
+        failed = self.coordinator.submit(broken)
+        release.set()
+
+        self.assertTrue(first.result(5))
+        ids = [future.result(5) for future in futures]
+        with self.assertRaises(ValueError):
+            failed.result(5)
+        self.assertEqual(ids, sorted(ids))
+        self.assertEqual(self.coordinator.stats()["transactions"], 2)
+        self.assertEqual(self.coordinator.stats()["largest_batch"], 11)
+        with db.connect() as con:
+            plates = [row["plate"] for row in con.execute("SELECT plate FROM enforcement_events ORDER BY id")]
+        self.assertEqual(plates, [f"12가{index:04d}" for index in range(10)])
+
+    @unittest.skipIf(db.storage_backend() == "postgres", "relies on SQLite busy errors")
+    def test_begin_immediate_retries_while_another_writer_holds_the_lock(self):
+        locked = threading.Event()
+
+        def hold_lock():
+            with db.connect() as holder:
+                holder.execute("BEGIN IMMEDIATE")
+                locked.set()
+                threading.Event().wait(0.3)
+
+        thread = threading.Thread(target=hold_lock)
+        thread.start()
+        self.assertTrue(locked.wait(5))
+        with db.connect() as con:
+            con.execute("PRAGMA busy_timeout = 0")
+            with self.assertRaises(sqlite3.OperationalError):
+                con.execute("BEGIN IMMEDIATE")
+            db.begin_immediate(con)
+            self.assertTrue(con.in_transaction)
+        thread.join()
+
+    def test_busy_job_fails_without_sleeping_inside_the_transaction(self):
+        calls: list[int] = []
+
+        def busy(con):
+            calls.append(1)
+            raise sqlite3.OperationalError("database is locked")
+
+        started = time.perf_counter()
+        with self.assertRaises(sqlite3.OperationalError):
+            self.coordinator.run(busy)
+        self.assertEqual(len(calls), 1)
+        self.assertLess(time.perf_counter() - started, 1.0)
+        self.assertEqual(self.coordinator.run(lambda con: con.execute("SELECT 1").fetchone()[0]), 1)
+
+    def test_enforcement_submit_writes_event_and_ocr_feedback_together(self):
+        client = TestClient(main.app)
+        login = client.post("/login", data={"username": "admin", "password": "admin1234"}, follow_redirects=False)
+        self.assertEqual(login.status_code, 302)
+        before = write_coordinator.stats()["transactions"]
+
+        response = client.post(
+            "/api/enforcement/submit",
+            data={"plate": "12가3456", "raw_ocr_text": "12가3458", "ocr_best_plate": "12가3458", "ocr_candidates": '["12가3458"]'},
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.json()["ocr_learning_feedback"]["corrected"])
+        self.assertEqual(write_coordinator.stats()["transactions"], before + 1)
+        with db.connect() as con:
+            feedback = con.execute("SELECT suggested_plate, corrected_plate FROM ocr_feedback").fetchall()
+        self.assertEqual([tuple(row) for row in feedback], [("12가3458", "12가3456")])
+
+
+if __name__ == "__main__":
+    unittest.main()